@@ -1,6 +1,7 @@
 from tanuki.data_store.column import Column
 from tanuki.data_store.data_store import DataStore
-from tanuki.data_store.index.index import Index
+from tanuki.data_store.index.index import Index, IndexOptions, SecondaryIndex
 from tanuki.database.connection_config import ConnectionConfig
 from tanuki.database.data_token import DataToken
+from tanuki.database.mmap_database import MmapDatabase
 from tanuki.database.sqlite3_database import Sqlite3Database
@@ -13,12 +13,13 @@ from typing import (
 )
 
 import numpy as np
-from pandas import DataFrame
+from pandas import DataFrame, Series
 
 from tanuki.data_store.data_type import DataType
 from tanuki.database.data_token import DataToken
 
 if TYPE_CHECKING:
+    from tanuki.data_backend.pandas_backend import PandasBackend
     from tanuki.data_store.index.index import Index
     from tanuki.data_store.index.index_alias import IndexAlias
     from tanuki.data_store.query import Query
@@ -48,6 +49,14 @@ class DataBackend:
     def link_token(self: B) -> Optional[DataToken]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def link_query(self: B) -> Optional[Query]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def load(self: B) -> B:
+        raise NotImplementedError()
+
     @abstractmethod
     def to_pandas(self) -> DataFrame:
         raise NotImplementedError()
@@ -136,6 +145,25 @@ class DataBackend:
     def __getitem__(self, item: Union[str, list[bool]]) -> Any:
         raise NotImplementedError()
 
+    @abstractmethod
+    def sort_values(
+        self: B,
+        columns: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        limit: Optional[int] = None,
+    ) -> B:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def head(self: B, n: int = 5) -> B:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def join(
+        self: B, other: DataBackend, on: list[str], how: str = "inner"
+    ) -> PandasBackend:
+        raise NotImplementedError()
+
     @abstractmethod
     def getitems(self, item: list[str]) -> B:
         raise NotImplementedError()
@@ -152,6 +180,14 @@ class DataBackend:
     def __setitem__(self, item: str, value: Any) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def commit(self: B) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def rollback(self: B) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     def get_index(self, index_alias: IndexAlias) -> Index:
         raise NotImplementedError()
@@ -177,7 +213,15 @@ class DataBackend:
         raise NotImplementedError()
 
     @abstractmethod
-    def nunique(self: B) -> int:
+    def nunique(self: B) -> Series:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def aggregate(
+        self: B,
+        aggregations: dict[str, list[str]],
+        group_by: Optional[list[str]] = None,
+    ) -> PandasBackend:
         raise NotImplementedError()
 
     @abstractmethod
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Optional, Type, TYPE_CHECKING, TypeVar, Union
+from io import UnsupportedOperation
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Optional,
+    Type,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
+import pandas as pd
 from pandas import Index as PIndex
 from pandas.core.frame import DataFrame
+from pandas.core.series import Series
 
 from tanuki.data_backend.pandas_backend import PandasBackend
 from tanuki.data_store.data_store import DataStore
@@ -14,17 +26,21 @@ from tanuki.data_store.index.index_alias import IndexAlias
 from tanuki.data_store.index.pandas_index import PandasIndex
 from tanuki.data_store.query import (
     AndGroupQuery,
+    AndQuery,
     ColumnQuery,
     DataStoreQuery,
     EqualsQuery,
     GreaterEqualQuery,
     GreaterThanQuery,
+    InQuery,
     LessEqualQuery,
     LessThanQuery,
     NotEqualsQuery,
     OrGroupQuery,
     Query,
+    RowInQuery,
 )
+from tanuki.database.adapter.query.query_key_compiler import QueryKeyCompiler
 from tanuki.database.data_token import DataToken
 from tanuki.database.database import Database
 
@@ -33,15 +49,110 @@ from .data_backend import DataBackend, ILocIndexer, LocIndexer
 T = TypeVar("T", bound="DataStore")
 
 
+class _ChangeLog:
+    _changes: list[tuple[str, list[str], list[DataFrame]]]
+
+    def __init__(self) -> None:
+        self._changes = []
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def record(self, kind: str, data: DataFrame) -> None:
+        columns = [str(col) for col in data.columns]
+        if len(self._changes) > 0:
+            last_kind, last_columns, frames = self._changes[-1]
+            if last_kind == kind and last_columns == columns:
+                frames.append(data)
+                return
+        self._changes.append((kind, columns, [data]))
+
+    def has_pending(self, kind: str) -> bool:
+        return any(pending == kind for pending, _, _ in self._changes)
+
+    def drain(self) -> list[tuple[str, DataFrame]]:
+        changes = [
+            (kind, pd.concat(frames, ignore_index=True))
+            for kind, _, frames in self._changes
+        ]
+        self._changes = []
+        return changes
+
+    def clear(self) -> None:
+        self._changes = []
+
+
+class _LinkState:
+    _database: Database
+    _data_token: DataToken
+    _query: Optional[Query]
+    _store_type: Optional[Type[DataStore]]
+    _version: int
+    _row_count: Optional[int]
+    _default_index: Optional[PandasIndex]
+    change_log: _ChangeLog
+
+    def __init__(
+        self, database: Database, data_token: DataToken, query: Optional[Query] = None
+    ) -> None:
+        self._database = database
+        self._data_token = data_token
+        self._query = query
+        self._store_type = None
+        self._version = database.table_version(data_token)
+        self._row_count = None
+        self._default_index = None
+        self.change_log = _ChangeLog()
+
+    def filtered(self, query: Query) -> _LinkState:
+        state = _LinkState(self._database, self._data_token, query)
+        state._store_type = self._store_type
+        state.change_log = self.change_log
+        return state
+
+    def _refresh(self) -> None:
+        version = self._database.table_version(self._data_token)
+        if version != self._version or not self._database.caches_results():
+            self._version = version
+            self._row_count = None
+            self._default_index = None
+
+    def store_type(self) -> Type[DataStore]:
+        if self._store_type is None:
+            self._store_type = self._database.table_store_type(self._data_token)
+        return self._store_type
+
+    def columns(self) -> list[str]:
+        return [str(col) for col in self.store_type().columns]
+
+    def dtypes(self) -> dict[str, type]:
+        return {col.name: col.dtype for col in self.store_type().columns}
+
+    def row_count(self) -> int:
+        self._refresh()
+        if self._row_count is None:
+            self._row_count = self._database.row_count(self._data_token, self._query)
+        return self._row_count
+
+    def default_index(self) -> PandasIndex:
+        self._refresh()
+        if self._default_index is None:
+            pindex = PIndex(np.arange(0, self.row_count()), name="index")
+            self._default_index = PandasIndex(pindex, [])
+        return self._default_index
+
+
 class DatabaseBackend(Generic[T], DataBackend):
     _store_class: Type[T]
     _database: Database
     _data_token: DataToken
     _read_only: bool
+    _link_state: _LinkState
 
-    _selected_columns: list[str]
+    _selected_columns: Optional[list[str]]
+    _predicate: Optional[Query]
 
-    _index: DatabaseIndex
+    _index: Optional[Index]
     _loc: _LocIndexer
     _iloc: _ILocIndexer
 
@@ -53,28 +164,24 @@ class DatabaseBackend(Generic[T], DataBackend):
         index: Optional[DatabaseIndex] = None,
         selected_columns: Optional[list[str]] = None,
         read_only: bool = True,
+        link_state: Optional[_LinkState] = None,
+        predicate: Optional[Query] = None,
     ) -> None:
-        if not read_only:
-            raise NotImplementedError("The current version of Tanuki does not support Store to DB writing")
         self._store_class = store_class
         self._database = database
         self._data_token = data_token
         self._read_only = read_only
-
-        if selected_columns is None:
-            self._selected_columns = self._database.table_columns(self._data_token)
-        else:
-            self._selected_columns = selected_columns
-
-        if index is None:
-            pindex = PIndex(np.arange(0, len(self)), name="index")
-            self._index = PandasIndex(pindex, [])
-        else:
-            if not isinstance(index, DatabaseIndex) and not isinstance(
-                index, PandasIndex
-            ):
-                index = PandasIndex(index)
-            self._index = index
+        if link_state is None:
+            link_state = _LinkState(database, data_token, predicate)
+        self._link_state = link_state
+        self._selected_columns = selected_columns
+        self._predicate = predicate
+
+        if index is not None and not isinstance(index, DatabaseIndex) and not isinstance(
+            index, PandasIndex
+        ):
+            index = PandasIndex(index)
+        self._index = index
         self._loc = _LocIndexer(self)
         self._iloc = _ILocIndexer(self)
 
@@ -84,26 +191,47 @@ class DatabaseBackend(Generic[T], DataBackend):
     def link_token(self) -> Optional[DataToken]:
         return self._data_token
 
+    def link_query(self) -> Optional[Query]:
+        return self._predicate
+
+    def table_version(self) -> int:
+        return self._database.table_version(self._data_token)
+
+    def caches_results(self) -> bool:
+        return self._database.caches_results()
+
+    def load(self) -> PandasBackend:
+        datastore = self._database.query(
+            self._store_class, self._data_token, self._predicate, self.columns
+        )
+        if self._has_declared_index():
+            datastore = datastore.set_index(self._index)
+        return datastore._data_backend
+
     def to_pandas(self) -> DataFrame:
-        return self.query().to_pandas()
+        return self.load().to_pandas()
 
     @property
     def values(self) -> np.ndarray:
-        return self.to_pandas().values
+        return self.load().values
 
     @property
     def columns(self) -> list[str]:
+        if self._selected_columns is None:
+            self._selected_columns = self._link_state.columns()
         return self._selected_columns
 
     @property
     def dtypes(self) -> dict[str, type]:
-        return self._database.table_dtypes(self._data_token)
+        return self._link_state.dtypes()
 
     def to_dict(self) -> dict[str, any]:
-        return self.query().to_dict()
+        return self.load().to_dict()
 
     @property
     def index(self) -> Index:
+        if self._index is None:
+            return self._link_state.default_index()
         return self._index
 
     @property
@@ -115,14 +243,20 @@ class DatabaseBackend(Generic[T], DataBackend):
         return self._iloc
 
     def equals(self, other: DatabaseBackend):
-        if type(other) is not DatabaseBackend:
+        if type(other) is not type(self):
             return False
         return (
             self._data_token == other._data_token
             and self._store_class == other._store_class
-            and self._selected_columns == other._selected_columns
+            and self.columns == other.columns
+            and self._predicate_key() == other._predicate_key()
         )
 
+    def _predicate_key(self) -> Any:
+        if self._predicate is None:
+            return None
+        return QueryKeyCompiler().compile(self._predicate)
+
     def __eq__(self, other: Any) -> Query:
         if type(other) is PandasBackend:
             return DataStoreQuery(
@@ -132,7 +266,7 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 EqualsQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
@@ -145,7 +279,7 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 NotEqualsQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
@@ -158,7 +292,7 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 GreaterThanQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
@@ -171,7 +305,7 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 GreaterEqualQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
@@ -184,7 +318,7 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 LessThanQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
@@ -197,90 +331,356 @@ class DatabaseBackend(Generic[T], DataBackend):
             return ColumnQuery(
                 LessEqualQuery,
                 AndGroupQuery,
-                self._selected_columns,
+                self.columns,
                 other,
             )
 
     def __len__(self):
-        return self._database.row_count(self._data_token)
+        return self._link_state.row_count()
 
     def __iter__(self):
-        return iter(self._selected_columns)
+        return iter(self.columns)
 
     def iterrows(self):
-        return self.query().iterrows()
+        return self.load().iterrows()
 
-    def itertuples(self):
-        return self.query().itertuples()
+    def itertuples(self, ignore_index: bool = False):
+        return self.load().itertuples(ignore_index=ignore_index)
 
     def __getitem__(self, item: str) -> Any:
-        return DatabaseBackend(
+        return type(self)(
             self._store_class,
             self._database,
             self._data_token,
             selected_columns=[item],
             read_only=self._read_only,
+            link_state=self._link_state,
+            predicate=self._predicate,
         )
 
     def getitems(self, items: list[str]) -> DatabaseBackend:
-        return DatabaseBackend(
+        return type(self)(
             self._store_class,
             self._database,
             self._data_token,
             selected_columns=items,
             read_only=self._read_only,
+            link_state=self._link_state,
+            predicate=self._predicate,
         )
 
     def __setitem__(self, item: str, value: Any) -> None:
-        raise NotImplementedError("The current version of Tanuki does not support Store to DB writing")
+        self._check_writable()
+        if item in self._alignment_columns():
+            raise UnsupportedOperation(f"Cannot assign to alignment column '{item}'")
+        if self._link_state.change_log.has_pending("insert"):
+            raise UnsupportedOperation(
+                f"Cannot assign to '{item}' with uncommitted appends, commit them first"
+            )
+        if isinstance(value, DataBackend):
+            value = value.values
+        changes = self._keys()
+        changes[item] = value
+        self._link_state.change_log.record("update", changes)
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise UnsupportedOperation(
+                f"Database link {self._data_token} is read only, link with read_only=False to write"
+            )
 
-    def getmask(self, mask: list[bool]) -> DatabaseBackend:
-        indices = np.where(mask)[0]
-        return self.query().iloc[indices]
+    def _alignment_columns(self) -> list[str]:
+        keys = [
+            [str(col) for col in index.columns]
+            for index in self._store_class._parse_indices().values()
+            if index.unique and index.where is None
+        ]
+        if len(keys) == 0:
+            raise UnsupportedOperation(
+                f"{self._store_class.__name__} has no unique Index to align writes on"
+            )
+        if self._has_declared_index() and list(self._index.columns) in keys:
+            return list(self._index.columns)
+        return keys[0]
+
+    def _keys(self, rows: Optional[list[int]] = None) -> DataFrame:
+        keys = self._database.query(
+            self._store_class,
+            self._data_token,
+            self._predicate,
+            self._alignment_columns(),
+            offset=0 if rows is None else None,
+            rows=rows,
+        )
+        return keys.to_pandas().reset_index(drop=True)
+
+    def commit(self) -> None:
+        self._check_writable()
+        changes = self._link_state.change_log.drain()
+        if len(changes) == 0:
+            return
+        alignment = self._alignment_columns()
+        store_type = self._link_state.store_type()
+        with self._database.transaction():
+            for kind, data in changes:
+                store = store_type.from_pandas(data)
+                if kind == "update":
+                    self._database.update(self._data_token, store, alignment)
+                elif kind == "insert":
+                    self._database.insert(self._data_token, store)
+                else:
+                    self._database.delete_keys(self._data_token, store, alignment)
+
+    def rollback(self) -> None:
+        self._link_state.change_log.clear()
+
+    def __enter__(self) -> DatabaseBackend:
+        return self
+
+    def __exit__(self, etype, value, traceback) -> None:
+        if etype is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def getmask(self, mask: list[bool]) -> PandasBackend:
+        if isinstance(mask, DataBackend):
+            mask = mask.values
+        positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+        return self._positions(positions)
+
+    def _has_declared_index(self) -> bool:
+        return self._index is not None and len(self._index.columns) > 0
+
+    def _combine(self, query: Optional[Query]) -> Optional[Query]:
+        if query is None:
+            return self._predicate
+        elif self._predicate is None:
+            return query
+        return AndQuery(self._predicate, query)
+
+    def _fetch(
+        self,
+        query: Optional[Query] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+    ) -> DataFrame:
+        datastore = self._database.query(
+            self._store_class,
+            self._data_token,
+            self._combine(query),
+            self.columns,
+            offset=offset,
+            limit=limit,
+            rows=rows,
+        )
+        return datastore.to_pandas()
+
+    def _labelled(self, data: DataFrame, positions: np.ndarray) -> PandasBackend:
+        data.index = PIndex(positions, name="index")
+        backend = PandasBackend(data)
+        if self._has_declared_index():
+            backend = backend.set_index(self._index)
+        return backend
+
+    def _window(self, offset: int, limit: Optional[int]) -> PandasBackend:
+        data = self._fetch(offset=offset, limit=limit)
+        return self._labelled(data, np.arange(offset, offset + len(data)))
+
+    def _positions(self, positions: np.ndarray) -> PandasBackend:
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) > 0 and positions.min() < 0:
+            positions = np.where(positions < 0, positions + len(self), positions)
+        unique = np.unique(positions)
+        if len(unique) == 0:
+            return self._window(0, 0)
+        elif unique[-1] - unique[0] + 1 == len(unique):
+            data = self._fetch(offset=int(unique[0]), limit=len(unique))
+        else:
+            data = self._fetch(rows=unique.tolist())
+        if len(data) != len(unique) or unique[0] < 0:
+            raise IndexError("positional indexers are out-of-bounds")
+        result = self._labelled(data, unique)
+        if len(unique) == len(positions) and np.array_equal(unique, positions):
+            return result
+        return result.iloc[np.searchsorted(unique, positions).tolist()]
+
+    def _slice(self, item: slice) -> PandasBackend:
+        start, stop, step = item.start, item.stop, item.step
+        if (
+            step in (None, 1)
+            and (start is None or start >= 0)
+            and (stop is None or stop >= 0)
+        ):
+            offset = 0 if start is None else start
+            limit = None if stop is None else max(stop - offset, 0)
+            return self._window(offset, limit)
+        return self._positions(np.arange(len(self))[item])
+
+    def sort_values(
+        self,
+        columns: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        limit: Optional[int] = None,
+    ) -> PandasBackend:
+        positions = self._database.sort_positions(
+            self._data_token, columns, ascending, self._predicate, limit
+        )
+        return self._positions(np.asarray(positions, dtype=np.int64))
+
+    def head(self, n: int = 5) -> PandasBackend:
+        return self._window(0, max(n, 0))
+
+    def join(
+        self, other: DataBackend, on: list[str], how: str = "inner"
+    ) -> PandasBackend:
+        if isinstance(other, DatabaseBackend) and other._database is self._database:
+            return PandasBackend(
+                self._database.join(
+                    self._data_token,
+                    other._data_token,
+                    on,
+                    how,
+                    left_query=self._predicate,
+                    right_query=other._predicate,
+                    left_columns=self.columns,
+                    right_columns=other.columns,
+                )
+            )
+        return self.load().join(other, on, how)
+
+    def _index_query(self, item: Any) -> Query:
+        columns = self._index.columns
+        if isinstance(item, slice):
+            if len(columns) != 1 or item.step is not None:
+                raise NotImplementedError(
+                    "Only unit step slices over single column indices are supported"
+                )
+            bounds = []
+            if item.start is not None:
+                bounds.append(GreaterEqualQuery(columns[0], item.start))
+            if item.stop is not None:
+                bounds.append(LessEqualQuery(columns[0], item.stop))
+            return AndGroupQuery(bounds)
+        if not isinstance(item, list):
+            item = [item]
+        rows = [key if isinstance(key, tuple) else (key,) for key in item]
+        if len(columns) == 1:
+            return InQuery(columns[0], [row[0] for row in rows])
+        return RowInQuery(columns, rows)
+
+    def _lookup(self, item: Any) -> PandasBackend:
+        if self._has_declared_index():
+            data = self._fetch(self._index_query(item))
+            backend = PandasBackend(data).set_index(self._index)
+            if not isinstance(item, slice):
+                return backend.loc[item]
+            elif len(data) == 0:
+                raise KeyError(item)
+            return backend
+        if isinstance(item, slice):
+            if item.step is not None:
+                return self.load().loc[item]
+            offset = 0 if item.start is None else item.start
+            limit = None if item.stop is None else max(item.stop - offset + 1, 0)
+            return self._window(offset, limit)
+        if not isinstance(item, Iterable) or isinstance(item, str):
+            item = [item]
+        positions = np.asarray(item)
+        if positions.dtype.kind not in "iu" or (len(positions) > 0 and positions.min() < 0):
+            raise KeyError(item)
+        try:
+            return self._positions(positions)
+        except IndexError:
+            raise KeyError(item)
 
     def get_index(self, index_alias: IndexAlias) -> Index:
         cols = [str(col) for col in index_alias.columns]
         return DatabaseIndex(index_alias.name, self.getitems(cols))
 
     def set_index(self, index: Union[Index, IndexAlias]) -> PandasBackend:
-        return DatabaseBackend(
+        return type(self)(
             self._store_class,
             self._database,
             self._data_token,
             index=self.get_index(index),
             selected_columns=self._selected_columns,
             read_only=self._read_only,
+            link_state=self._link_state,
+            predicate=self._predicate,
         )
 
     def reset_index(self) -> PandasBackend:
-        pindex = PIndex(np.arange(0, len(self)), name="index")
-        return DatabaseBackend(
+        return type(self)(
             self._store_class,
             self._database,
             self._data_token,
-            index=PandasIndex(pindex, []),
             selected_columns=self._selected_columns,
             read_only=self._read_only,
+            link_state=self._link_state,
+            predicate=self._predicate,
         )
 
     def drop_indices(self, indices: list[int]) -> DatabaseBackend:
-        raise NotImplementedError("The current version of Tanuki does not support Store to DB writing")
+        self._check_writable()
+        alignment = self._alignment_columns()
+        if self._has_declared_index():
+            keys = [key if isinstance(key, tuple) else (key,) for key in indices]
+            changes = DataFrame(keys, columns=alignment)
+        else:
+            positions = np.unique(np.asarray(indices, dtype=np.int64)).tolist()
+            changes = self._keys(rows=positions)
+            if len(changes) != len(positions):
+                raise KeyError(indices)
+        self._link_state.change_log.record("delete", changes)
+        return self
+
+    def query(self, query: Optional[Query] = None) -> DatabaseBackend:
+        if query is None:
+            return self
+        predicate = self._combine(query)
+        return type(self)(
+            self._store_class,
+            self._database,
+            self._data_token,
+            index=self._index,
+            selected_columns=self._selected_columns,
+            read_only=self._read_only,
+            link_state=self._link_state.filtered(predicate),
+            predicate=predicate,
+        )
 
-    def query(self, query: Optional[Query] = None) -> PandasBackend:
-        datastore = self._database.query(
-            self._store_class, self._data_token, query, self._selected_columns
+    def nunique(self) -> Series:
+        aggregations = {column: ["nunique"] for column in self.columns}
+        counts = self.aggregate(aggregations).to_pandas().iloc[0]
+        counts.index = self.columns
+        return counts
+
+    def aggregate(
+        self,
+        aggregations: dict[str, list[str]],
+        group_by: Optional[list[str]] = None,
+    ) -> PandasBackend:
+        return PandasBackend(
+            self._database.aggregate(
+                self._data_token, aggregations, group_by, self._predicate
+            )
         )
-        if len(self.index.columns) > 0:
-            datastore.set_index(self.index)
-        return datastore._data_backend
 
     def append(
-        clt: DatabaseBackend, new_backend: DatabaseBackend, ignore_index: bool = False
+        self, new_backend: DataBackend, ignore_index: bool = False
     ) -> DatabaseBackend:
-        raise NotImplementedError("The current version of Tanuki does not support Store to DB writing")
+        self._check_writable()
+        changes = new_backend.load().to_pandas().reset_index(drop=True)
+        self._link_state.change_log.record("insert", changes)
+        return self
 
     def __str__(self: DatabaseBackend) -> str:
-        return f"Database Link: {self._data_token}\nActive Columns: {self._selected_columns}"
+        result = f"Database Link: {self._data_token}\nActive Columns: {self.columns}"
+        if self._predicate is not None:
+            result += f"\nFilter: {self._predicate}"
+        return result
 
     def __repr__(self: DatabaseBackend) -> str:
         return str(self)
@@ -291,7 +691,10 @@ class DatabaseBackend(Generic[T], DataBackend):
         all_backends: list[DatabaseBackend],
         ignore_index: bool = False,
     ) -> DatabaseBackend:
-        raise NotImplementedError("The current version of Tanuki does not support Store to DB writing")
+        database_backend = all_backends[0]
+        for backend in all_backends[1:]:
+            database_backend.append(backend, ignore_index=ignore_index)
+        return database_backend
 
 
 class _ILocIndexer(ILocIndexer[DatabaseBackend]):
@@ -300,8 +703,14 @@ class _ILocIndexer(ILocIndexer[DatabaseBackend]):
     def __init__(self, data_backend: DatabaseBackend) -> None:
         self._data_backend = data_backend
 
-    def __getitem__(self, item: Union[int, list, slice]) -> DatabaseBackend:
-        return self._data_backend.query().iloc[item]
+    def __getitem__(self, item: Union[int, list, slice, Index]) -> PandasBackend:
+        if isinstance(item, Index):
+            item = item.tolist()
+        if isinstance(item, slice):
+            return self._data_backend._slice(item)
+        if not isinstance(item, Iterable) or isinstance(item, str):
+            item = [item]
+        return self._data_backend._positions(item)
 
 
 class _LocIndexer(LocIndexer[DatabaseBackend]):
@@ -310,5 +719,5 @@ class _LocIndexer(LocIndexer[DatabaseBackend]):
     def __init__(self, data_backend: DatabaseBackend) -> None:
         self._data_backend = data_backend
 
-    def __getitem__(self, item: Union[Any, list, slice]) -> DatabaseBackend:
-        return self._data_backend.query().loc[item]
+    def __getitem__(self, item: Union[Any, list, slice]) -> PandasBackend:
+        return self._data_backend._lookup(item)
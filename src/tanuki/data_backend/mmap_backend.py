@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+import numpy as np
+
+from tanuki.database.mmap_database import MmapDatabase
+
+from .database_backend import DatabaseBackend
+
+T = TypeVar("T", bound="DataStore")
+
+
+class MmapBackend(DatabaseBackend[T]):
+    _database: MmapDatabase
+
+    @property
+    def values(self) -> np.ndarray:
+        if len(self.columns) != 1 or self._predicate is not None:
+            return super(MmapBackend, self).values
+        column = self.columns[0]
+        return self._database.read_columns(self._data_token, [column])[column]
+
+    def __str__(self: MmapBackend) -> str:
+        return f"Mmap Link: {self._data_token}\nActive Columns: {self.columns}"
@@ -7,8 +7,10 @@ import pandas as pd
 from pandas.core.frame import DataFrame
 from pandas.core.series import Series
 
+from tanuki.data_store.aggregation import result_column
 from tanuki.data_store.data_type import DataType
 from tanuki.data_store.index.index import Index
+from tanuki.data_store.join import RIGHT_SUFFIX
 from tanuki.data_store.index.pandas_index import PandasIndex
 from tanuki.database.data_token import DataToken
 
@@ -22,6 +24,7 @@ if TYPE_CHECKING:
 class PandasBackend(DataBackend):
     _data: DataFrame
     _index: PandasIndex
+    _index_cache: dict[tuple[str, tuple[str, ...]], PandasIndex]
     _loc: _LocIndexer
     _iloc: _ILocIndexer
 
@@ -29,6 +32,7 @@ class PandasBackend(DataBackend):
         self,
         data: Optional[Union(Series, DataFrame, dict[str, list])] = None,
         index: Optional[PandasIndex] = None,
+        index_cache: Optional[dict[tuple[str, tuple[str, ...]], PandasIndex]] = None,
     ) -> None:
         if data is None:
             self._data = DataFrame(dtype="object")
@@ -53,6 +57,7 @@ class PandasBackend(DataBackend):
                 index = PandasIndex(index)
             self._data.index = index._data
             self._index = index
+        self._index_cache = {} if index_cache is None else index_cache
         self._loc = _LocIndexer(self)
         self._iloc = _ILocIndexer(self)
 
@@ -62,6 +67,12 @@ class PandasBackend(DataBackend):
     def link_token(self) -> Optional[DataToken]:
         return None
 
+    def link_query(self) -> Optional[Query]:
+        return None
+
+    def load(self) -> PandasBackend:
+        return self
+
     def to_pandas(self) -> DataFrame:
         return self._data
 
@@ -158,31 +169,125 @@ class PandasBackend(DataBackend):
             yield values
 
     def __getitem__(self, item: str) -> Any:
-        return PandasBackend(self._data[item].to_frame())
+        return PandasBackend(self._data[item].to_frame(), index_cache=self._index_cache)
 
     def getitems(self, items: list[str]) -> PandasBackend:
-        return PandasBackend(self._data[items])
+        return PandasBackend(self._data[items], index_cache=self._index_cache)
 
     def getmask(self, mask: list[bool]) -> PandasBackend:
         return PandasBackend(self._data[mask])
 
     def query(self, query: "Query") -> PandasBackend:
         from tanuki.database.adapter.query.pandas_query_compiler import PandasQueryCompiler
+        from tanuki.database.adapter.query.query_optimizer import QueryOptimizer
+
+        from tanuki.database.adapter.query.pandas_index_selector import (
+            PandasIndexSelector,
+        )
+
+        query = QueryOptimizer().optimize(query)
+        if query is None:
+            return PandasBackend(self._data.copy(), index_cache=dict(self._index_cache))
+        indices = list(self._index_cache.values()) + [self._index]
+        positions = PandasIndexSelector(self._data, indices).select(query)
+        if positions is None:
+            positions = PandasQueryCompiler(self._data).select(query)
+        index_cache = {
+            key: index.take(positions) for key, index in self._index_cache.items()
+        }
+        return PandasBackend(self._data.iloc[positions], index_cache=index_cache)
+
+    def _column_values(self, column: str) -> np.ndarray:
+        if column in self._data.columns:
+            return self._data[column].to_numpy()
+        level = self._index.columns.index(column)
+        return self._data.index.get_level_values(level).to_numpy()
+
+    @staticmethod
+    def _top_k(values: np.ndarray, limit: int, ascending: bool) -> Optional[np.ndarray]:
+        if (
+            values.dtype.kind not in "biufmM"
+            or limit >= len(values)
+            or pd.isna(values).any()
+        ):
+            return None
+        if limit <= 0:
+            return np.arange(0)
+        total = len(values)
+        if ascending:
+            kth = values[np.argpartition(values, limit - 1)[limit - 1]]
+            better = np.flatnonzero(values < kth)
+        else:
+            kth = values[np.argpartition(values, total - limit)[total - limit]]
+            better = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[: limit - len(better)]
+        candidates = np.sort(np.concatenate([better, ties]))
+        selected = values[candidates]
+        if ascending:
+            order = np.argsort(selected, kind="stable")
+        else:
+            order = len(selected) - 1 - np.argsort(selected[::-1], kind="stable")[::-1]
+        return candidates[order]
 
-        query_compiler = PandasQueryCompiler(self._data)
-        query = query_compiler.compile(query)
-        return PandasBackend(self._data[query])
+    def _take(self, positions: Union[np.ndarray, slice]) -> PandasBackend:
+        result = self._data.iloc[positions]
+        return PandasBackend(result, PandasIndex(result.index, self._index.columns))
+
+    def sort_values(
+        self,
+        columns: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        limit: Optional[int] = None,
+    ) -> PandasBackend:
+        if type(ascending) is list and len(ascending) == 1:
+            ascending = ascending[0]
+        order = None
+        if limit is not None and len(columns) == 1 and type(ascending) is bool:
+            order = self._top_k(self._column_values(columns[0]), limit, ascending)
+        if order is None:
+            keys = DataFrame({col: self._column_values(col) for col in columns})
+            keys = keys.sort_values(columns, ascending=ascending, kind="stable")
+            order = keys.index.to_numpy()[:limit]
+        return self._take(order)
+
+    def head(self, n: int = 5) -> PandasBackend:
+        return self._take(slice(0, max(n, 0)))
+
+    def join(
+        self, other: DataBackend, on: list[str], how: str = "inner"
+    ) -> PandasBackend:
+        result = self._data.merge(
+            other.load().to_pandas(),
+            how=how,
+            on=on,
+            suffixes=("", RIGHT_SUFFIX),
+            sort=False,
+        )
+        return PandasBackend(result.reset_index(drop=True))
 
     def __setitem__(self, items: str, value: Any) -> None:
         if isinstance(value, PandasBackend):
             value = value._data
         self._data[items] = value
+        self._index_cache = {}
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
 
     def get_index(self, index_alias: IndexAlias) -> Index:
         cols = [str(col) for col in index_alias.columns]
-        new_data = self._data.set_index(cols)
-        new_data.index.name = index_alias.name
-        return PandasIndex(new_data.index, cols)
+        key = (index_alias.name, tuple(cols))
+        if key not in self._index_cache:
+            if len(cols) == 1:
+                data_index = pd.Index(self._data[cols[0]], name=index_alias.name)
+            else:
+                data_index = pd.MultiIndex.from_frame(self._data[cols])
+                data_index.name = index_alias.name
+            self._index_cache[key] = PandasIndex(data_index, cols)
+        return self._index_cache[key]
 
     def set_index(self, index: Union[Index, IndexAlias]) -> PandasBackend:
         cols = [str(col) for col in index.columns]
@@ -218,9 +323,35 @@ class PandasBackend(DataBackend):
         all_data = [backend._data for backend in all_backends]
         return PandasBackend(pd.concat(all_data, ignore_index=ignore_index))
 
-    def nunique(self) -> int:
+    def nunique(self) -> Series:
         return self._data.nunique()
 
+    def aggregate(
+        self,
+        aggregations: dict[str, list[str]],
+        group_by: Optional[list[str]] = None,
+    ) -> PandasBackend:
+        named = {
+            result_column(column, function): (column, function)
+            for column, functions in aggregations.items()
+            for function in functions
+        }
+        if group_by is None or len(group_by) == 0:
+            result = DataFrame(
+                {
+                    name: [self._data[column].agg(function)]
+                    for name, (column, function) in named.items()
+                },
+                columns=list(named.keys()),
+            )
+        else:
+            result = (
+                self._data.groupby(group_by, sort=True, dropna=False)
+                .agg(**named)
+                .reset_index()
+            )
+        return PandasBackend(result)
+
     def __str__(self) -> str:
         return str(self._data)
 
@@ -253,5 +384,27 @@ class _LocIndexer(LocIndexer[PandasBackend]):
     def __getitem__(self, item: Union[Any, list, slice]) -> PandasBackend:
         if not isinstance(item, Iterable) or isinstance(item, str):
             item = [item]
+        positions = self._positions(item)
+        if positions is not None:
+            return PandasBackend(self._data_backend._data.iloc[positions])
         result = self._data_backend._data.loc[item]
         return PandasBackend(result)
+
+    def _positions(self, item: Any) -> Optional[np.ndarray]:
+        index = self._data_backend._index
+        if type(item) is not list or len(item) == 0 or len(index.columns) == 0:
+            return None
+        groups = []
+        for key in item:
+            values = list(key) if type(key) is tuple else [key]
+            if (
+                isinstance(key, (bool, np.bool_))
+                or len(values) != len(index.columns)
+                or not index.is_hashable(values)
+            ):
+                return None
+            positions = index.get_positions(key)
+            if len(positions) == 0:
+                return None
+            groups.append(positions)
+        return np.concatenate(groups)
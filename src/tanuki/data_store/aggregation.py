@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from types import new_class
+from typing import Any, Optional, Type, TYPE_CHECKING, TypeVar, Union
+
+from .data_type import (
+    Boolean,
+    DataType,
+    Float16,
+    Float32,
+    Float64,
+    Int16,
+    Int32,
+    Int64,
+    Int8,
+    UInt16,
+    UInt32,
+    UInt64,
+    UInt8,
+)
+
+if TYPE_CHECKING:
+    from .column_alias import ColumnAlias
+    from .data_store import DataStore
+
+T = TypeVar("T", bound="DataStore")
+
+AGGREGATIONS = ["count", "sum", "min", "max", "mean", "nunique"]
+
+_FLOAT_TYPES = {Float16, Float32, Float64}
+_INTEGER_TYPES = {Boolean, Int8, Int16, Int32, Int64, UInt8, UInt16, UInt32, UInt64}
+
+_result_types: dict[tuple, Type[DataStore]] = {}
+
+
+def normalise_aggregations(
+    aggregations: dict[Union[str, ColumnAlias], Union[str, list[str]]]
+) -> dict[str, list[str]]:
+    normalised = {}
+    for column, functions in aggregations.items():
+        if isinstance(functions, str):
+            functions = [functions]
+        for function in functions:
+            if function not in AGGREGATIONS:
+                raise ValueError(
+                    f"Unknown aggregation '{function}', expected one of {AGGREGATIONS}"
+                )
+        normalised[str(column)] = list(functions)
+    return normalised
+
+
+def result_column(column: str, function: str) -> str:
+    return f"{column}_{function}"
+
+
+def result_columns(aggregations: dict[str, list[str]]) -> list[str]:
+    return [
+        result_column(column, function)
+        for column, functions in aggregations.items()
+        for function in functions
+    ]
+
+
+def result_dtype(function: str, dtype: DataType) -> DataType:
+    if function in ("count", "nunique"):
+        return Int64
+    elif function == "mean":
+        return Float64
+    elif function == "sum":
+        if dtype in _FLOAT_TYPES:
+            return Float64
+        elif dtype in _INTEGER_TYPES:
+            return Int64
+        return dtype
+    else:
+        return dtype
+
+
+def aggregate_store_type(
+    store_class: Type[T],
+    aggregations: dict[str, list[str]],
+    group_by: Optional[list[str]] = None,
+) -> Type[DataStore]:
+    from .column_alias import ColumnAlias
+    from .data_store import DataStore
+
+    group_by = [] if group_by is None else group_by
+    key = (
+        store_class,
+        tuple(group_by),
+        tuple((column, tuple(functions)) for column, functions in aggregations.items()),
+    )
+    if key in _result_types:
+        return _result_types[key]
+
+    source_columns = store_class._parse_columns()
+    annotations: dict[str, Any] = {}
+    for column in group_by:
+        annotations[column] = ColumnAlias(source_columns[column].dtype)
+    for column, functions in aggregations.items():
+        dtype = source_columns[column].dtype
+        for function in functions:
+            name = result_column(column, function)
+            annotations[name] = ColumnAlias(result_dtype(function, dtype))
+
+    result_type = new_class(
+        f"{store_class.__name__}Aggregate",
+        (DataStore,),
+        {"register": False},
+        lambda namespace: namespace.update({"__annotations__": annotations}),
+    )
+    _result_types[key] = result_type
+    return result_type
@@ -152,8 +152,27 @@ class Column(Generic[T]):
             dtype=self.dtype,
         )
 
-    def nunique(self) -> int:
-        return self._data_backend.nunique()[self.name]
+    def _reduce(self: Column[T], function: str) -> Any:
+        result = self._data_backend.aggregate({self.name: [function]})
+        return result.to_pandas().iloc[0, 0]
+
+    def count(self: Column[T]) -> int:
+        return self._reduce("count")
+
+    def sum(self: Column[T]) -> Any:
+        return self._reduce("sum")
+
+    def min(self: Column[T]) -> Any:
+        return self._reduce("min")
+
+    def max(self: Column[T]) -> Any:
+        return self._reduce("max")
+
+    def mean(self: Column[T]) -> float:
+        return self._reduce("mean")
+
+    def nunique(self: Column[T]) -> int:
+        return self._reduce("nunique")
 
     def equals(self: Column[T], other: Any) -> bool:
         if type(other) is Column:
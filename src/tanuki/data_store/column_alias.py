@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from io import UnsupportedOperation
-from typing import Optional
+from typing import Any, Iterable, Optional
 
 from tanuki.data_store.data_type import DataType, TypeAlias
 
@@ -65,6 +65,18 @@ class ColumnAlias:
     def __le__(self, o: object) -> LessEqualQuery:
         return LessEqualQuery(self, o)
 
+    def isin(self, values: Iterable) -> InQuery:
+        return InQuery(self, list(values))
+
+    def between(self, low: Any, high: Any) -> BetweenQuery:
+        return BetweenQuery(self, low, high)
+
+    def startswith(self, prefix: str) -> StartsWithQuery:
+        return StartsWithQuery(self, prefix)
+
+    def isnull(self) -> IsNullQuery:
+        return IsNullQuery(self)
+
     def __len__(self) -> RowCountQuery:
         return RowCountQuery(self)
 
@@ -83,14 +95,18 @@ from typing import Any, Iterable, Union
 
 from .query import (
     AndQuery,
+    BetweenQuery,
     EqualsQuery,
     GreaterEqualQuery,
     GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
     LessEqualQuery,
     LessThanQuery,
     NotEqualsQuery,
     OrQuery,
     RowCountQuery,
+    StartsWithQuery,
     SumQuery,
 )
 
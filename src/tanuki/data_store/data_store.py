@@ -20,13 +20,15 @@ from pandas import DataFrame, Series
 
 from tanuki.data_backend.data_backend import DataBackend
 from tanuki.data_backend.pandas_backend import PandasBackend
+from tanuki.data_store.aggregation import aggregate_store_type, normalise_aggregations
 from tanuki.data_store.column import Column
 from tanuki.data_store.column_alias import ColumnAlias
 from tanuki.data_store.data_type import Boolean, DataType, String, TypeAlias
 from tanuki.data_store.index.index import Index
 from tanuki.data_store.index.index_alias import IndexAlias
+from tanuki.data_store.join import join_store_type, JOIN_TYPES
 from tanuki.data_store.metadata import Metadata
-from tanuki.data_store.query import Query
+from tanuki.data_store.query import keyset_query, Query
 from tanuki.database.data_token import DataToken
 
 from .storable_type_factory import StorableTypeFactory
@@ -60,7 +62,6 @@ class DataStore:
     _data_backend: B
     loc: DataStore._LocIndexer[T]
     iloc: DataStore._ILocIndexer[T]
-    index: Index
     metadata: Optional[M]
 
     def __init_subclass__(
@@ -108,18 +109,19 @@ class DataStore:
         self._all_columns = self._parse_columns()
         self._active_columns = self._parse_active_columns()
         self.columns = list(self._active_columns.values())
-        self.index = self._data_backend.index
         self.loc = DataStore._LocIndexer[T](self)
         self.iloc = DataStore._ILocIndexer[T](self)
 
+    @property
+    def index(self: T) -> Index:
+        return self._data_backend.index
+
     @classmethod
     def link(
         cls: Type[T], database: D, data_token: DataToken, read_only: bool = True
     ) -> T:
-        from tanuki.data_backend.database_backend import DatabaseBackend
-
         return cls.from_backend(
-            DatabaseBackend[T](cls, database, data_token, read_only=read_only),
+            database.link_backend(cls, data_token, read_only=read_only),
             validate=False,
         )
 
@@ -163,6 +165,9 @@ class DataStore:
     def link_token(self: T) -> Optional[DataToken]:
         return self._data_backend.link_token()
 
+    def link_query(self: T) -> Optional[Query]:
+        return self._data_backend.link_query()
+
     def load(self: T) -> T:
         return self.from_backend(self._data_backend.load())
 
@@ -234,20 +239,18 @@ class DataStore:
                 setattr(self, name, None)
 
     def _attach_indices(self: T) -> None:
-        indices = self._parse_indices()
-        active_columns = self._parse_active_columns()
-        for name, alias in indices.items():
-            col_names = [col.name for col in alias.columns]
-            has_columns = True
-            for col in col_names:
-                if col not in active_columns:
-                    has_columns = False
-                    break
-            if not has_columns:
-                setattr(self, name, None)
-            else:
-                index = self._data_backend.get_index(alias)
-                setattr(self, name, index)
+        for name in self._parse_indices().keys():
+            self.__dict__.pop(name, None)
+
+    def _get_index(self: T, alias: IndexAlias) -> Optional[Index]:
+        for col in alias.columns:
+            if str(col) not in self._active_columns:
+                index = None
+                break
+        else:
+            index = self._data_backend.get_index(alias)
+        setattr(self, alias.name, index)
+        return index
 
     def __contains__(self: T, key):
         return str(key) in self._all_columns
@@ -344,6 +347,42 @@ class DataStore:
     def query(self: T, query: Optional[Query] = None) -> T:
         return self.from_backend(self._data_backend.query(query), self.metadata)
 
+    def sort_values(
+        self: T,
+        columns: Union[str, ColumnAlias, list[Union[str, ColumnAlias]]],
+        ascending: Union[bool, list[bool]] = True,
+        limit: Optional[int] = None,
+    ) -> T:
+        if not isinstance(columns, list):
+            columns = [columns]
+        columns = [str(column) for column in columns]
+        return self.from_backend(
+            self._data_backend.sort_values(columns, ascending, limit), self.metadata
+        )
+
+    def head(self: T, n: int = 5) -> T:
+        return self.from_backend(self._data_backend.head(n), self.metadata)
+
+    def page(
+        self: T, after: Optional[Any] = None, size: int = 100, ascending: bool = True
+    ) -> T:
+        columns = self._page_columns()
+        data_store = self
+        if after is not None:
+            data_store = self.query(keyset_query(columns, after, ascending))
+        return data_store.sort_values(columns, ascending=ascending, limit=size)
+
+    def _page_columns(self: T) -> list[ColumnAlias]:
+        names = self.index.columns
+        if len(names) == 0:
+            indices = list(self._parse_indices().values())
+            if len(indices) == 0:
+                raise ValueError(
+                    f"{self.__class__.__name__} has no Index to page through"
+                )
+            names = [str(column) for column in indices[0].columns]
+        return [self._all_columns[str(name)] for name in names]
+
     def __getitem__(
         self: T, item: Union[ColumnAlias, list[ColumnAlias], list[bool], Query]
     ) -> Union[Column, T]:
@@ -371,6 +410,27 @@ class DataStore:
             result = self.from_backend(result, self.metadata)
         return result
 
+    def __setitem__(self: T, item: Union[str, ColumnAlias], value: Any) -> None:
+        if isinstance(value, Column) or isinstance(value, DataStore):
+            value = value._data_backend
+        self._data_backend[str(item)] = value
+        self._compile()
+
+    def commit(self: T) -> None:
+        self._data_backend.commit()
+
+    def rollback(self: T) -> None:
+        self._data_backend.rollback()
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self: T, etype, value, traceback) -> None:
+        if etype is None:
+            self.commit()
+        else:
+            self.rollback()
+
     def __getattr__(self: T, name: str) -> Any:
         if name[0] != "_":
             raise AttributeError(
@@ -409,6 +469,66 @@ class DataStore:
             all_data_stores[0].metadata,
         )
 
+    def agg(
+        self: T, aggregations: dict[Union[str, ColumnAlias], Union[str, list[str]]]
+    ) -> DataStore:
+        return self._aggregate(aggregations)
+
+    def groupby(
+        self: T, *columns: Union[str, ColumnAlias, list[Union[str, ColumnAlias]]]
+    ) -> DataStore._GroupBy[T]:
+        if len(columns) == 1 and isinstance(columns[0], list):
+            columns = columns[0]
+        return DataStore._GroupBy[T](self, [str(column) for column in columns])
+
+    def _aggregate(
+        self: T,
+        aggregations: dict[Union[str, ColumnAlias], Union[str, list[str]]],
+        group_by: Optional[list[str]] = None,
+    ) -> DataStore:
+        aggregations = normalise_aggregations(aggregations)
+        unknown_columns = [
+            column
+            for column in list(aggregations.keys()) + (group_by or [])
+            if column not in self._all_columns
+        ]
+        if len(unknown_columns) > 0:
+            raise ValueError(
+                f"The following columns do not exist in {self.__class__.__name__}: {unknown_columns}"
+            )
+        result_type = aggregate_store_type(type(self), aggregations, group_by)
+        return result_type.from_backend(
+            self._data_backend.aggregate(aggregations, group_by)
+        )
+
+    def join(
+        self: T,
+        other: DataStore,
+        on: Union[IndexAlias, str, ColumnAlias, list[Union[str, ColumnAlias]]],
+        how: str = "inner",
+    ) -> DataStore:
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Unknown join type '{how}', expected one of {JOIN_TYPES}")
+        if isinstance(on, IndexAlias):
+            on = on.columns
+        elif not isinstance(on, list):
+            on = [on]
+        on = [str(column) for column in on]
+        left_columns = [str(column) for column in self.columns]
+        right_columns = [str(column) for column in other.columns]
+        for store, columns in [(self, left_columns), (other, right_columns)]:
+            missing = [column for column in on if column not in columns]
+            if len(missing) > 0:
+                raise ValueError(
+                    f"The following join columns do not exist in {store.__class__.__name__}: {missing}"
+                )
+        result_type = join_store_type(
+            type(self), left_columns, type(other), right_columns, on
+        )
+        return result_type.from_backend(
+            self._data_backend.join(other._data_backend, on, how)
+        )
+
     @classmethod
     def builder(cls: Type[T]) -> DataStore._Builder[T]:
         return DataStore._Builder[cls](cls)
@@ -451,6 +571,19 @@ class DataStore:
             else:
                 return self._store_class(**self._row_data, metadata=metadata)
 
+    class _GroupBy(Generic[T]):
+        _data_store: T
+        _columns: list[str]
+
+        def __init__(self, data_store: T, columns: list[str]) -> None:
+            self._data_store = data_store
+            self._columns = columns
+
+        def agg(
+            self, aggregations: dict[Union[str, ColumnAlias], Union[str, list[str]]]
+        ) -> DataStore:
+            return self._data_store._aggregate(aggregations, self._columns)
+
     class _ILocIndexer(Generic[T]):
         _data_store: T
 
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING, TypeVar
+from typing import Any, Iterable, Optional, TYPE_CHECKING, TypeVar
 
 import numpy as np
+from pandas import DataFrame
+
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    ColumnQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    LessEqualQuery,
+)
 
 from .index import Index
 from .pandas_index import PandasIndex, PIndex
@@ -17,10 +26,12 @@ C = TypeVar("C", bound=tuple["ColumnAlias", ...])
 class DatabaseIndex(Index[C]):
     _name: str
     _data: DatabaseBackend
+    _cached: Optional[tuple[int, PandasIndex[C]]]
 
     def __init__(self, name: str, data: DatabaseBackend) -> None:
         self._name = name
         self._data = data
+        self._cached = None
 
     @property
     def name(self) -> str:
@@ -30,14 +41,67 @@ class DatabaseIndex(Index[C]):
     def columns(self) -> list[str]:
         return self._data.columns
 
-    def to_pandas(self) -> PandasIndex[C]:
-        df = self._data.to_pandas()
+    def _from_frame(self, df: DataFrame) -> PandasIndex[C]:
         index = df.set_index(self.columns).index
         index.name = self.name
         return PandasIndex(index, self.columns)
 
+    def _materialised(self) -> Optional[PandasIndex[C]]:
+        if self._cached is None or not self._data.caches_results():
+            return None
+        version, index = self._cached
+        if version != self._data.table_version():
+            self._cached = None
+            return None
+        return index
+
+    def to_pandas(self) -> PandasIndex[C]:
+        index = self._materialised()
+        if index is None:
+            version = self._data.table_version()
+            index = self._from_frame(self._data.to_pandas())
+            if self._data.caches_results():
+                self._cached = (version, index)
+        return index
+
     def __getitem__(self, item) -> Index[C]:
-        return self.to_pandas()[item]
+        index = self._materialised()
+        if index is not None:
+            return index[item]
+        scalar = not isinstance(item, (Iterable, slice)) or isinstance(item, str)
+        index = self._from_frame(self._data.iloc[item].to_pandas())
+        return index[0] if scalar else index
+
+    def _key_query(self, key: Any) -> ColumnQuery:
+        values = list(key) if isinstance(key, tuple) else [key]
+        if len(values) != len(self.columns):
+            raise KeyError(key)
+        return ColumnQuery(EqualsQuery, AndGroupQuery, self.columns, values)
+
+    def __contains__(self, key: Any) -> bool:
+        index = self._materialised()
+        if index is not None:
+            return key in index
+        try:
+            query = self._key_query(key)
+        except KeyError:
+            return False
+        return len(self._data.query(query)) > 0
+
+    def range(self, start: Any = None, stop: Any = None) -> PandasIndex[C]:
+        if len(self.columns) != 1:
+            raise ValueError("Index ranges require a single column index")
+        column = self.columns[0]
+        bounds = []
+        if start is not None:
+            bounds.append(GreaterEqualQuery(column, start))
+        if stop is not None:
+            bounds.append(LessEqualQuery(column, stop))
+        data = self._data
+        if len(bounds) > 0:
+            data = data.query(AndGroupQuery(bounds))
+        df = data.to_pandas().sort_values(self.columns, kind="stable")
+        return self._from_frame(df)
 
     @property
     def values(self) -> np.ndarray:
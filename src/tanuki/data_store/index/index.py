@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from abc import abstractmethod, abstractproperty
-from typing import Any, Generic, TYPE_CHECKING, TypeVar, Union
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, TYPE_CHECKING, TypeVar, Union
 
 import numpy as np
 
 if TYPE_CHECKING:
     from tanuki.data_store.column_alias import ColumnAlias
     from tanuki.data_store.index.pandas_index import PandasIndex
+    from tanuki.data_store.query import Query
 
 
 
@@ -31,6 +33,10 @@ class Index(Generic[C]):
     def __getitem__(self, item) -> Index[C]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def __contains__(self, item: Any) -> bool:
+        raise NotImplementedError()
+
     @abstractproperty
     def values(self: Index[C]) -> np.ndarray:
         raise NotImplementedError()
@@ -78,3 +84,13 @@ class Index(Generic[C]):
     @abstractmethod
     def __repr__(self: Index[C]) -> str:
         raise NotImplementedError()
+
+
+class SecondaryIndex(Index[C]):
+    pass
+
+
+@dataclass
+class IndexOptions:
+    unique: Optional[bool] = None
+    where: Optional[Query] = None
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING, Union
 
 
 if TYPE_CHECKING:
     from tanuki.data_store.column_alias import ColumnAlias
+    from tanuki.data_store.data_store import DataStore
+    from tanuki.data_store.index.index import Index
+    from tanuki.data_store.query import Query
 
 
 class IndexAlias:
     name: str
     columns: list[ColumnAlias]
-
-    def __init__(self, name: str, columns: list[ColumnAlias]) -> None:
+    unique: bool
+    where: Optional[Query]
+
+    def __init__(
+        self,
+        name: str,
+        columns: list[ColumnAlias],
+        unique: bool = True,
+        where: Optional[Query] = None,
+    ) -> None:
         self.name = name
         self.columns = columns
+        self.unique = unique
+        self.where = where
+
+    def __get__(
+        self, instance: Optional[DataStore], owner: Any
+    ) -> Union[IndexAlias, Optional[Index]]:
+        if instance is None:
+            return self
+        return instance._get_index(self)
 
     def __str__(self) -> str:
         return f"{self.name}: Index{self.columns}]"
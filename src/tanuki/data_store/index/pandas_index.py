@@ -1,10 +1,11 @@
 from __future__ import annotations
 import re
 
-from typing import Any, Iterable, TYPE_CHECKING, TypeVar, Union
+from typing import Any, Iterable, Optional, TYPE_CHECKING, TypeVar, Union
 
 import numpy as np
-from pandas import Index as PIndex
+import pandas as pd
+from pandas import Index as PIndex, MultiIndex
 
 from .index import Index
 
@@ -17,6 +18,12 @@ C = TypeVar("C", bound=tuple["ColumnAlias", ...])
 class PandasIndex(Index[C]):
     _data: PIndex
     _columns: list[str]
+    _lookup_levels: Optional[list[PIndex]]
+    _lookup_sizes: Optional[tuple[int, ...]]
+    _lookup_keys: Optional[np.ndarray]
+    _lookup_order: Optional[np.ndarray]
+    _sorted: Optional[PIndex]
+    _sorted_order: Optional[np.ndarray]
 
     def __init__(self, data: PIndex = PIndex([]), columns: list[str] = []) -> None:
         if not isinstance(data, Iterable) or isinstance(data, str):
@@ -25,6 +32,12 @@ class PandasIndex(Index[C]):
             data = PIndex(data, name="index")
         self._data = data
         self._columns = columns
+        self._lookup_levels = None
+        self._lookup_sizes = None
+        self._lookup_keys = None
+        self._lookup_order = None
+        self._sorted = None
+        self._sorted_order = None
 
     @property
     def name(self) -> Union[str, list[str]]:
@@ -34,6 +47,126 @@ class PandasIndex(Index[C]):
     def columns(self) -> list[str]:
         return self._columns
 
+    @property
+    def level_dtypes(self) -> list[np.dtype]:
+        if isinstance(self._data, MultiIndex):
+            return self._data.dtypes.tolist()
+        return [self._data.dtype]
+
+    def is_hashable(self, values: list) -> bool:
+        for dtype, value in zip(self.level_dtypes, values):
+            if dtype.kind == "O":
+                continue
+            elif dtype.kind == "b" and isinstance(value, (bool, np.bool_)):
+                continue
+            elif (
+                dtype.kind in "iu"
+                and isinstance(value, (int, float, np.number))
+                and not isinstance(value, (bool, np.bool_))
+            ):
+                continue
+            return False
+        try:
+            hash(tuple(values))
+        except TypeError:
+            return False
+        return True
+
+    def get_positions(self, key: Any) -> np.ndarray:
+        if self._lookup_keys is None:
+            self._build_lookup()
+        values = [key] if len(self._lookup_levels) == 1 else list(key)
+        codes = []
+        for level, value in zip(self._lookup_levels, values):
+            code = level.get_indexer([value])[0]
+            if code < 0:
+                return np.array([], dtype=np.intp)
+            codes.append(code)
+        packed = np.ravel_multi_index(codes, self._lookup_sizes)
+        start = self._lookup_keys.searchsorted(packed, side="left")
+        end = self._lookup_keys.searchsorted(packed, side="right")
+        return self._lookup_order[start:end]
+
+    def _build_lookup(self) -> None:
+        if isinstance(self._data, MultiIndex):
+            levels = list(self._data.levels)
+            codes = [np.asarray(level_codes) for level_codes in self._data.codes]
+        else:
+            level_codes, uniques = pd.factorize(self._data)
+            levels = [PIndex(uniques)]
+            codes = [level_codes]
+        valid = np.flatnonzero(np.all([code >= 0 for code in codes], axis=0))
+        sizes = tuple(max(len(level), 1) for level in levels)
+        try:
+            packed = np.ravel_multi_index([code[valid] for code in codes], sizes)
+        except ValueError:
+            level_codes, uniques = pd.factorize(self._data)
+            valid = np.flatnonzero(level_codes >= 0)
+            levels = [uniques]
+            sizes = (max(len(uniques), 1),)
+            packed = level_codes[valid]
+        order = np.argsort(packed, kind="stable")
+        self._lookup_levels = levels
+        self._lookup_sizes = sizes
+        self._lookup_keys = packed[order]
+        self._lookup_order = valid[order]
+
+    def range_positions(
+        self,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+    ) -> Optional[np.ndarray]:
+        if self._sorted_order is None:
+            self._build_sorted()
+        if self._sorted is None:
+            return None
+        try:
+            start = 0
+            if low is not None:
+                side = "left" if low_inclusive else "right"
+                start = self._sorted.searchsorted(low, side=side)
+            end = len(self._sorted)
+            if high is not None:
+                side = "right" if high_inclusive else "left"
+                end = self._sorted.searchsorted(high, side=side)
+        except TypeError:
+            return None
+        return self._sorted_order[start:end]
+
+    def _build_sorted(self) -> None:
+        values = self._data
+        if isinstance(values, MultiIndex):
+            values = values.get_level_values(0)
+        valid = np.flatnonzero(~pd.isna(values))
+        valid_values = values.take(valid)
+        try:
+            self._sorted_order = valid[valid_values.argsort(kind="stable")]
+        except TypeError:
+            self._sorted_order = np.array([], dtype=np.intp)
+            return
+        self._sorted = values.take(self._sorted_order)
+
+    def take(self, positions: np.ndarray) -> PandasIndex[C]:
+        index = PandasIndex(self._data.take(positions), self._columns)
+        if self._lookup_order is None and self._sorted_order is None:
+            return index
+        remap = np.full(len(self._data), -1, dtype=np.intp)
+        remap[positions] = np.arange(len(positions))
+        if self._lookup_order is not None:
+            kept = remap[self._lookup_order] >= 0
+            index._lookup_levels = self._lookup_levels
+            index._lookup_sizes = self._lookup_sizes
+            index._lookup_keys = self._lookup_keys[kept]
+            index._lookup_order = remap[self._lookup_order[kept]]
+        if self._sorted_order is not None:
+            kept = remap[self._sorted_order] >= 0
+            index._sorted_order = remap[self._sorted_order[kept]]
+            if self._sorted is not None:
+                index._sorted = self._sorted[kept]
+        return index
+
     def to_pandas(self) -> PandasIndex[C]:
         return PandasIndex(self._data, self._columns)
 
@@ -46,6 +179,9 @@ class PandasIndex(Index[C]):
             return result
         
 
+    def __contains__(self, item: Any) -> bool:
+        return item in self._data
+
     @property
     def values(self) -> np.ndarray:
         return self._data.values
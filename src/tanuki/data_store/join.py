@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from types import new_class
+from typing import Any, Type, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from .data_store import DataStore
+
+T = TypeVar("T", bound="DataStore")
+U = TypeVar("U", bound="DataStore")
+
+JOIN_TYPES = ["inner", "left", "right", "outer"]
+RIGHT_SUFFIX = "_right"
+
+_result_types: dict[tuple, Type[DataStore]] = {}
+
+
+def join_columns(
+    left_columns: list[str], right_columns: list[str], on: list[str]
+) -> list[tuple[str, str, str]]:
+    result = [(column, "left", column) for column in left_columns]
+    for column in right_columns:
+        if column in on:
+            continue
+        name = f"{column}{RIGHT_SUFFIX}" if column in left_columns else column
+        result.append((name, "right", column))
+    return result
+
+
+def join_store_type(
+    left_class: Type[T],
+    left_columns: list[str],
+    right_class: Type[U],
+    right_columns: list[str],
+    on: list[str],
+) -> Type[DataStore]:
+    from .column_alias import ColumnAlias
+    from .data_store import DataStore
+
+    key = (left_class, tuple(left_columns), right_class, tuple(right_columns), tuple(on))
+    if key in _result_types:
+        return _result_types[key]
+
+    sources = {
+        "left": left_class._parse_columns(),
+        "right": right_class._parse_columns(),
+    }
+    annotations: dict[str, Any] = {}
+    for name, side, column in join_columns(left_columns, right_columns, on):
+        annotations[name] = ColumnAlias(sources[side][column].dtype)
+
+    result_type = new_class(
+        f"{left_class.__name__}{right_class.__name__}Join",
+        (DataStore,),
+        {"register": False},
+        lambda namespace: namespace.update({"__annotations__": annotations}),
+    )
+    _result_types[key] = result_type
+    return result_type
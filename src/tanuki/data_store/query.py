@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Iterable, TypeVar, Union
+import sys
+from typing import Any, Iterable, Optional, TypeVar, Union
 from pandas import DataFrame, Series
 
 T = TypeVar("T")
@@ -58,8 +59,24 @@ class DataStoreQuery(Query):
         row_join_type: type[Query],
         dataframe: DataFrame,
     ) -> None:
-        sub_queries = [RowQuery(query_type, column_join_type, row) for _, row in dataframe.iterrows()]
-        self.a = row_join_type(sub_queries)
+        if query_type is EqualsQuery or query_type is NotEqualsQuery:
+            self.a = DataStoreQuery._membership(dataframe)
+            if query_type is NotEqualsQuery:
+                self.a = NotQuery(self.a)
+        else:
+            sub_queries = [
+                RowQuery(query_type, column_join_type, row)
+                for _, row in dataframe.iterrows()
+            ]
+            self.a = row_join_type(sub_queries)
+
+    @staticmethod
+    def _membership(dataframe: DataFrame) -> Query:
+        columns = [str(col) for col in dataframe.columns]
+        rows = list(dict.fromkeys(dataframe.itertuples(index=False, name=None)))
+        if len(columns) == 1:
+            return InQuery(columns[0], [row[0] for row in rows])
+        return RowInQuery(columns, rows)
 
     def compile(self, query_compiler: QueryCompiler[T]) -> T:
         return query_compiler.compile(self.a)
@@ -217,6 +234,102 @@ class LessEqualQuery(Query):
         return str(self)
 
 
+@dataclass
+class InQuery(Query):
+    a: Union[Any, Query]
+    b: list
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = query_compiler.compile(self.a)
+        return query_compiler.IN(InQuery(a, list(self.b)))
+
+    def __str__(self) -> str:
+        return f"{self.a} in {self.b}"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class BetweenQuery(Query):
+    a: Union[Any, Query]
+    low: Any
+    high: Any
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = query_compiler.compile(self.a)
+        return query_compiler.BETWEEN(BetweenQuery(a, self.low, self.high))
+
+    def __str__(self) -> str:
+        return f"{self.a} between {self.low} and {self.high}"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class StartsWithQuery(Query):
+    a: Union[Any, Query]
+    b: str
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = query_compiler.compile(self.a)
+        return query_compiler.STARTS_WITH(StartsWithQuery(a, self.b))
+
+    def __str__(self) -> str:
+        return f"{self.a} startswith {self.b}"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class IsNullQuery(Query):
+    a: Union[Any, Query]
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = query_compiler.compile(self.a)
+        return query_compiler.IS_NULL(IsNullQuery(a))
+
+    def __str__(self) -> str:
+        return f"{self.a} is null"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class RowInQuery(Query):
+    a: list
+    b: list[tuple]
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = [query_compiler.compile(column) for column in self.a]
+        return query_compiler.ROW_IN(RowInQuery(a, list(self.b)))
+
+    def __str__(self) -> str:
+        columns = ", ".join([str(column) for column in self.a])
+        return f"({columns}) in {self.b}"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class NotQuery(Query):
+    a: Union[bool, Query]
+
+    def compile(self, query_compiler: QueryCompiler[T]) -> T:
+        a = query_compiler.compile(self.a)
+        return query_compiler.NOT(NotQuery(a))
+
+    def __str__(self) -> str:
+        return f"not ({self.a})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
 @dataclass
 class RowCountQuery(Query):
     a: Union[Iterable, Query]
@@ -313,4 +426,52 @@ class OrGroupQuery(Query):
         return str(self)
 
 
+def query_columns(query: Any) -> list[str]:
+    from tanuki.data_store.column_alias import ColumnAlias
+
+    columns: list[str] = []
+
+    def collect(item: Any, is_subject: bool = False) -> None:
+        if type(item) is ColumnAlias or (is_subject and type(item) is str):
+            if str(item) not in columns:
+                columns.append(str(item))
+        elif isinstance(item, Query):
+            fields = vars(item)
+            for name, value in fields.items():
+                collect(value, name == "a")
+        elif isinstance(item, list):
+            for value in item:
+                collect(value, is_subject)
+
+    collect(query)
+    return columns
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if len(prefix) == 0:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def keyset_query(
+    columns: list, key: Any, ascending: Union[bool, list[bool]] = True
+) -> Query:
+    if not isinstance(key, tuple):
+        key = (key,)
+    if len(key) != len(columns):
+        raise ValueError(f"Expected key with {len(columns)} values, received {key}")
+    if type(ascending) is not list:
+        ascending = [ascending for _ in columns]
+
+    branches = []
+    for i, (column, value, asc) in enumerate(zip(columns, key, ascending)):
+        prefix = [EqualsQuery(col, val) for col, val in zip(columns[:i], key[:i])]
+        bound = GreaterThanQuery(column, value) if asc else LessThanQuery(column, value)
+        branches.append(AndGroupQuery(prefix + [bound]) if len(prefix) > 0 else bound)
+    if len(branches) == 1:
+        return branches[0]
+    return OrGroupQuery(branches)
+
+
 from tanuki.database.adapter.query.query_compiler import QueryCompiler
@@ -1,17 +1,19 @@
 from collections import Counter
 from re import compile, Pattern
 import sys
-from typing import cast, ClassVar, ForwardRef, Optional, Type
+from typing import Any, cast, ClassVar, ForwardRef, Optional, Type
 
+from tanuki.data_store.index.index import IndexOptions
 from tanuki.data_store.index.index_alias import IndexAlias
 from tanuki.data_store.metadata import Metadata
+from tanuki.data_store.query import Query
 
 from .column import Column
 from .column_alias import ColumnAlias
 
 
 class StorableTypeFactory:
-    TYPE_MATCHER: ClassVar[Pattern] = compile(r"^Index(?:\[(.*)\])?$")
+    TYPE_MATCHER: ClassVar[Pattern] = compile(r"^(Index|SecondaryIndex)(?:\[(.*)\])?$")
 
     metadata: Optional[Type[Metadata]]
     columns: dict[str, ColumnAlias]
@@ -20,7 +22,7 @@ class StorableTypeFactory:
     def __init__(self, bases: list[type], type_annotations: dict[str, str]) -> None:
         self.metadata = self.eval_metadata(bases, type_annotations)
         self.columns = self.eval_columns(bases, type_annotations)
-        self.indices = self.eval_indices(type_annotations)
+        self.indices = self.eval_indices(type_annotations, vars(bases[0]))
 
     def eval_metadata(self, bases: list[type], type_annotations: dict[str, str]) -> Optional[Type[Metadata]]:
         if "metadata" not in type_annotations:
@@ -67,18 +69,25 @@ class StorableTypeFactory:
             raise TypeError(f"Failed to derive type {found_type}")
         return found_type
 
-    def eval_indices(self, type_annotations: dict[str, str]) -> dict[str, IndexAlias]:
+    def eval_indices(
+        self, type_annotations: dict[str, str], namespace: dict[str, Any] = {}
+    ) -> dict[str, IndexAlias]:
         indices = {}
         for name, type_str in type_annotations.items():
             if not isinstance(type_str, str):
                 continue
             match = self.TYPE_MATCHER.match(type_str)
             if match is not None:
-                type_args: str = match.group(1)
+                type_args: str = match.group(2)
                 if type_args is None:
                     raise TypeError(f"No columns were attached to index '{name}'")
                 type_args = [type_arg.strip() for type_arg in type_args.split(",")]
-                indices[name] = self._eval_index(name, type_args)
+                index = self._eval_index(name, type_args)
+                index.unique = match.group(1) == "Index"
+                options = namespace.get(name)
+                if isinstance(options, IndexOptions):
+                    self._apply_index_options(index, options)
+                indices[name] = index
 
         if "index" in indices:
             raise TypeError(
@@ -105,3 +114,12 @@ class StorableTypeFactory:
 
         column_aliases = [self.columns[column] for column in type_args]
         return IndexAlias(index_name, column_aliases)
+
+    def _apply_index_options(self, index: IndexAlias, options: IndexOptions) -> None:
+        if options.unique is not None:
+            if options.unique and not index.unique:
+                raise TypeError(f"SecondaryIndex '{index.name}' cannot be unique")
+            index.unique = options.unique
+        if options.where is not None and not isinstance(options.where, Query):
+            raise TypeError(f"Where clause of index '{index.name}' must be a Query")
+        index.where = options.where
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from typing import Optional, Type, TYPE_CHECKING, TypeVar
+from typing import Optional, Type, TYPE_CHECKING, TypeVar, Union
 
 from tanuki.data_store.index.index import Index
 from tanuki.data_store.metadata import Metadata
 from tanuki.data_store.query import Query
 from tanuki.database.data_token import DataToken
 
+from .query_plan import QueryPlan
+from .upsert_result import UpsertResult
+from .workload_recorder import WorkloadRecorder
+
 if TYPE_CHECKING:
     from tanuki.data_store.data_store import DataStore
 
@@ -56,6 +60,11 @@ class DatabaseAdapter:
         data_token: DataToken,
         query: Optional[Query] = None,
         columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
     ) -> list[tuple]:
         raise NotImplementedError()
 
@@ -115,18 +124,18 @@ class DatabaseAdapter:
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
-    ) -> None:
+    ) -> UpsertResult:
         if data_store.is_link():
-            self._upsert_from_link(data_token, data_store, alignment_columns)
+            return self._upsert_from_link(data_token, data_store, alignment_columns)
         else:
-            self._upsert_from_values(data_token, data_store, alignment_columns)
+            return self._upsert_from_values(data_token, data_store, alignment_columns)
 
     def _upsert_from_values(
         self: DatabaseAdapter,
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
-    ) -> None:
+    ) -> UpsertResult:
         raise NotImplementedError()
 
     def _upsert_from_link(
@@ -134,13 +143,113 @@ class DatabaseAdapter:
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
+    ) -> UpsertResult:
+        raise NotImplementedError()
+
+    def explain(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> QueryPlan:
+        raise NotImplementedError()
+
+    def set_workload_recorder(
+        self: DatabaseAdapter, recorder: Optional[WorkloadRecorder]
     ) -> None:
         raise NotImplementedError()
 
     def delete(self: DatabaseAdapter, data_token: DataToken, criteria: Query) -> None:
         raise NotImplementedError()
 
-    def row_count(self: DatabaseAdapter, data_token: DataToken) -> int:
+    def delete_keys(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        if keys_store.is_link():
+            return self._delete_keys_from_link(data_token, keys_store, alignment_columns)
+        else:
+            return self._delete_keys_from_values(
+                data_token, keys_store, alignment_columns
+            )
+
+    def _delete_keys_from_values(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        raise NotImplementedError()
+
+    def _delete_keys_from_link(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        raise NotImplementedError()
+
+    def create_change_log(
+        self: DatabaseAdapter, data_token: DataToken, key_columns: list[str]
+    ) -> None:
+        raise NotImplementedError()
+
+    def drop_change_log(self: DatabaseAdapter, data_token: DataToken) -> None:
+        raise NotImplementedError()
+
+    def has_change_log(self: DatabaseAdapter, data_token: DataToken) -> bool:
+        raise NotImplementedError()
+
+    def change_log_keys(self: DatabaseAdapter, data_token: DataToken) -> list[str]:
+        raise NotImplementedError()
+
+    def change_version(self: DatabaseAdapter, data_token: DataToken) -> int:
+        raise NotImplementedError()
+
+    def read_changes(
+        self: DatabaseAdapter, data_token: DataToken, version: int
+    ) -> list[tuple]:
+        raise NotImplementedError()
+
+    def row_count(
+        self: DatabaseAdapter, data_token: DataToken, query: Optional[Query] = None
+    ) -> int:
+        raise NotImplementedError()
+
+    def sort_positions(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        order_by: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        query: Optional[Query] = None,
+        limit: Optional[int] = None,
+    ) -> list[int]:
+        raise NotImplementedError()
+
+    def aggregate(
+        self: DatabaseAdapter,
+        data_token: DataToken,
+        aggregations: dict[str, list[str]],
+        group_by: list[str],
+        query: Optional[Query] = None,
+    ) -> list[tuple]:
+        raise NotImplementedError()
+
+    def join(
+        self: DatabaseAdapter,
+        left_token: DataToken,
+        right_token: DataToken,
+        on: list[str],
+        how: str,
+        left_query: Optional[Query],
+        right_query: Optional[Query],
+        left_columns: list[str],
+        right_columns: list[str],
+    ) -> list[tuple]:
         raise NotImplementedError()
 
     def stop(self: DatabaseAdapter) -> None:
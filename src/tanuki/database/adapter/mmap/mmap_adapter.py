@@ -0,0 +1,559 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import shutil
+from threading import RLock
+from typing import Optional, Type, TypeVar, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from tanuki.data_backend.pandas_backend import PandasBackend
+from tanuki.data_store.data_store import DataStore
+from tanuki.data_store.index.index import Index
+from tanuki.data_store.metadata import Metadata
+from tanuki.data_store.query import Query, query_columns
+from tanuki.database.adapter.database_adapter import DatabaseAdapter
+from tanuki.database.adapter.query.pandas_query_compiler import PandasQueryCompiler
+from tanuki.database.adapter.query_plan import QueryPlan, QueryPlanStep
+from tanuki.database.adapter.upsert_result import UpsertResult
+from tanuki.database.connection_config import ConnectionConfig
+from tanuki.database.data_token import DataToken
+from tanuki.database.db_exceptions import (
+    DatabaseAdapterError,
+    DatabaseAdapterUsageError,
+)
+
+from .mmap_table import MmapTable
+
+T = TypeVar("T", bound=DataStore)
+M = TypeVar("M", bound=Metadata)
+
+
+class MmapAdapter(DatabaseAdapter):
+    _conn_config: ConnectionConfig
+    _root_dir: Path
+    _checkpoint_dir: Path
+    _chunk_size: Optional[int]
+    _enter_calls: int
+    _lock: RLock
+
+    _checkpoints: list[tuple[Path, Optional[Path], dict[Path, int]]]
+
+    def __init__(
+        self: MmapAdapter,
+        conn_config: ConnectionConfig,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        self._conn_config = conn_config
+        self._chunk_size = chunk_size
+        self._root_dir = Path(conn_config.uri())
+        self._root_dir.mkdir(parents=True, exist_ok=True)
+        self._checkpoint_dir = self._root_dir / "checkpoint"
+        if self._checkpoint_dir.exists():
+            shutil.rmtree(str(self._checkpoint_dir))
+        self._checkpoint_dir.mkdir(exist_ok=False)
+
+        self._enter_calls = 0
+        self._lock = RLock()
+        self._checkpoints = []
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._enter_calls += 1
+
+    def __exit__(self, etype, value, traceback):
+        try:
+            if etype is not None:
+                self.rollback()
+
+            self._enter_calls -= 1
+            if self._enter_calls == 0:
+                self._clear_checkpoints()
+        finally:
+            self._lock.release()
+
+    def rollback(self):
+        for target_path, checkpoint_path, sizes in reversed(self._checkpoints):
+            if target_path.exists():
+                shutil.rmtree(str(target_path))
+            if checkpoint_path is not None:
+                for file_path, size in sizes.items():
+                    if file_path.stat().st_size != size:
+                        self._truncate_file(file_path, size)
+                os.replace(checkpoint_path, target_path)
+        self._clear_checkpoints()
+
+    def _clear_checkpoints(self) -> None:
+        self._checkpoints = []
+        shutil.rmtree(str(self._checkpoint_dir))
+        self._checkpoint_dir.mkdir(exist_ok=False)
+
+    def _checkpoint(self, target_path: Path) -> None:
+        if any(target_path == path for path, _, _ in self._checkpoints):
+            return
+        checkpoint_path = None
+        sizes = {}
+        if target_path.exists():
+            checkpoint_path = self._checkpoint_dir / str(len(self._checkpoints))
+            shutil.copytree(
+                str(target_path), str(checkpoint_path), copy_function=self._link_file
+            )
+            sizes = {
+                file_path: file_path.stat().st_size
+                for file_path in checkpoint_path.rglob("*")
+                if file_path.is_file()
+            }
+        self._checkpoints.append((target_path, checkpoint_path, sizes))
+
+    @staticmethod
+    def _link_file(source: str, destination: str) -> None:
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    @staticmethod
+    def _truncate_file(file_path: Path, size: int) -> None:
+        temp_path = file_path.with_suffix(".tmp")
+        with open(file_path, "rb") as source, open(temp_path, "wb") as target:
+            target.write(source.read(size))
+        os.replace(temp_path, file_path)
+
+    def _check_open(self, method: str) -> None:
+        if self._enter_calls == 0:
+            raise DatabaseAdapterUsageError(method)
+
+    def _group_path(self, data_group: str) -> Path:
+        return self._root_dir / data_group
+
+    def _table_path(self, data_token: DataToken) -> Path:
+        return self._group_path(data_token.data_group) / data_token.table_name
+
+    def _table(self, data_token: DataToken) -> MmapTable:
+        return MmapTable(self._table_path(data_token))
+
+    def has_group(self: MmapAdapter, data_group: str) -> bool:
+        self._check_open("has_group")
+        return self._group_path(data_group).is_dir()
+
+    def create_group(self: MmapAdapter, data_group: str) -> None:
+        self._check_open("create_group")
+        try:
+            group_path = self._group_path(data_group)
+            self._checkpoint(group_path)
+            group_path.mkdir(exist_ok=True)
+        except Exception as e:
+            raise DatabaseAdapterError("create_group failed", e)
+
+    def has_group_table(self: MmapAdapter, data_token: DataToken) -> bool:
+        self._check_open("has_group_table")
+        return MmapTable.exists(self._table_path(data_token))
+
+    def create_group_table(
+        self: MmapAdapter, data_token: DataToken, data_store_type: type[T]
+    ) -> None:
+        self._check_open("create_group_table")
+        try:
+            table_path = self._table_path(data_token)
+            self._checkpoint(table_path)
+            MmapTable.create(table_path, data_store_type, self._chunk_size)
+        except Exception as e:
+            raise DatabaseAdapterError("create_group_table failed", e)
+
+    def drop_group(self: MmapAdapter, data_group: str) -> None:
+        self._check_open("drop_group")
+        try:
+            group_path = self._group_path(data_group)
+            self._checkpoint(group_path)
+            shutil.rmtree(str(group_path))
+        except Exception as e:
+            raise DatabaseAdapterError("drop_group failed", e)
+
+    def drop_group_table(self: MmapAdapter, data_token: DataToken) -> None:
+        self._check_open("drop_group_table")
+        try:
+            table_path = self._table_path(data_token)
+            self._checkpoint(table_path)
+            shutil.rmtree(str(table_path))
+        except Exception as e:
+            raise DatabaseAdapterError("drop_group_table failed", e)
+
+    def create_index(self: MmapAdapter, data_token: DataToken, index: Index) -> None:
+        self._check_open("create_index")
+        try:
+            self._checkpoint(self._table_path(data_token))
+            col_names = [str(col) for col in index.columns]
+            self._table(data_token).add_index(index.name, col_names)
+        except Exception as e:
+            raise DatabaseAdapterError("create_index failed", e)
+
+    def has_index(self: MmapAdapter, data_token: DataToken, index: Index) -> bool:
+        self._check_open("has_index")
+        indices = self._table(data_token).indices
+        if index.name not in indices:
+            return False
+        expected = set(str(col) for col in index.columns)
+        return len(expected - set(indices[index.name])) == 0
+
+    def get_group_table_metadata(
+        self, data_token: DataToken, metadata_type: Type[M]
+    ) -> Optional[M]:
+        table_path = self._table_path(data_token)
+        if not MmapTable.exists(table_path):
+            return None
+        metadata_dict = MmapTable(table_path).read_metadata()
+        if metadata_dict is None:
+            return None
+        return metadata_type.from_dict(metadata_dict)
+
+    def _update_group_table_metadata(
+        self, data_token: DataToken, metadata: Metadata
+    ) -> None:
+        self._table(data_token).write_metadata(metadata.to_dict())
+
+    def read_columns(
+        self: MmapAdapter, data_token: DataToken, columns: list[str]
+    ) -> dict[str, np.ndarray]:
+        self._check_open("read_columns")
+        try:
+            table = self._table(data_token)
+            return {name: table.read_column(name) for name in columns}
+        except Exception as e:
+            raise DatabaseAdapterError("read_columns failed", e)
+
+    def read_frame(
+        self: MmapAdapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> DataFrame:
+        self._check_open("read_frame")
+        try:
+            table = self._table(data_token)
+            if columns is None:
+                columns = table.columns
+            if query is None and order_by is None:
+                if rows is None and offset is None and limit is None:
+                    return table.read_frame(columns)
+                positions = self._positions(table.row_count, offset, limit, rows)
+                return table.read_rows(columns, positions)
+
+            needed = list(columns)
+            extra_cols = [] if order_by is None else list(order_by)
+            chunks = None
+            if query is not None:
+                extra_cols += [col for col in query_columns(query) if col in table.columns]
+                chunks = table.matching_chunks(query)
+            for col in extra_cols:
+                if col not in needed:
+                    needed.append(col)
+            frame = table.read_frame(needed, chunks)
+            if query is not None:
+                frame = frame.iloc[PandasQueryCompiler(frame).select(query)]
+            if order_by is not None:
+                frame = frame.sort_values(order_by, ascending=ascending, kind="stable")
+            frame = frame[columns].reset_index(drop=True)
+            if rows is None and offset is None and limit is None:
+                return frame
+            positions = self._positions(len(frame), offset, limit, rows)
+            return frame.iloc[positions].reset_index(drop=True)
+        except Exception as e:
+            raise DatabaseAdapterError("read_frame failed", e)
+
+    @staticmethod
+    def _positions(
+        row_count: int,
+        offset: Optional[int],
+        limit: Optional[int],
+        rows: Optional[list[int]],
+    ) -> Union[np.ndarray, slice]:
+        if rows is not None:
+            positions = np.asarray(rows, dtype=np.int64)
+            return positions[positions < row_count]
+        start = 0 if offset is None else offset
+        return slice(start, None if limit is None else start + limit)
+
+    def query(
+        self: MmapAdapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> list[tuple]:
+        result = self.read_frame(
+            data_token, query, columns, offset, limit, rows, order_by, ascending
+        )
+        return list(result.itertuples(index=False, name=None))
+
+    def _frame_from_store(self, data_store: T) -> DataFrame:
+        if data_store.is_link():
+            columns = [str(col) for col in data_store.columns]
+            return self.read_frame(
+                data_store.link_token(), data_store.link_query(), columns
+            )
+        return data_store.to_pandas().reset_index(drop=True)
+
+    def _insert_from_values(
+        self: MmapAdapter, data_token: DataToken, data_store: T
+    ) -> None:
+        self._check_open("_insert_from_values")
+        try:
+            self._checkpoint(self._table_path(data_token))
+            if data_store.metadata is not None:
+                self._update_group_table_metadata(data_token, data_store.metadata)
+            self._table(data_token).append(self._frame_from_store(data_store))
+        except Exception as e:
+            raise DatabaseAdapterError("_insert_from_values failed", e)
+
+    def _insert_from_link(
+        self: MmapAdapter, data_token: DataToken, data_store: T
+    ) -> None:
+        self._check_open("_insert_from_link")
+        try:
+            self._checkpoint(self._table_path(data_token))
+            self._table(data_token).append(self._frame_from_store(data_store))
+        except Exception as e:
+            raise DatabaseAdapterError("_insert_from_link failed", e)
+
+    def _align(
+        self: MmapAdapter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[str],
+        insert_missing: bool,
+    ) -> UpsertResult:
+        self._checkpoint(self._table_path(data_token))
+        if data_store.metadata is not None:
+            self._update_group_table_metadata(data_token, data_store.metadata)
+
+        table = self._table(data_token)
+        frame = table.read_frame()
+        new_data = self._frame_from_store(data_store)
+        alignment_columns = [str(col) for col in alignment_columns]
+        update_columns = [
+            str(col) for col in new_data.columns if col not in alignment_columns
+        ]
+
+        keys = frame.set_index(alignment_columns).index
+        new_keys = new_data.set_index(alignment_columns).index
+        positions = keys.get_indexer(new_keys)
+        matched = positions >= 0
+        for col in update_columns:
+            updated = frame[col].astype(object).to_numpy()
+            updated[positions[matched]] = new_data[col].to_numpy()[matched]
+            frame[col] = updated
+
+        table.write(frame)
+        if insert_missing:
+            table.append(new_data[~matched].reset_index(drop=True))
+            return UpsertResult(int((~matched).sum()), int(matched.sum()))
+        return UpsertResult(0, int(matched.sum()))
+
+    def _update_from_values(
+        self: MmapAdapter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[str],
+    ) -> None:
+        self._check_open("_update_from_values")
+        try:
+            self._align(data_token, data_store, alignment_columns, False)
+        except Exception as e:
+            raise DatabaseAdapterError("_update_from_values failed", e)
+
+    def _update_from_link(
+        self: MmapAdapter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[str],
+    ) -> None:
+        self._check_open("_update_from_link")
+        try:
+            self._align(data_token, data_store, alignment_columns, False)
+        except Exception as e:
+            raise DatabaseAdapterError("_update_from_link failed", e)
+
+    def _upsert_from_values(
+        self: MmapAdapter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[str],
+    ) -> UpsertResult:
+        self._check_open("_upsert_from_values")
+        try:
+            return self._align(data_token, data_store, alignment_columns, True)
+        except Exception as e:
+            raise DatabaseAdapterError("_upsert_from_values failed", e)
+
+    def _upsert_from_link(
+        self: MmapAdapter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[str],
+    ) -> UpsertResult:
+        self._check_open("_upsert_from_link")
+        try:
+            return self._align(data_token, data_store, alignment_columns, True)
+        except Exception as e:
+            raise DatabaseAdapterError("_upsert_from_link failed", e)
+
+    def explain(
+        self: MmapAdapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> QueryPlan:
+        self._check_open("explain")
+        try:
+            table = self._table(data_token)
+            total = len(table.chunks)
+            matched = total if query is None else len(table.matching_chunks(query))
+            operation = "SCAN" if matched == total else "SEARCH"
+            detail = f"{operation} {data_token} USING ZONE MAP ({matched} of {total} chunks)"
+            steps = [
+                QueryPlanStep(1, 0, detail, operation, str(data_token), None)
+            ]
+            if order_by is not None:
+                steps.append(QueryPlanStep(2, 0, "SORT IN MEMORY FOR ORDER BY"))
+            statement = f"read {data_token}"
+            if query is not None:
+                statement += f" where {query}"
+            return QueryPlan(statement, steps)
+        except Exception as e:
+            raise DatabaseAdapterError("explain failed", e)
+
+    def delete(self: MmapAdapter, data_token: DataToken, criteria: Query) -> None:
+        self._check_open("delete")
+        try:
+            self._checkpoint(self._table_path(data_token))
+            table = self._table(data_token)
+            frame = table.read_frame()
+            keep = np.ones(len(frame), dtype=bool)
+            keep[PandasQueryCompiler(frame).select(criteria)] = False
+            table.write(frame[keep].reset_index(drop=True))
+        except Exception as e:
+            raise DatabaseAdapterError("delete failed", e)
+
+    def _delete_keys(
+        self: MmapAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        self._checkpoint(self._table_path(data_token))
+        table = self._table(data_token)
+        frame = table.read_frame()
+        alignment_columns = [str(col) for col in alignment_columns]
+        keys = frame.set_index(alignment_columns).index
+        keys_frame = self._frame_from_store(keys_store)
+        delete_keys = keys_frame.set_index(alignment_columns).index
+        matched = keys.isin(delete_keys)
+        table.write(frame[~matched].reset_index(drop=True))
+        return int(matched.sum())
+
+    def _delete_keys_from_values(
+        self: MmapAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        self._check_open("_delete_keys_from_values")
+        try:
+            return self._delete_keys(data_token, keys_store, alignment_columns)
+        except Exception as e:
+            raise DatabaseAdapterError("_delete_keys_from_values failed", e)
+
+    def _delete_keys_from_link(
+        self: MmapAdapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        self._check_open("_delete_keys_from_link")
+        try:
+            return self._delete_keys(data_token, keys_store, alignment_columns)
+        except Exception as e:
+            raise DatabaseAdapterError("_delete_keys_from_link failed", e)
+
+    def row_count(
+        self: MmapAdapter, data_token: DataToken, query: Optional[Query] = None
+    ) -> int:
+        self._check_open("row_count")
+        try:
+            if query is not None:
+                return len(self.read_frame(data_token, query, []))
+            return self._table(data_token).row_count
+        except Exception as e:
+            raise DatabaseAdapterError("row_count failed", e)
+
+    def sort_positions(
+        self: MmapAdapter,
+        data_token: DataToken,
+        order_by: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        query: Optional[Query] = None,
+        limit: Optional[int] = None,
+    ) -> list[int]:
+        self._check_open("sort_positions")
+        try:
+            frame = self.read_frame(data_token, query, list(order_by))
+            frame = frame.sort_values(order_by, ascending=ascending, kind="stable")
+            return frame.index[:limit].tolist()
+        except Exception as e:
+            raise DatabaseAdapterError("sort_positions failed", e)
+
+    def aggregate(
+        self: MmapAdapter,
+        data_token: DataToken,
+        aggregations: dict[str, list[str]],
+        group_by: list[str],
+        query: Optional[Query] = None,
+    ) -> list[tuple]:
+        self._check_open("aggregate")
+        try:
+            columns = list(group_by) + [
+                col for col in aggregations.keys() if col not in group_by
+            ]
+            frame = self.read_frame(data_token, query, columns)
+            result = PandasBackend(frame).aggregate(aggregations, group_by)
+            return list(result.to_pandas().itertuples(index=False, name=None))
+        except Exception as e:
+            raise DatabaseAdapterError("aggregate failed", e)
+
+    def join(
+        self: MmapAdapter,
+        left_token: DataToken,
+        right_token: DataToken,
+        on: list[str],
+        how: str,
+        left_query: Optional[Query],
+        right_query: Optional[Query],
+        left_columns: list[str],
+        right_columns: list[str],
+    ) -> list[tuple]:
+        self._check_open("join")
+        try:
+            left = PandasBackend(self.read_frame(left_token, left_query, left_columns))
+            right = PandasBackend(
+                self.read_frame(right_token, right_query, right_columns)
+            )
+            result = left.join(right, on, how)
+            return list(result.to_pandas().itertuples(index=False, name=None))
+        except Exception as e:
+            raise DatabaseAdapterError("join failed", e)
+
+    def stop(self: MmapAdapter) -> None:
+        self._enter_calls = 0
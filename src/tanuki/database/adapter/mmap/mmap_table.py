@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import json
+import os
+from pathlib import Path
+import pickle
+from typing import Any, ClassVar, Optional, Type, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from tanuki.data_store.data_store import DataStore
+from tanuki.data_store.query import Query
+from tanuki.database.adapter.query.zone_map_query_compiler import (
+    ZoneMapQueryCompiler,
+)
+
+from .mmap_type import MmapType
+
+T = TypeVar("T", bound=DataStore)
+
+
+class MmapTable:
+    SCHEMA_FILE: ClassVar[str] = "schema.json"
+    METADATA_FILE: ClassVar[str] = "metadata.json"
+    RAW: ClassVar[str] = "raw"
+    PICKLE: ClassVar[str] = "pickle"
+    NULLS: ClassVar[str] = "nulls"
+    CHUNK_SIZE: ClassVar[int] = 65536
+
+    _path: Path
+    _schema: dict[str, Any]
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        with open(path / self.SCHEMA_FILE, "r") as schema_file:
+            self._schema = json.load(schema_file)
+
+    @classmethod
+    def exists(cls, path: Path) -> bool:
+        return (path / cls.SCHEMA_FILE).exists()
+
+    @classmethod
+    def create(
+        cls, path: Path, store_type: Type[T], chunk_size: Optional[int] = None
+    ) -> MmapTable:
+        path.mkdir(parents=True, exist_ok=False)
+        columns = {}
+        for col in store_type.columns:
+            dtype = MmapType(col.dtype)
+            columns[col.name] = {
+                "dtype": None if dtype is None else dtype.str,
+                "format": cls.PICKLE if dtype is None else cls.RAW,
+            }
+        schema = {
+            "columns": columns,
+            "rows": 0,
+            "indices": {},
+            "chunk_size": cls.CHUNK_SIZE if chunk_size is None else chunk_size,
+            "chunks": [],
+        }
+        cls._write_json(path / cls.SCHEMA_FILE, schema)
+        table = cls(path)
+        for name in columns.keys():
+            table._write_column(name, table._empty_column(name))
+        return table
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._schema["columns"].keys())
+
+    @property
+    def row_count(self) -> int:
+        return self._schema["rows"]
+
+    @property
+    def indices(self) -> dict[str, list[str]]:
+        return self._schema["indices"]
+
+    @property
+    def chunk_size(self) -> int:
+        return self._schema["chunk_size"]
+
+    @property
+    def chunks(self) -> list[tuple[int, int]]:
+        return [(chunk["start"], chunk["stop"]) for chunk in self._schema["chunks"]]
+
+    def chunk_stats(self, chunk: int) -> dict[str, dict[str, Any]]:
+        stats = self._schema["chunks"][chunk]["stats"]
+        return {
+            name: {
+                "min": self._decode_stat(col_stats["min"]),
+                "max": self._decode_stat(col_stats["max"]),
+                "nulls": col_stats["nulls"],
+            }
+            for name, col_stats in stats.items()
+        }
+
+    def matching_chunks(self, query: Query) -> list[int]:
+        matches = []
+        for chunk, (start, stop) in enumerate(self.chunks):
+            compiler = ZoneMapQueryCompiler(self.chunk_stats(chunk), stop - start)
+            if compiler.compile(query):
+                matches.append(chunk)
+        return matches
+
+    def add_index(self, index_name: str, columns: list[str]) -> None:
+        self._schema["indices"][index_name] = columns
+        self._save_schema()
+
+    def _dtype(self, name: str) -> Optional[np.dtype]:
+        dtype = self._schema["columns"][name]["dtype"]
+        return None if dtype is None else np.dtype(dtype)
+
+    def _column_path(self, name: str, column_format: str) -> Path:
+        suffix = "col" if column_format == self.RAW else "pkl"
+        return self._path / f"{name}.{suffix}"
+
+    def _nulls_path(self, name: str) -> Path:
+        return self._path / f"{name}.{self.NULLS}"
+
+    def _has_nulls(self, name: str) -> bool:
+        return self._schema["columns"][name].get(self.NULLS, False)
+
+    @staticmethod
+    def _with_nulls(values: np.ndarray, nulls: Optional[np.ndarray]) -> np.ndarray:
+        values = values.astype(object)
+        if nulls is not None:
+            values[nulls] = None
+        return values
+
+    def _empty_column(self, name: str) -> np.ndarray:
+        dtype = self._dtype(name)
+        return np.empty(0, dtype=object if dtype is None else dtype)
+
+    def read_column(self, name: str) -> np.ndarray:
+        spec = self._schema["columns"][name]
+        column_path = self._column_path(name, spec["format"])
+        if spec["format"] == self.PICKLE:
+            return self._read_pickle(column_path)
+        elif self.row_count == 0:
+            return self._empty_column(name)
+        values = np.memmap(
+            column_path, dtype=self._dtype(name), mode="r", shape=(self.row_count,)
+        )
+        if self._has_nulls(name):
+            nulls_path = self._nulls_path(name)
+            nulls = np.memmap(
+                nulls_path, dtype=np.bool_, mode="r", shape=(self.row_count,)
+            )
+            return self._with_nulls(values, nulls)
+        return values
+
+    @staticmethod
+    def _read_pickle(column_path: Path) -> np.ndarray:
+        segments = []
+        with open(column_path, "rb") as column_file:
+            while True:
+                try:
+                    segments.append(pickle.load(column_file))
+                except EOFError:
+                    break
+        if len(segments) == 1:
+            return segments[0]
+        return np.concatenate(segments)
+
+    def read_chunks(self, name: str, chunks: list[int]) -> np.ndarray:
+        values = self.read_column(name)
+        if len(chunks) == len(self.chunks):
+            return values
+        ranges = [self.chunks[chunk] for chunk in chunks]
+        if len(ranges) == 0:
+            return values[:0]
+        return np.concatenate([values[start:stop] for start, stop in ranges])
+
+    def read_frame(
+        self, columns: Optional[list[str]] = None, chunks: Optional[list[int]] = None
+    ) -> DataFrame:
+        if columns is None:
+            columns = self.columns
+        if chunks is None:
+            data = {name: self.read_column(name) for name in columns}
+        else:
+            data = {name: self.read_chunks(name, chunks) for name in columns}
+        return DataFrame(data, columns=columns)
+
+    def read_rows(
+        self, columns: list[str], positions: Union[np.ndarray, slice]
+    ) -> DataFrame:
+        return DataFrame(
+            {name: self.read_column(name)[positions] for name in columns},
+            columns=columns,
+        )
+
+    def _encode(
+        self, name: str, values: Series
+    ) -> tuple[str, np.ndarray, Optional[np.ndarray]]:
+        dtype = self._dtype(name)
+        if dtype is not None:
+            nulls = values.isna().to_numpy()
+            try:
+                if dtype.kind in "fmM" or not nulls.any():
+                    return self.RAW, values.to_numpy(dtype=dtype), None
+                filled = values.where(~nulls, dtype.type(0))
+                return self.RAW, filled.to_numpy(dtype=dtype), nulls
+            except (TypeError, ValueError):
+                pass
+        return self.PICKLE, values.to_numpy(dtype=object), None
+
+    def _write_nulls(self, name: str, nulls: Optional[np.ndarray]) -> None:
+        nulls_path = self._nulls_path(name)
+        if nulls is None:
+            nulls_path.unlink(missing_ok=True)
+        else:
+            temp_path = nulls_path.with_suffix(".tmp")
+            nulls.tofile(temp_path)
+            os.replace(temp_path, nulls_path)
+        self._schema["columns"][name][self.NULLS] = nulls is not None
+
+    def _append_nulls(self, name: str, nulls: Optional[np.ndarray], rows: int) -> None:
+        if nulls is None and not self._has_nulls(name):
+            return
+        if nulls is None:
+            nulls = np.zeros(rows, dtype=np.bool_)
+        if not self._has_nulls(name):
+            existing = np.zeros(self.row_count, dtype=np.bool_)
+            self._write_nulls(name, np.concatenate([existing, nulls]))
+            return
+        with open(self._nulls_path(name), "ab") as nulls_file:
+            nulls_file.write(nulls.tobytes())
+
+    def _write_column(
+        self, name: str, values: np.ndarray, nulls: Optional[np.ndarray] = None
+    ) -> None:
+        spec = self._schema["columns"][name]
+        column_format = self.PICKLE if values.dtype == object else self.RAW
+        column_path = self._column_path(name, column_format)
+        temp_path = column_path.with_suffix(".tmp")
+        if column_format == self.RAW:
+            values.tofile(temp_path)
+        else:
+            with open(temp_path, "wb") as column_file:
+                pickle.dump(values, column_file)
+        os.replace(temp_path, column_path)
+
+        if spec["format"] != column_format:
+            self._column_path(name, spec["format"]).unlink(missing_ok=True)
+            spec["format"] = column_format
+        self._write_nulls(name, nulls if column_format == self.RAW else None)
+
+    def _frame_column(self, frame: DataFrame, name: str) -> Series:
+        if name in frame.columns:
+            return frame[name]
+        return Series([None] * len(frame), dtype=object)
+
+    @staticmethod
+    def _encode_stat(value: Any) -> Any:
+        if isinstance(value, (datetime, np.datetime64)):
+            return {"timestamp": int(pd.Timestamp(value).value)}
+        if isinstance(value, (timedelta, np.timedelta64)):
+            return {"timedelta": int(pd.Timedelta(value).value)}
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, (bool, int, float, str)):
+            return value
+        raise TypeError(f"Unsupported statistic type: {type(value)}")
+
+    @staticmethod
+    def _decode_stat(value: Any) -> Any:
+        if type(value) is not dict:
+            return value
+        if "timestamp" in value:
+            return pd.Timestamp(value["timestamp"])
+        return pd.Timedelta(value["timedelta"])
+
+    def _column_stats(self, values: Series) -> dict[str, Any]:
+        stats = {"min": None, "max": None, "nulls": int(values.isna().sum())}
+        non_null = values.dropna()
+        if len(non_null) > 0:
+            try:
+                stats["min"] = self._encode_stat(non_null.min())
+                stats["max"] = self._encode_stat(non_null.max())
+            except TypeError:
+                stats["min"] = stats["max"] = None
+        return stats
+
+    def _build_chunks(self, frame: DataFrame, offset: int) -> list[dict[str, Any]]:
+        chunks = []
+        for start in range(0, len(frame), self.chunk_size):
+            chunk = frame.iloc[start : start + self.chunk_size]
+            stats = {
+                name: self._column_stats(self._frame_column(chunk, name))
+                for name in self.columns
+            }
+            chunks.append(
+                {
+                    "start": offset + start,
+                    "stop": offset + start + len(chunk),
+                    "stats": stats,
+                }
+            )
+        return chunks
+
+    def _merge_stats(
+        self, stats: dict[str, Any], rows: int, values: Series
+    ) -> dict[str, Any]:
+        merged = self._column_stats(values)
+        if stats["nulls"] < rows:
+            if merged["nulls"] == len(values):
+                merged["min"], merged["max"] = stats["min"], stats["max"]
+            elif stats["min"] is None or merged["min"] is None:
+                merged["min"] = merged["max"] = None
+            else:
+                try:
+                    for key, pick in (("min", min), ("max", max)):
+                        value = pick(
+                            self._decode_stat(stats[key]),
+                            self._decode_stat(merged[key]),
+                        )
+                        merged[key] = self._encode_stat(value)
+                except TypeError:
+                    merged["min"] = merged["max"] = None
+        merged["nulls"] += stats["nulls"]
+        return merged
+
+    def _extend_chunks(self, frame: DataFrame) -> None:
+        chunks = self._schema["chunks"]
+        filled = 0
+        if len(chunks) > 0:
+            last = chunks[-1]
+            rows = last["stop"] - last["start"]
+            filled = max(0, min(self.chunk_size - rows, len(frame)))
+            if filled > 0:
+                head = frame.iloc[:filled]
+                last["stats"] = {
+                    name: self._merge_stats(
+                        last["stats"][name], rows, self._frame_column(head, name)
+                    )
+                    for name in self.columns
+                }
+                last["stop"] += filled
+        chunks += self._build_chunks(frame.iloc[filled:], self.row_count + filled)
+
+    def append(self, frame: DataFrame) -> None:
+        if len(frame) == 0:
+            return
+        self._extend_chunks(frame)
+        for name in self.columns:
+            encoded = self._encode(name, self._frame_column(frame, name))
+            column_format, values, nulls = encoded
+            spec = self._schema["columns"][name]
+            if spec["format"] == self.RAW and column_format == self.RAW:
+                with open(self._column_path(name, self.RAW), "ab") as column_file:
+                    column_file.write(values.tobytes())
+                self._append_nulls(name, nulls, len(frame))
+            elif spec["format"] == self.PICKLE:
+                values = self._with_nulls(values, nulls)
+                with open(self._column_path(name, self.PICKLE), "ab") as column_file:
+                    pickle.dump(values, column_file)
+            else:
+                existing = self.read_column(name).astype(object)
+                values = self._with_nulls(values, nulls)
+                self._write_column(name, np.concatenate([existing, values]))
+        self._schema["rows"] += len(frame)
+        self._save_schema()
+
+    def write(self, frame: DataFrame) -> None:
+        for name in self.columns:
+            _, values, nulls = self._encode(name, self._frame_column(frame, name))
+            self._write_column(name, values, nulls)
+        self._schema["rows"] = len(frame)
+        self._schema["chunks"] = self._build_chunks(frame, 0)
+        self._save_schema()
+
+    def read_metadata(self) -> Optional[dict[str, Any]]:
+        metadata_path = self._path / self.METADATA_FILE
+        if not metadata_path.exists():
+            return None
+        with open(metadata_path, "r") as metadata_file:
+            return json.load(metadata_file)
+
+    def write_metadata(self, metadata: dict[str, Any]) -> None:
+        self._write_json(self._path / self.METADATA_FILE, metadata)
+
+    def _save_schema(self) -> None:
+        self._write_json(self._path / self.SCHEMA_FILE, self._schema)
+
+    @staticmethod
+    def _write_json(path: Path, data: dict[str, Any]) -> None:
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as json_file:
+            json.dump(data, json_file)
+        os.replace(temp_path, path)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from tanuki.data_store.data_type import (
+    Boolean,
+    DataType,
+    Float16,
+    Float32,
+    Float64,
+    Int8,
+    Int16,
+    Int32,
+    Int64,
+    Timedelta,
+    Timestamp,
+    TypeAlias,
+    UInt8,
+    UInt16,
+    UInt32,
+    UInt64,
+)
+
+
+class MmapType:
+    _mappings: dict[DataType, np.dtype] = {
+        Boolean: np.dtype(np.bool_),
+        Float64: np.dtype(np.float64),
+        Float32: np.dtype(np.float32),
+        Float16: np.dtype(np.float16),
+        Int64: np.dtype(np.int64),
+        Int32: np.dtype(np.int32),
+        Int16: np.dtype(np.int16),
+        Int8: np.dtype(np.int8),
+        UInt64: np.dtype(np.uint64),
+        UInt32: np.dtype(np.uint32),
+        UInt16: np.dtype(np.uint16),
+        UInt8: np.dtype(np.uint8),
+        Timestamp: np.dtype("<M8[ns]"),
+        Timedelta: np.dtype("<m8[ns]"),
+    }
+
+    def __new__(cls: type[MmapType], data_type: DataType) -> Optional[np.dtype]:
+        if isinstance(data_type, TypeAlias):
+            return None
+        return cls._mappings.get(DataType(data_type))
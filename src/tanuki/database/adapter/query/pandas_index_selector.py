@@ -0,0 +1,159 @@
+from typing import Any, ClassVar, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.index.pandas_index import PandasIndex
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    GreaterThanQuery,
+    InQuery,
+    LessEqualQuery,
+    LessThanQuery,
+    Query,
+    StartsWithQuery,
+    prefix_upper_bound,
+)
+from tanuki.database.adapter.query.pandas_query_compiler import PandasQueryCompiler
+
+
+class PandasIndexSelector:
+    RANGES: ClassVar[dict[type, tuple[bool, bool]]] = {
+        GreaterThanQuery: (True, False),
+        GreaterEqualQuery: (True, True),
+        LessThanQuery: (False, False),
+        LessEqualQuery: (False, True),
+    }
+
+    _data_frame: DataFrame
+    _indices: list[PandasIndex]
+
+    def __init__(self, data_frame: DataFrame, indices: list[PandasIndex]) -> None:
+        self._data_frame = data_frame
+        self._indices = [
+            index
+            for index in indices
+            if len(index.columns) > 0
+            and all(column in data_frame.columns for column in index.columns)
+        ]
+
+    def select(self: "PandasIndexSelector", query: Any) -> Optional[np.ndarray]:
+        if len(self._indices) == 0:
+            return None
+        items = query.items if isinstance(query, AndGroupQuery) else [query]
+        positions, used = self._seek_key(items)
+        if positions is None:
+            for i, item in enumerate(items):
+                positions = self._seek(item)
+                if positions is not None:
+                    used = {i}
+                    break
+        if positions is None:
+            return None
+        rest = [item for i, item in enumerate(items) if i not in used]
+        if len(rest) == 0:
+            return positions
+        compiler = PandasQueryCompiler(self._data_frame)
+        if len(rest) == 1:
+            return compiler.select(rest[0], positions)
+        return compiler.select(AndGroupQuery(rest), positions)
+
+    def _column(self: "PandasIndexSelector", parameter: Any) -> Optional[str]:
+        if type(parameter) is ColumnAlias:
+            return parameter.name
+        elif type(parameter) is str and parameter in self._data_frame.columns:
+            return parameter
+        return None
+
+    @staticmethod
+    def _is_value(value: Any) -> bool:
+        return not isinstance(value, (Query, ColumnAlias))
+
+    @staticmethod
+    def _is_bound(value: Any) -> bool:
+        return value is not None and not isinstance(value, (Query, ColumnAlias))
+
+    def _equalities(self: "PandasIndexSelector", items: list) -> dict[str, tuple]:
+        equalities = {}
+        for i, item in enumerate(items):
+            if type(item) is EqualsQuery and self._is_value(item.b):
+                column = self._column(item.a)
+                if column is not None and column not in equalities:
+                    equalities[column] = (i, item.b)
+        return equalities
+
+    def _seek_key(
+        self: "PandasIndexSelector", items: list
+    ) -> tuple[Optional[np.ndarray], set[int]]:
+        equalities = self._equalities(items)
+        candidates = [
+            index
+            for index in self._indices
+            if all(column in equalities for column in index.columns)
+        ]
+        for index in sorted(candidates, key=lambda index: -len(index.columns)):
+            values = [equalities[column][1] for column in index.columns]
+            if not index.is_hashable(values):
+                continue
+            key = values[0] if len(values) == 1 else tuple(values)
+            used = {equalities[column][0] for column in index.columns}
+            return index.get_positions(key), used
+        return None, set()
+
+    def _leading(self: "PandasIndexSelector", parameter: Any) -> list[PandasIndex]:
+        column = self._column(parameter)
+        return [index for index in self._indices if index.columns[0] == column]
+
+    def _seek(self: "PandasIndexSelector", item: Any) -> Optional[np.ndarray]:
+        if not hasattr(item, "a"):
+            return None
+        for index in self._leading(item.a):
+            positions = self._seek_index(index, item)
+            if positions is not None:
+                return np.sort(positions)
+        return None
+
+    def _seek_index(
+        self: "PandasIndexSelector", index: PandasIndex, item: Any
+    ) -> Optional[np.ndarray]:
+        if type(item) is EqualsQuery and self._is_bound(item.b):
+            return index.range_positions(item.b, item.b)
+        elif type(item) is InQuery:
+            hashable = len(index.columns) == 1 and all(
+                index.is_hashable([value]) for value in item.b
+            )
+            groups = []
+            for value in item.b:
+                if hashable:
+                    positions = index.get_positions(value)
+                elif self._is_bound(value):
+                    positions = index.range_positions(value, value)
+                else:
+                    positions = None
+                if positions is None:
+                    return None
+                groups.append(positions)
+            if len(groups) == 0:
+                return np.array([], dtype=np.intp)
+            return np.unique(np.concatenate(groups))
+        elif type(item) in PandasIndexSelector.RANGES and self._is_bound(item.b):
+            lower, inclusive = PandasIndexSelector.RANGES[type(item)]
+            if lower:
+                return index.range_positions(low=item.b, low_inclusive=inclusive)
+            return index.range_positions(high=item.b, high_inclusive=inclusive)
+        elif (
+            type(item) is BetweenQuery
+            and self._is_bound(item.low)
+            and self._is_bound(item.high)
+        ):
+            return index.range_positions(item.low, item.high)
+        elif type(item) is StartsWithQuery and isinstance(item.b, str) and item.b:
+            if index.level_dtypes[0].kind != "O":
+                return None
+            upper = prefix_upper_bound(item.b)
+            return index.range_positions(item.b, upper, True, False)
+        return None
@@ -1,30 +1,249 @@
-from typing import Any
+import operator
+from typing import Any, Callable, ClassVar, Optional
 
-from pandas import DataFrame
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, MultiIndex, Series
 
 from tanuki.data_store.column_alias import ColumnAlias
 from tanuki.data_store.query import (
     AndGroupQuery,
     AndQuery,
+    BetweenQuery,
+    ColumnQuery,
+    DataStoreQuery,
     EqualsQuery,
     GreaterEqualQuery,
     GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
     LessEqualQuery,
     LessThanQuery,
     NotEqualsQuery,
+    NotQuery,
     OrGroupQuery,
     OrQuery,
+    Query,
     RowCountQuery,
+    RowInQuery,
+    RowQuery,
+    StartsWithQuery,
+    prefix_upper_bound,
 )
 from tanuki.database.adapter.query.query_compiler import QueryCompiler
 
 
 class PandasQueryCompiler(QueryCompiler[DataFrame]):
+    COMPARISONS: ClassVar[dict[type, Callable[[Any, Any], Any]]] = {
+        EqualsQuery: operator.eq,
+        NotEqualsQuery: operator.ne,
+        GreaterThanQuery: operator.gt,
+        GreaterEqualQuery: operator.ge,
+        LessThanQuery: operator.lt,
+        LessEqualQuery: operator.le,
+    }
+    SPARSE_RATIO: ClassVar[int] = 8
+
     _data_frame: DataFrame
 
     def __init__(self, data_frame: DataFrame) -> None:
         self._data_frame = data_frame
 
+    def select(
+        self: "PandasQueryCompiler", query: Any, selection: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        if selection is None:
+            selection = np.arange(len(self._data_frame))
+        return selection[self._select(query, selection)]
+
+    def _select(
+        self: "PandasQueryCompiler", query: Any, selection: np.ndarray
+    ) -> np.ndarray:
+        if type(query) is bool or type(query) is np.bool_:
+            return np.full(len(selection), bool(query))
+        elif isinstance(query, (DataStoreQuery, RowQuery, ColumnQuery)):
+            return self._select(query.a, selection)
+        elif isinstance(query, AndQuery):
+            return self._select_all([query.a, query.b], selection)
+        elif isinstance(query, AndGroupQuery):
+            return self._select_all(query.items, selection)
+        elif isinstance(query, OrQuery):
+            return self._select_any([query.a, query.b], selection)
+        elif isinstance(query, OrGroupQuery):
+            return self._select_any(query.items, selection)
+        elif isinstance(query, NotQuery):
+            return ~self._select(query.a, selection)
+        elif type(query) in PandasQueryCompiler.COMPARISONS:
+            compare = PandasQueryCompiler.COMPARISONS[type(query)]
+            return self._compare(
+                compare,
+                self._take(query.a, selection, True),
+                self._take(query.b, selection, False),
+                len(selection),
+            )
+        elif isinstance(query, InQuery) and self._is_column(query.a, True):
+            values = Series(self._take(query.a, selection, True), copy=False)
+            return values.isin(list(query.b)).to_numpy()
+        elif isinstance(query, RowInQuery) and all(
+            self._is_column(column, True) for column in query.a
+        ):
+            keys = MultiIndex.from_arrays(
+                [self._take(column, selection, True) for column in query.a]
+            )
+            return keys.isin(query.b)
+        elif isinstance(query, BetweenQuery) and self._is_column(query.a, True):
+            return self._select_range(query.a, query.low, query.high, True, selection)
+        elif isinstance(query, StartsWithQuery) and self._is_column(query.a, True):
+            upper = prefix_upper_bound(query.b)
+            mask = self._sorted_range(query.a, query.b, upper, False, selection)
+            if mask is not None:
+                return mask
+            values = Series(self._take(query.a, selection, True), copy=False)
+            return self._as_mask(values.str.startswith(query.b, na=False), len(selection))
+        elif isinstance(query, IsNullQuery) and self._is_column(query.a, True):
+            return np.asarray(pd.isna(self._take(query.a, selection, True)))
+        return self._as_mask(self.compile(query), len(self._data_frame))[selection]
+
+    def _select_range(
+        self: "PandasQueryCompiler",
+        column: Any,
+        low: Any,
+        high: Any,
+        inclusive: bool,
+        selection: np.ndarray,
+    ) -> np.ndarray:
+        mask = self._sorted_range(column, low, high, inclusive, selection)
+        if mask is not None:
+            return mask
+        values = self._take(column, selection, True)
+        mask = self._compare(operator.ge, values, low, len(selection))
+        upper = operator.le if inclusive else operator.lt
+        return mask & self._compare(upper, values, high, len(selection))
+
+    def _sorted_range(
+        self: "PandasQueryCompiler",
+        column: Any,
+        low: Any,
+        high: Optional[Any],
+        inclusive: bool,
+        selection: np.ndarray,
+    ) -> Optional[np.ndarray]:
+        series = self._data_frame[str(column)]
+        if len(selection) != len(series):
+            return None
+        try:
+            if not series.is_monotonic_increasing or series.hasnans:
+                return None
+            start = series.searchsorted(low, side="left")
+            end = len(series)
+            if high is not None:
+                end = series.searchsorted(high, side="right" if inclusive else "left")
+        except TypeError:
+            return None
+        mask = np.zeros(len(series), dtype=bool)
+        mask[start:end] = True
+        return mask
+
+    def _select_all(
+        self: "PandasQueryCompiler", items: list, selection: np.ndarray
+    ) -> np.ndarray:
+        mask = np.ones(len(selection), dtype=bool)
+        alive = None
+        for item in items:
+            if alive is None:
+                np.logical_and(mask, self._select(item, selection), out=mask)
+                if self._is_sparse(np.count_nonzero(mask), len(selection)):
+                    alive = np.flatnonzero(mask)
+            elif len(alive) == 0:
+                break
+            else:
+                alive = alive[self._select(item, selection[alive])]
+        if alive is not None:
+            mask[:] = False
+            mask[alive] = True
+        return mask
+
+    def _select_any(
+        self: "PandasQueryCompiler", items: list, selection: np.ndarray
+    ) -> np.ndarray:
+        mask = np.zeros(len(selection), dtype=bool)
+        pending = None
+        for item in items:
+            if pending is None:
+                np.logical_or(mask, self._select(item, selection), out=mask)
+                remaining = len(selection) - np.count_nonzero(mask)
+                if self._is_sparse(remaining, len(selection)):
+                    pending = np.flatnonzero(~mask)
+            elif len(pending) == 0:
+                break
+            else:
+                matched = self._select(item, selection[pending])
+                mask[pending[matched]] = True
+                pending = pending[~matched]
+        return mask
+
+    @staticmethod
+    def _is_sparse(count: int, total: int) -> bool:
+        return count * PandasQueryCompiler.SPARSE_RATIO < total
+
+    def _is_column(self: "PandasQueryCompiler", parameter: Any, subject: bool) -> bool:
+        if type(parameter) is ColumnAlias:
+            return parameter.name in self._data_frame.columns
+        return (
+            subject and type(parameter) is str and parameter in self._data_frame.columns
+        )
+
+    def _take(
+        self: "PandasQueryCompiler", parameter: Any, selection: np.ndarray, subject: bool
+    ) -> Any:
+        if isinstance(parameter, Query):
+            return self._select(parameter, selection)
+        elif not self._is_column(parameter, subject):
+            return parameter
+        series = self._data_frame[str(parameter)]
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            values = series.array
+        if len(selection) == len(values):
+            return values
+        return values[selection]
+
+    def _compare(
+        self: "PandasQueryCompiler",
+        compare: Callable[[Any, Any], Any],
+        a: Any,
+        b: Any,
+        length: int,
+    ) -> np.ndarray:
+        if self._is_numeric(a) and self._is_numeric(b):
+            result = compare(a, b)
+        else:
+            result = compare(self._as_series(a), self._as_series(b))
+        return self._as_mask(result, length)
+
+    @staticmethod
+    def _is_numeric(value: Any) -> bool:
+        if isinstance(value, np.ndarray):
+            return value.dtype.kind in "biuf"
+        return isinstance(value, (int, float, np.number, np.bool_))
+
+    @staticmethod
+    def _as_series(value: Any) -> Any:
+        if np.ndim(value) == 0:
+            return value
+        return Series(value, copy=False)
+
+    @staticmethod
+    def _as_mask(result: Any, length: int) -> np.ndarray:
+        if isinstance(result, np.ndarray) and result.dtype == bool:
+            return result
+        elif np.ndim(result) == 0:
+            if type(result) is not bool and type(result) is not np.bool_:
+                raise ValueError(f"Query result {result} is not a row predicate")
+            return np.full(length, bool(result))
+        return pd.array(result, dtype="boolean").to_numpy(dtype=bool, na_value=False)
+
     def _get_value(
         self: "PandasQueryCompiler", parameter: Any
     ) -> Any:
@@ -33,29 +252,63 @@ class PandasQueryCompiler(QueryCompiler[DataFrame]):
         else:
             return parameter
 
+    def _get_column(
+        self: "PandasQueryCompiler", parameter: Any
+    ) -> Any:
+        if type(parameter) is str and parameter in self._data_frame.columns:
+            return self._data_frame[parameter]
+        else:
+            return self._get_value(parameter)
+
     def EQUALS(self: "PandasQueryCompiler", equals_type: EqualsQuery) -> DataFrame:
-        return self._get_value(equals_type.a) == self._get_value(equals_type.b)
+        return self._get_column(equals_type.a) == self._get_value(equals_type.b)
 
     def NOT_EQUALS(
         self: "PandasQueryCompiler", not_equals_type: NotEqualsQuery
     ) -> DataFrame:
-        return self._get_value(not_equals_type.a) != self._get_value(not_equals_type.b)
+        return self._get_column(not_equals_type.a) != self._get_value(not_equals_type.b)
 
     def GREATER_THAN(
         self: "PandasQueryCompiler", gt_type: GreaterThanQuery
     ) -> DataFrame:
-        return self._get_value(gt_type.a) > self._get_value(gt_type.b)
+        return self._get_column(gt_type.a) > self._get_value(gt_type.b)
 
     def GREATER_EQUAL(
         self: "PandasQueryCompiler", ge_type: GreaterEqualQuery
     ) -> DataFrame:
-        return self._get_value(ge_type.a) >= self._get_value(ge_type.b)
+        return self._get_column(ge_type.a) >= self._get_value(ge_type.b)
 
     def LESS_THAN(self: "PandasQueryCompiler", lt_type: LessThanQuery) -> DataFrame:
-        return self._get_value(lt_type.a) < self._get_value(lt_type.b)
+        return self._get_column(lt_type.a) < self._get_value(lt_type.b)
 
     def LESS_EQUAL(self: "PandasQueryCompiler", le_type: LessEqualQuery) -> DataFrame:
-        return self._get_value(le_type.a) <= self._get_value(le_type.b)
+        return self._get_column(le_type.a) <= self._get_value(le_type.b)
+
+    def IN(self: "PandasQueryCompiler", in_type: InQuery) -> DataFrame:
+        return self._get_column(in_type.a).isin(in_type.b)
+
+    def ROW_IN(self: "PandasQueryCompiler", row_in_type: RowInQuery) -> DataFrame:
+        keys = MultiIndex.from_arrays(
+            [self._get_column(column) for column in row_in_type.a]
+        )
+        return Series(keys.isin(row_in_type.b), index=self._data_frame.index)
+
+    def BETWEEN(self: "PandasQueryCompiler", between_type: BetweenQuery) -> DataFrame:
+        return self._get_column(between_type.a).between(
+            between_type.low, between_type.high
+        )
+
+    def STARTS_WITH(
+        self: "PandasQueryCompiler", starts_with_type: StartsWithQuery
+    ) -> DataFrame:
+        column = self._get_column(starts_with_type.a)
+        return column.str.startswith(starts_with_type.b, na=False)
+
+    def IS_NULL(self: "PandasQueryCompiler", is_null_type: IsNullQuery) -> DataFrame:
+        return self._get_column(is_null_type.a).isna()
+
+    def NOT(self: "PandasQueryCompiler", not_type: NotQuery) -> DataFrame:
+        return ~self._get_value(not_type.a)
 
     def ROW_COUNT(self: "PandasQueryCompiler", count_type: RowCountQuery) -> DataFrame:
         return len(self._get_value(count_type.a))
@@ -10,15 +10,21 @@ if TYPE_CHECKING:
     from tanuki.data_store.query import (
         AndGroupQuery,
         AndQuery,
+        BetweenQuery,
         EqualsQuery,
         GreaterEqualQuery,
         GreaterThanQuery,
+        InQuery,
+        IsNullQuery,
         LessEqualQuery,
         LessThanQuery,
         NotEqualsQuery,
+        NotQuery,
         OrGroupQuery,
         OrQuery,
         RowCountQuery,
+        RowInQuery,
+        StartsWithQuery,
         SumQuery,
     )
 
@@ -42,6 +48,24 @@ class QueryCompiler(Generic[T]):
     def LESS_EQUAL(self: "QueryCompiler", query: LessEqualQuery) -> T:
         raise NotImplementedError()
 
+    def IN(self: "QueryCompiler", query: InQuery) -> T:
+        raise NotImplementedError()
+
+    def ROW_IN(self: "QueryCompiler", query: RowInQuery) -> T:
+        raise NotImplementedError()
+
+    def NOT(self: "QueryCompiler", query: NotQuery) -> T:
+        raise NotImplementedError()
+
+    def BETWEEN(self: "QueryCompiler", query: BetweenQuery) -> T:
+        raise NotImplementedError()
+
+    def STARTS_WITH(self: "QueryCompiler", query: StartsWithQuery) -> T:
+        raise NotImplementedError()
+
+    def IS_NULL(self: "QueryCompiler", query: IsNullQuery) -> T:
+        raise NotImplementedError()
+
     def ROW_COUNT(self: "QueryCompiler", query: RowCountQuery) -> T:
         raise NotImplementedError()
 
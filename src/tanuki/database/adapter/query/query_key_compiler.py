@@ -0,0 +1,103 @@
+from typing import Any, Hashable
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    AndQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
+    LessEqualQuery,
+    LessThanQuery,
+    NotEqualsQuery,
+    NotQuery,
+    OrGroupQuery,
+    OrQuery,
+    RowCountQuery,
+    RowInQuery,
+    StartsWithQuery,
+    SumQuery,
+)
+from tanuki.database.adapter.query.query_compiler import QueryCompiler
+
+
+class QueryKey(tuple):
+    pass
+
+
+class QueryKeyCompiler(QueryCompiler[QueryKey]):
+    def _key(self, value: Any) -> Hashable:
+        if isinstance(value, QueryKey):
+            return value
+        if isinstance(value, ColumnAlias):
+            return ("column", str(value))
+        try:
+            hash(value)
+            return (type(value).__name__, value)
+        except TypeError:
+            return (type(value).__name__, repr(value))
+
+    def _binary(self, operator: str, a: Any, b: Any) -> QueryKey:
+        return QueryKey((operator, self._key(a), self._key(b)))
+
+    def EQUALS(self: "QueryKeyCompiler", query: EqualsQuery) -> QueryKey:
+        return self._binary("=", query.a, query.b)
+
+    def NOT_EQUALS(self: "QueryKeyCompiler", query: NotEqualsQuery) -> QueryKey:
+        return self._binary("!=", query.a, query.b)
+
+    def GREATER_THAN(self: "QueryKeyCompiler", query: GreaterThanQuery) -> QueryKey:
+        return self._binary(">", query.a, query.b)
+
+    def GREATER_EQUAL(self: "QueryKeyCompiler", query: GreaterEqualQuery) -> QueryKey:
+        return self._binary(">=", query.a, query.b)
+
+    def LESS_THAN(self: "QueryKeyCompiler", query: LessThanQuery) -> QueryKey:
+        return self._binary("<", query.a, query.b)
+
+    def LESS_EQUAL(self: "QueryKeyCompiler", query: LessEqualQuery) -> QueryKey:
+        return self._binary("<=", query.a, query.b)
+
+    def IN(self: "QueryKeyCompiler", query: InQuery) -> QueryKey:
+        values = tuple(self._key(value) for value in query.b)
+        return QueryKey(("in", self._key(query.a), values))
+
+    def ROW_IN(self: "QueryKeyCompiler", query: RowInQuery) -> QueryKey:
+        columns = tuple(self._key(column) for column in query.a)
+        rows = tuple(tuple(self._key(value) for value in row) for row in query.b)
+        return QueryKey(("row_in", columns, rows))
+
+    def NOT(self: "QueryKeyCompiler", query: NotQuery) -> QueryKey:
+        return QueryKey(("not", self._key(query.a)))
+
+    def BETWEEN(self: "QueryKeyCompiler", query: BetweenQuery) -> QueryKey:
+        return QueryKey(
+            ("between", self._key(query.a), self._key(query.low), self._key(query.high))
+        )
+
+    def STARTS_WITH(self: "QueryKeyCompiler", query: StartsWithQuery) -> QueryKey:
+        return self._binary("startswith", query.a, query.b)
+
+    def IS_NULL(self: "QueryKeyCompiler", query: IsNullQuery) -> QueryKey:
+        return QueryKey(("is_null", self._key(query.a)))
+
+    def ROW_COUNT(self: "QueryKeyCompiler", query: RowCountQuery) -> QueryKey:
+        return QueryKey(("count", self._key(query.a)))
+
+    def SUM(self: "QueryKeyCompiler", query: SumQuery) -> QueryKey:
+        return QueryKey(("sum", self._key(query.a)))
+
+    def AND(self: "QueryKeyCompiler", query: AndQuery) -> QueryKey:
+        return self._binary("and", query.a, query.b)
+
+    def AND_GROUP(self: "QueryKeyCompiler", query: AndGroupQuery) -> QueryKey:
+        return QueryKey(("and", *[self._key(item) for item in query.items]))
+
+    def OR(self: "QueryKeyCompiler", query: OrQuery) -> QueryKey:
+        return self._binary("or", query.a, query.b)
+
+    def OR_GROUP(self: "QueryKeyCompiler", query: OrGroupQuery) -> QueryKey:
+        return QueryKey(("or", *[self._key(item) for item in query.items]))
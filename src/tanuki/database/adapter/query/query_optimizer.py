@@ -0,0 +1,241 @@
+import operator
+from typing import Any, Callable, ClassVar, Optional, Union
+
+import numpy as np
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    AndQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
+    LessEqualQuery,
+    LessThanQuery,
+    NotEqualsQuery,
+    NotQuery,
+    OrGroupQuery,
+    OrQuery,
+    Query,
+    RowCountQuery,
+    RowInQuery,
+    StartsWithQuery,
+    SumQuery,
+)
+from tanuki.database.adapter.query.query_compiler import QueryCompiler
+from tanuki.database.adapter.query.query_key_compiler import QueryKeyCompiler
+
+Optimized = Union[bool, Query]
+
+
+class QueryOptimizer(QueryCompiler[Optimized]):
+    SELECTIVITY: ClassVar[dict[type, float]] = {
+        EqualsQuery: 0.1,
+        InQuery: 0.1,
+        GreaterThanQuery: 0.33,
+        GreaterEqualQuery: 0.33,
+        LessThanQuery: 0.33,
+        LessEqualQuery: 0.33,
+        NotEqualsQuery: 0.9,
+        NotQuery: 0.9,
+        BetweenQuery: 0.25,
+        StartsWithQuery: 0.1,
+        IsNullQuery: 0.1,
+    }
+
+    def optimize(self: "QueryOptimizer", query: Optional[Query]) -> Optional[Query]:
+        if not isinstance(query, Query):
+            return query
+        result = self.compile(query)
+        if self._is_bool(result) and result:
+            return None
+        elif not isinstance(result, Query):
+            return query
+        return result
+
+    @staticmethod
+    def _is_bool(value: Any) -> bool:
+        return type(value) is bool or type(value) is np.bool_
+
+    @staticmethod
+    def _is_value(value: Any) -> bool:
+        return not isinstance(value, (Query, ColumnAlias))
+
+    @staticmethod
+    def _is_literal(value: Any) -> bool:
+        return not isinstance(value, (Query, ColumnAlias, str))
+
+    def _fold(
+        self: "QueryOptimizer", query: Query, compare: Callable[[Any, Any], Any]
+    ) -> Optimized:
+        if self._is_literal(query.a) and self._is_value(query.b):
+            try:
+                return bool(compare(query.a, query.b))
+            except TypeError:
+                pass
+        return query
+
+    def _flatten(self: "QueryOptimizer", items: list, group_type: type) -> list:
+        flat = []
+        for item in items:
+            if isinstance(item, group_type):
+                flat.extend(self._flatten(item.items, group_type))
+            else:
+                flat.append(item)
+        return flat
+
+    def _unique(self: "QueryOptimizer", items: list) -> list:
+        compiler = QueryKeyCompiler()
+        seen = set()
+        unique = []
+        for item in items:
+            key = compiler.compile(item)
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
+
+    def _selectivity(self: "QueryOptimizer", query: Any) -> float:
+        if isinstance(query, AndGroupQuery):
+            return float(np.prod([self._selectivity(item) for item in query.items]))
+        elif isinstance(query, OrGroupQuery):
+            return min(1.0, sum([self._selectivity(item) for item in query.items]))
+        elif isinstance(query, (InQuery, RowInQuery)):
+            return min(1.0, self.SELECTIVITY[InQuery] * len(query.b))
+        return self.SELECTIVITY.get(type(query), 1.0)
+
+    def _equality_column(self: "QueryOptimizer", query: Any) -> Optional[str]:
+        if isinstance(query, InQuery) and not self._is_literal(query.a):
+            return str(query.a)
+        elif (
+            isinstance(query, EqualsQuery)
+            and isinstance(query.a, (ColumnAlias, str))
+            and self._is_value(query.b)
+        ):
+            return str(query.a)
+        return None
+
+    def _merge_equalities(self: "QueryOptimizer", items: list) -> list:
+        merged: list = []
+        in_sets: dict[str, tuple[int, Any, list]] = {}
+        for item in items:
+            column = self._equality_column(item)
+            if column is None:
+                merged.append(item)
+                continue
+            values = list(item.b) if isinstance(item, InQuery) else [item.b]
+            if column in in_sets:
+                in_sets[column][2].extend(values)
+            else:
+                in_sets[column] = (len(merged), item.a, values)
+                merged.append(item)
+
+        for position, subject, values in in_sets.values():
+            unique_values = self._unique_values(values)
+            if len(unique_values) == 1:
+                merged[position] = EqualsQuery(subject, unique_values[0])
+            else:
+                merged[position] = InQuery(subject, unique_values)
+        return merged
+
+    @staticmethod
+    def _unique_values(values: list) -> list:
+        try:
+            return list(dict.fromkeys(values))
+        except TypeError:
+            unique_values = []
+            for value in values:
+                if value not in unique_values:
+                    unique_values.append(value)
+            return unique_values
+
+    def EQUALS(self: "QueryOptimizer", query: EqualsQuery) -> Optimized:
+        return self._fold(query, operator.eq)
+
+    def NOT_EQUALS(self: "QueryOptimizer", query: NotEqualsQuery) -> Optimized:
+        return self._fold(query, operator.ne)
+
+    def GREATER_THAN(self: "QueryOptimizer", query: GreaterThanQuery) -> Optimized:
+        return self._fold(query, operator.gt)
+
+    def GREATER_EQUAL(self: "QueryOptimizer", query: GreaterEqualQuery) -> Optimized:
+        return self._fold(query, operator.ge)
+
+    def LESS_THAN(self: "QueryOptimizer", query: LessThanQuery) -> Optimized:
+        return self._fold(query, operator.lt)
+
+    def LESS_EQUAL(self: "QueryOptimizer", query: LessEqualQuery) -> Optimized:
+        return self._fold(query, operator.le)
+
+    def IN(self: "QueryOptimizer", query: InQuery) -> Optimized:
+        if self._is_literal(query.a):
+            return query.a in query.b
+        return self._merge_equalities([query])[0]
+
+    def ROW_IN(self: "QueryOptimizer", query: RowInQuery) -> Optimized:
+        return RowInQuery(query.a, list(dict.fromkeys(query.b)))
+
+    def NOT(self: "QueryOptimizer", query: NotQuery) -> Optimized:
+        if self._is_bool(query.a):
+            return not query.a
+        elif isinstance(query.a, NotQuery):
+            return query.a.a
+        return query
+
+    def BETWEEN(self: "QueryOptimizer", query: BetweenQuery) -> Optimized:
+        if self._is_literal(query.a):
+            try:
+                return bool(query.low <= query.a <= query.high)
+            except TypeError:
+                pass
+        return query
+
+    def STARTS_WITH(self: "QueryOptimizer", query: StartsWithQuery) -> Optimized:
+        return query
+
+    def IS_NULL(self: "QueryOptimizer", query: IsNullQuery) -> Optimized:
+        return query
+
+    def ROW_COUNT(self: "QueryOptimizer", query: RowCountQuery) -> Optimized:
+        return query
+
+    def SUM(self: "QueryOptimizer", query: SumQuery) -> Optimized:
+        return query
+
+    def AND(self: "QueryOptimizer", query: AndQuery) -> Optimized:
+        return self.AND_GROUP(AndGroupQuery([query.a, query.b]))
+
+    def AND_GROUP(self: "QueryOptimizer", query: AndGroupQuery) -> Optimized:
+        items = []
+        for item in self._unique(self._flatten(query.items, AndGroupQuery)):
+            if self._is_bool(item):
+                if not item:
+                    return False
+                continue
+            items.append(item)
+        if len(items) == 0:
+            return True
+        elif len(items) == 1:
+            return items[0]
+        return AndGroupQuery(sorted(items, key=self._selectivity))
+
+    def OR(self: "QueryOptimizer", query: OrQuery) -> Optimized:
+        return self.OR_GROUP(OrGroupQuery([query.a, query.b]))
+
+    def OR_GROUP(self: "QueryOptimizer", query: OrGroupQuery) -> Optimized:
+        items = []
+        for item in self._unique(self._flatten(query.items, OrGroupQuery)):
+            if self._is_bool(item):
+                if item:
+                    return True
+                continue
+            items.append(item)
+        items = self._merge_equalities(items)
+        if len(items) == 0:
+            return False
+        elif len(items) == 1:
+            return items[0]
+        return OrGroupQuery(items)
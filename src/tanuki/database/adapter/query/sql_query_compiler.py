@@ -1,17 +1,26 @@
 from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
 from tanuki.data_store.query import (
     AndQuery,
+    BetweenQuery,
     EqualsQuery,
     GreaterEqualQuery,
     GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
     AndGroupQuery,
     OrGroupQuery,
     LessEqualQuery,
     LessThanQuery,
     NotEqualsQuery,
+    NotQuery,
     OrQuery,
     RowCountQuery,
+    RowInQuery,
+    StartsWithQuery,
     SumQuery,
+    prefix_upper_bound,
 )
 from tanuki.database.adapter.query.query_compiler import QueryCompiler
 
@@ -19,6 +28,8 @@ from tanuki.database.adapter.query.query_compiler import QueryCompiler
 @dataclass
 class SqlQueryCompiler(QueryCompiler[str]):
     quote: bool = False
+    stage: Optional[Callable[[list[str], list[tuple]], str]] = None
+    stage_threshold: int = 1000
 
     def try_quote(self, value: str) -> str:
         if type(value) is bool:
@@ -46,6 +57,60 @@ class SqlQueryCompiler(QueryCompiler[str]):
     def LESS_EQUAL(self: "SqlQueryCompiler", query: LessEqualQuery) -> str:
         return f"{query.a}<={self.try_quote(query.b)}"
 
+    def IN(self: "SqlQueryCompiler", query: InQuery) -> str:
+        if self._should_stage(query.b):
+            staged = self._stage([str(query.a)], [(value,) for value in query.b])
+            return f"{query.a} IN (SELECT {query.a} FROM {staged})"
+        values = ", ".join([str(self.try_quote(value)) for value in query.b])
+        return f"{query.a} IN ({values})"
+
+    def ROW_IN(self: "SqlQueryCompiler", query: RowInQuery) -> str:
+        columns = ", ".join([str(column) for column in query.a])
+        if len(query.b) == 0:
+            return "(1 = 0)"
+        elif self._should_stage(query.b):
+            staged = self._stage([str(column) for column in query.a], query.b)
+            return f"({columns}) IN (SELECT {columns} FROM {staged})"
+        rows = ", ".join(
+            [f"({', '.join([str(self.try_quote(v)) for v in row])})" for row in query.b]
+        )
+        return f"({columns}) IN (VALUES {rows})"
+
+    def NOT(self: "SqlQueryCompiler", query: NotQuery) -> str:
+        return f"(NOT {query.a})"
+
+    def BETWEEN(self: "SqlQueryCompiler", query: BetweenQuery) -> str:
+        low = self.try_quote(query.low)
+        high = self.try_quote(query.high)
+        return f"{query.a} BETWEEN {low} AND {high}"
+
+    def STARTS_WITH(self: "SqlQueryCompiler", query: StartsWithQuery) -> str:
+        upper = prefix_upper_bound(query.b)
+        if upper is None:
+            return f"{query.a} IS NOT NULL"
+        return f"({query.a}>={self.try_quote(query.b)} and {query.a}<{self.try_quote(upper)})"
+
+    def IS_NULL(self: "SqlQueryCompiler", query: IsNullQuery) -> str:
+        return f"{query.a} IS NULL"
+
+    def _should_stage(self: "SqlQueryCompiler", values: list) -> bool:
+        return (
+            self.stage is not None
+            and self.quote
+            and len(values) > self.stage_threshold
+        )
+
+    def _stage(self: "SqlQueryCompiler", columns: list[str], rows: list[tuple]) -> str:
+        return self.stage(
+            columns, [tuple(self._stage_value(value) for value in row) for row in rows]
+        )
+
+    @staticmethod
+    def _stage_value(value: Any) -> Any:
+        if type(value) is bool:
+            value = int(value)
+        return None if value is None else str(value)
+
     def ROW_COUNT(self: "SqlQueryCompiler", row_count_query: RowCountQuery) -> str:
         return f"COUNT({row_count_query.a})"
 
@@ -0,0 +1,120 @@
+from typing import Any, Optional
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    AndQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
+    LessEqualQuery,
+    LessThanQuery,
+    NotEqualsQuery,
+    NotQuery,
+    OrGroupQuery,
+    OrQuery,
+    RowCountQuery,
+    RowInQuery,
+    StartsWithQuery,
+    SumQuery,
+    prefix_upper_bound,
+)
+from tanuki.database.adapter.query.query_compiler import QueryCompiler
+
+
+class ZoneMapQueryCompiler(QueryCompiler[bool]):
+    _stats: dict[str, dict[str, Any]]
+    _rows: int
+
+    def __init__(self, stats: dict[str, dict[str, Any]], rows: int) -> None:
+        self._stats = stats
+        self._rows = rows
+
+    def _column_stats(self, column: Any) -> Optional[dict[str, Any]]:
+        if type(column) is not ColumnAlias and type(column) is not str:
+            return None
+        return self._stats.get(str(column))
+
+    def _may_match(self, column: Any, check: callable) -> bool:
+        stats = self._column_stats(column)
+        if stats is None:
+            return True
+        if stats["nulls"] == self._rows:
+            return False
+        if stats["min"] is None or stats["max"] is None:
+            return True
+        try:
+            return bool(check(stats["min"], stats["max"]))
+        except TypeError:
+            return True
+
+    def EQUALS(self: "ZoneMapQueryCompiler", query: EqualsQuery) -> bool:
+        return self._may_match(query.a, lambda low, high: low <= query.b <= high)
+
+    def NOT_EQUALS(self: "ZoneMapQueryCompiler", query: NotEqualsQuery) -> bool:
+        return self._may_match(
+            query.a, lambda low, high: not (low == high == query.b)
+        )
+
+    def GREATER_THAN(self: "ZoneMapQueryCompiler", query: GreaterThanQuery) -> bool:
+        return self._may_match(query.a, lambda _, high: high > query.b)
+
+    def GREATER_EQUAL(self: "ZoneMapQueryCompiler", query: GreaterEqualQuery) -> bool:
+        return self._may_match(query.a, lambda _, high: high >= query.b)
+
+    def LESS_THAN(self: "ZoneMapQueryCompiler", query: LessThanQuery) -> bool:
+        return self._may_match(query.a, lambda low, _: low < query.b)
+
+    def LESS_EQUAL(self: "ZoneMapQueryCompiler", query: LessEqualQuery) -> bool:
+        return self._may_match(query.a, lambda low, _: low <= query.b)
+
+    def IN(self: "ZoneMapQueryCompiler", query: InQuery) -> bool:
+        return self._may_match(
+            query.a, lambda low, high: any(low <= value <= high for value in query.b)
+        )
+
+    def ROW_IN(self: "ZoneMapQueryCompiler", query: RowInQuery) -> bool:
+        return all(
+            self.IN(InQuery(column, [row[i] for row in query.b]))
+            for i, column in enumerate(query.a)
+        )
+
+    def NOT(self: "ZoneMapQueryCompiler", query: NotQuery) -> bool:
+        return True
+
+    def BETWEEN(self: "ZoneMapQueryCompiler", query: BetweenQuery) -> bool:
+        return self._may_match(
+            query.a, lambda low, high: low <= query.high and high >= query.low
+        )
+
+    def STARTS_WITH(self: "ZoneMapQueryCompiler", query: StartsWithQuery) -> bool:
+        upper = prefix_upper_bound(query.b)
+        return self._may_match(
+            query.a,
+            lambda low, high: high >= query.b and (upper is None or low < upper),
+        )
+
+    def IS_NULL(self: "ZoneMapQueryCompiler", query: IsNullQuery) -> bool:
+        stats = self._column_stats(query.a)
+        return stats is None or stats["nulls"] > 0
+
+    def ROW_COUNT(self: "ZoneMapQueryCompiler", query: RowCountQuery) -> bool:
+        return True
+
+    def SUM(self: "ZoneMapQueryCompiler", query: SumQuery) -> bool:
+        return True
+
+    def AND(self: "ZoneMapQueryCompiler", query: AndQuery) -> bool:
+        return bool(query.a) and bool(query.b)
+
+    def AND_GROUP(self: "ZoneMapQueryCompiler", query: AndGroupQuery) -> bool:
+        return all(bool(item) for item in query.items)
+
+    def OR(self: "ZoneMapQueryCompiler", query: OrQuery) -> bool:
+        return bool(query.a) or bool(query.b)
+
+    def OR_GROUP(self: "ZoneMapQueryCompiler", query: OrGroupQuery) -> bool:
+        return any(bool(item) for item in query.items)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class QueryPlanStep:
+    id: int
+    parent: int
+    detail: str
+    operation: Optional[str] = None
+    table: Optional[str] = None
+    index: Optional[str] = None
+    covering: bool = False
+
+    @property
+    def is_full_scan(self: QueryPlanStep) -> bool:
+        return self.operation == "SCAN" and self.table is not None
+
+    @property
+    def is_index_seek(self: QueryPlanStep) -> bool:
+        return self.operation == "SEARCH" and self.index is not None
+
+
+@dataclass
+class QueryPlan:
+    statement: str
+    steps: list[QueryPlanStep] = field(default_factory=list)
+
+    def full_scans(self: QueryPlan, table: Optional[str] = None) -> list[QueryPlanStep]:
+        return [
+            step
+            for step in self.steps
+            if step.is_full_scan and (table is None or step.table == table)
+        ]
+
+    def index_seeks(self: QueryPlan, table: Optional[str] = None) -> list[QueryPlanStep]:
+        return [
+            step
+            for step in self.steps
+            if step.is_index_seek and (table is None or step.table == table)
+        ]
+
+    def uses_index(self: QueryPlan, index_name: str) -> bool:
+        return any(step.index == index_name for step in self.steps)
+
+    def __str__(self: QueryPlan) -> str:
+        depths = {0: -1}
+        lines = [self.statement]
+        for step in self.steps:
+            depth = depths.get(step.parent, -1) + 1
+            depths[step.id] = depth
+            lines.append(f"{'  ' * depth}{step.detail}")
+        return "\n".join(lines)
+
+    def __repr__(self: QueryPlan) -> str:
+        return str(self)
@@ -2,20 +2,28 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+import re
 import shutil
 import sqlite3
 from sqlite3 import Connection
-from typing import Any, Optional, Type, TypeVar
+from threading import RLock
+import time
+from typing import Any, ClassVar, Iterable, Optional, Type, TypeVar, Union
 
+from tanuki.data_store.aggregation import result_column
 from tanuki.data_store.data_store import DataStore
 from tanuki.data_store.index.index import Index
+from tanuki.data_store.join import join_columns
 from tanuki.data_store.metadata import Metadata
-from tanuki.data_store.query import AndGroupQuery, ColumnQuery, EqualsQuery, Query
+from tanuki.data_store.query import Query
 from tanuki.database.adapter.database_adapter import DatabaseAdapter
 from tanuki.database.adapter.database_schema import DatabaseSchema
+from tanuki.database.adapter.query_plan import QueryPlan, QueryPlanStep
 from tanuki.database.adapter.query.sql_query_compiler import SqlQueryCompiler
 from tanuki.database.adapter.sqlite3.sqlite3_type import Sqlite3Type
 from tanuki.database.adapter.statement.sql_statement import SqlStatement
+from tanuki.database.adapter.upsert_result import UpsertResult
+from tanuki.database.adapter.workload_recorder import WorkloadRecorder
 from tanuki.database.connection_config import ConnectionConfig
 from tanuki.database.data_token import DataToken
 from tanuki.database.db_exceptions import (
@@ -39,11 +47,38 @@ M = TypeVar("M", bound=Metadata)
 
 
 class Sqlite3Adapter(DatabaseAdapter):
+    STAGING_THRESHOLD: ClassVar[int] = 1000
+    CHANGE_LOG_SUFFIX: ClassVar[str] = "__change_log"
+    CHANGE_COLUMNS: ClassVar[list[str]] = ["_tanuki_version", "_tanuki_operation"]
+    UPDATE_FROM_VERSION: ClassVar[tuple[int, int, int]] = (3, 33, 0)
+    PLAN_STEP: ClassVar[re.Pattern] = re.compile(
+        r"^(?P<operation>SCAN|SEARCH) (?P<table>\S+)(?: AS \S+)?"
+        r"(?: USING (?:(?P<covering>COVERING) )?INDEX (?P<index>\S+)"
+        r"| USING (?P<key>(?:INTEGER )?PRIMARY KEY))?"
+    )
+    JOIN_TYPES: ClassVar[dict[str, str]] = {
+        "inner": "INNER",
+        "left": "LEFT",
+        "right": "RIGHT",
+        "outer": "FULL OUTER",
+    }
+    AGGREGATE_FUNCTIONS: ClassVar[dict[str, str]] = {
+        "count": "COUNT({})",
+        "sum": "SUM({})",
+        "min": "MIN({})",
+        "max": "MAX({})",
+        "mean": "AVG({})",
+        "nunique": "COUNT(DISTINCT {})",
+    }
+
     _conn_config: ConnectionConfig
     _metadata_dir: Path
     _checkpoint_dir: Path
     _connection: Optional[Connection]
     _enter_calls: int
+    _lock: RLock
+    _staged_keys: int
+    _workload_recorder: Optional[WorkloadRecorder]
 
     _uncommitted: list[UncommittedChange]
 
@@ -57,6 +92,9 @@ class Sqlite3Adapter(DatabaseAdapter):
         self._checkpoint_dir.mkdir(exist_ok=False)
 
         self._enter_calls = 0
+        self._lock = RLock()
+        self._staged_keys = 0
+        self._workload_recorder = None
         self._connection = None
 
         self._uncommitted = []
@@ -66,30 +104,40 @@ class Sqlite3Adapter(DatabaseAdapter):
             f"{self._conn_config.uri()}/{PROTECTED_GROUP}.db", isolation_level=None
         )
 
+        self._staged_keys = 0
         self._connection.execute("PRAGMA journal_mode=WAL;")
         self._connection.execute("BEGIN")
         with self:
             for db_path in Path(self._conn_config.uri()).glob("*.db"):
                 self.create_group(db_path.stem)
+            self._uncommitted = []
 
     def __enter__(self):
+        self._lock.acquire()
         self._enter_calls += 1
         if self._connection is None:
-            self.new_connection()
+            try:
+                self.new_connection()
+            except Exception:
+                self._enter_calls -= 1
+                self._lock.release()
+                raise
 
     def __exit__(self, etype, value, traceback):
-        if etype is not None:
-            self.rollback()
-
-        self._enter_calls -= 1
-        if self._enter_calls == 0:
-            self._connection.commit()
-            self._connection.close()
-            self._connection = None
-            self._uncommitted = []
-            shutil.rmtree(str(self._checkpoint_dir))
-            self._checkpoint_dir.mkdir(exist_ok=False)
-        
+        try:
+            if etype is not None:
+                self.rollback()
+
+            self._enter_calls -= 1
+            if self._enter_calls == 0:
+                self._connection.commit()
+                self._connection.close()
+                self._connection = None
+                self._uncommitted = []
+                shutil.rmtree(str(self._checkpoint_dir))
+                self._checkpoint_dir.mkdir(exist_ok=False)
+        finally:
+            self._lock.release()
 
     def rollback(self):
         self._connection.rollback()
@@ -170,6 +218,8 @@ class Sqlite3Adapter(DatabaseAdapter):
         try:
             statement = SqlStatement().DROP_TABLE(f"{data_token}").compile()
             self._connection.execute(statement)
+            change_log = self._change_log_token(data_token)
+            self._connection.execute(f"DROP TABLE IF EXISTS {change_log};")
         except Exception as e:
             raise DatabaseAdapterError("drop_group_table failed", e)
 
@@ -196,8 +246,13 @@ class Sqlite3Adapter(DatabaseAdapter):
             raise DatabaseAdapterUsageError("create_index")
         try:
             col_names = [str(col) for col in index.columns]
+            where = None
+            if index.where is not None:
+                where = SqlQueryCompiler(quote=True).compile(index.where)
             statement = (
-                SqlStatement().CREATE_INDEX(index.name, data_token, col_names).compile()
+                SqlStatement()
+                .CREATE_INDEX(index.name, data_token, col_names, index.unique, where)
+                .compile()
             )
 
             self._connection.execute(statement)
@@ -212,10 +267,13 @@ class Sqlite3Adapter(DatabaseAdapter):
                 f"PRAGMA {data_token.data_group}.index_list({data_token.table_name});"
             )
             data_rows = cursor.fetchall()
-            indices = set(item[1] for item in data_rows)
+            indices = {item[1]: item for item in data_rows}
             index_name = f"{data_token.table_name}_{index.name}"
             if index_name not in indices:
                 return False
+            _, _, unique, _, partial = indices[index_name]
+            if bool(unique) != index.unique or bool(partial) != (index.where is not None):
+                return False
             cursor = self._connection.execute(
                 f"PRAGMA {data_token.data_group}.index_xinfo({index_name});"
             )
@@ -231,32 +289,235 @@ class Sqlite3Adapter(DatabaseAdapter):
         data_token: DataToken,
         query: Optional[Query] = None,
         columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
     ) -> list[tuple]:
         if self._connection == None:
             raise DatabaseAdapterUsageError("query")
         try:
+            statement = self._query_statement(
+                data_token, query, columns, offset, limit, rows, order_by, ascending
+            )
+            start = time.perf_counter()
+            cursor = self._connection.execute(statement)
+            data_rows = cursor.fetchall()
+            self._record_workload(data_token, query, start)
+            return data_rows
+        except Exception as e:
+            raise DatabaseAdapterError("query failed", e)
+
+    def _query_statement(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> str:
+        criteria = None
+        if query is not None:
+            compiler = self._query_compiler()
+            criteria = str(compiler.compile(query))
+
+        if rows is not None:
+            statement = self._positions_statement(data_token, criteria, columns, rows)
+        else:
             statement = SqlStatement()
             if columns is not None:
-                clean = []
-                for column in columns:
-                    clean.append(column)
-                statement.SELECT(*clean)
+                statement.SELECT(*columns)
             else:
                 statement.SELECT_ALL()
-
             statement.FROM(str(data_token))
+            if criteria is not None:
+                statement.WHERE(criteria)
+            if order_by is not None:
+                if type(ascending) is not list:
+                    ascending = [ascending for _ in order_by]
+                statement.ORDER_BY(*order_by, "rowid", ascending=ascending + [True])
+            elif offset is not None or limit is not None:
+                statement.ORDER_BY("rowid", ascending=True)
+            if offset is not None or limit is not None:
+                statement.LIMIT(-1 if limit is None else limit)
+                if offset is not None:
+                    statement.OFFSET(offset)
+        return statement.compile()
+
+    def explain(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[str]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> QueryPlan:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("explain")
+        try:
+            statement = self._query_statement(
+                data_token, query, columns, order_by=order_by, ascending=ascending
+            )
+            cursor = self._connection.execute(f"EXPLAIN QUERY PLAN {statement}")
+            steps = [
+                self._plan_step(step_id, parent, detail)
+                for step_id, parent, _, detail in cursor.fetchall()
+            ]
+            return QueryPlan(statement, steps)
+        except Exception as e:
+            raise DatabaseAdapterError("explain failed", e)
+
+    @staticmethod
+    def _plan_step(step_id: int, parent: int, detail: str) -> QueryPlanStep:
+        match = Sqlite3Adapter.PLAN_STEP.match(detail)
+        if match is None or match.group("table") == "CONSTANT":
+            return QueryPlanStep(step_id, parent, detail)
+        index = match.group("index")
+        if match.group("key") is not None:
+            index = match.group("key")
+        return QueryPlanStep(
+            step_id,
+            parent,
+            detail,
+            match.group("operation"),
+            match.group("table"),
+            index,
+            match.group("covering") is not None,
+        )
 
-            if query is not None:
-                compiler = SqlQueryCompiler(quote=True)
-                query = compiler.compile(query)
-                statement.WHERE(str(query))
-            statement = statement.compile()
+    def _positions_statement(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        criteria: Optional[str],
+        columns: Optional[list[str]],
+        rows: list[int],
+    ) -> SqlStatement:
+        if columns is None:
+            columns = self._table_columns(data_token)
+        position = "ROW_NUMBER() OVER (ORDER BY rowid) - 1 AS _tanuki_position"
+        positions = SqlStatement().SELECT(*columns, position).FROM(str(data_token))
+        if criteria is not None:
+            positions.WHERE(criteria)
+
+        if len(rows) > self.STAGING_THRESHOLD:
+            staged = self._stage_temp_table(
+                "_tanuki_positions",
+                ["position INTEGER PRIMARY KEY"],
+                [(row,) for row in rows],
+            )
+            row_filter = f"IN (SELECT position FROM {staged})"
+        else:
+            row_filter = SqlStatement().IN(rows, quote=False).compile(append_colon=False)
+
+        return (
+            SqlStatement()
+            .SELECT(*columns)
+            .FROM(f"({positions.compile(append_colon=False)})")
+            .WHERE(f"_tanuki_position {row_filter}")
+            .ORDER_BY("_tanuki_position", ascending=True)
+        )
 
-            cursor = self._connection.execute(statement)
-            data_rows = cursor.fetchall()
-            return data_rows
-        except Exception as e:
-            raise DatabaseAdapterError("query failed", e)
+    def _table_columns(self: Sqlite3Adapter, data_token: DataToken) -> list[str]:
+        cursor = self._connection.execute(
+            f"PRAGMA {data_token.data_group}.table_info({data_token.table_name});"
+        )
+        return [row[1] for row in cursor.fetchall()]
+
+    def _stage_temp_table(
+        self: Sqlite3Adapter,
+        table_name: str,
+        column_defs: list[str],
+        data_rows: Iterable[tuple],
+    ) -> str:
+        staged = f"temp.{table_name}"
+        schema = ", ".join(column_defs)
+        self._connection.execute(f"DROP TABLE IF EXISTS {staged};")
+        self._connection.execute(
+            SqlStatement().CREATE_TABLE(staged, schema).compile()
+        )
+        values = ["?" for _ in column_defs]
+        statement = (
+            SqlStatement().INSERT_ALL(staged).VALUES(values, quote=False).compile()
+        )
+        self._connection.executemany(statement, data_rows)
+        return staged
+
+    def _stage_values(
+        self: Sqlite3Adapter,
+        data_store: T,
+        columns: list[str],
+        alignment_columns: list[str],
+        index: bool = True,
+    ) -> str:
+        dtypes = data_store.dtypes
+        mappings = Sqlite3Type.type_mappings({col: dtypes[col] for col in columns})
+        values = (
+            data_store.to_pandas()[columns]
+            .astype(mappings, errors="ignore")
+            .drop_duplicates(alignment_columns, keep="last")
+        )
+        column_defs = [f"{col} {Sqlite3Type(dtypes[col])}" for col in columns]
+        staged = self._stage_temp_table(
+            "_tanuki_values", column_defs, values.itertuples(index=False, name=None)
+        )
+        if index:
+            statement = SqlStatement().CREATE_INDEX(
+                "key_index", DataToken("_tanuki_values", "temp"), alignment_columns
+            )
+            self._connection.execute(statement.compile())
+        return staged
+
+    def _upsert_from_source(
+        self: Sqlite3Adapter,
+        source: Union[str, DataToken],
+        source_criteria: Optional[str],
+        data_token: DataToken,
+        columns: list[str],
+        alignment_columns: list[str],
+    ) -> UpsertResult:
+        update_columns = [col for col in columns if col not in alignment_columns]
+        alignment_str = " AND ".join(
+            [f"{source}.{col}={data_token}.{col}" for col in alignment_columns]
+        )
+        matches = SqlStatement().SELECT_ALL().FROM(data_token).WHERE(alignment_str)
+        criteria = f"EXISTS({matches.compile(append_colon=False)})"
+        if source_criteria is not None:
+            criteria += f" AND ({source_criteria})"
+        count = SqlStatement().SELECT("COUNT(*)").FROM(source).WHERE(criteria)
+        updated = self._connection.execute(count.compile()).fetchone()[0]
+
+        statement = (
+            SqlStatement()
+            .INSERT_INTO(data_token, *columns)
+            .SELECT(*columns)
+            .FROM(source)
+            .WHERE(source_criteria or "true")
+        )
+        if len(update_columns) > 0:
+            statement.UPDATE_CONFLICTS(alignment_columns, update_columns)
+        else:
+            statement.IGNORE_CONFLICTS(alignment_columns)
+        changes = self._connection.execute(statement.compile()).rowcount
+        if len(update_columns) == 0:
+            return UpsertResult(changes, 0)
+        return UpsertResult(changes - updated, updated)
+
+    def _query_compiler(self: Sqlite3Adapter) -> SqlQueryCompiler:
+        return SqlQueryCompiler(
+            quote=True, stage=self._stage_keys, stage_threshold=self.STAGING_THRESHOLD
+        )
+
+    def _stage_keys(
+        self: Sqlite3Adapter, columns: list[str], data_rows: list[tuple]
+    ) -> str:
+        self._staged_keys += 1
+        return self._stage_temp_table(
+            f"_tanuki_keys_{self._staged_keys}", columns, data_rows
+        )
 
     def _group_table_metadata_path(self, data_token: DataToken) -> Path:
         group_path = self._metadata_dir / data_token.data_group
@@ -364,8 +625,11 @@ class Sqlite3Adapter(DatabaseAdapter):
                 .INSERT_INTO(data_token, *data_store.columns)
                 .SELECT(*data_store.columns)
                 .FROM(link_token)
-                .compile()
             )
+            link_criteria = self._link_criteria(data_store)
+            if link_criteria is not None:
+                statement.WHERE(link_criteria)
+            statement = statement.compile()
 
             self._connection.execute(statement)
         except Exception as e:
@@ -385,27 +649,24 @@ class Sqlite3Adapter(DatabaseAdapter):
         try:
             alignment_columns = [str(col) for col in alignment_columns]
             all_columns = [str(col) for col in data_store.columns]
-            db_alignment_values = ["?" for _ in alignment_columns]
-            update_columns = list(set(all_columns) - set(alignment_columns))
-            update_values = ["?" for _ in update_columns]
+            update_columns = [col for col in all_columns if col not in alignment_columns]
+            if len(update_columns) == 0:
+                return
 
-            query = ColumnQuery(
-                EqualsQuery, AndGroupQuery, alignment_columns, db_alignment_values
-            )
-            compiler = SqlQueryCompiler(quote=False)
-            query = compiler.compile(query)
-            statement = (
-                SqlStatement()
-                .UPDATE_FROM_VALUES(data_token, update_columns, update_values)
-                .WHERE(str(query))
-                .compile()
+            staged = self._stage_values(
+                data_store, alignment_columns + update_columns, alignment_columns
             )
 
-            statement_columns = update_columns + alignment_columns
-            self._connection.executemany(
-                statement,
-                data_store[statement_columns].itertuples(ignore_index=True),
-            )
+            if sqlite3.sqlite_version_info >= self.UPDATE_FROM_VERSION:
+                statement = SqlStatement().UPDATE_FROM(
+                    staged, data_token, update_columns, alignment_columns
+                )
+            else:
+                statement = SqlStatement().UPDATE_FROM_LINK(
+                    staged, data_token, update_columns, alignment_columns
+                )
+            self._connection.execute(statement.compile())
+            self._connection.execute(f"DROP TABLE {staged};")
         except Exception as e:
             raise DatabaseAdapterError("_update_from_values failed", e)
 
@@ -425,7 +686,11 @@ class Sqlite3Adapter(DatabaseAdapter):
             update_columns = list(set(all_columns) - set(alignment_columns))
 
             statement = SqlStatement().UPDATE_FROM_LINK(
-                link_token, data_token, update_columns, alignment_columns
+                link_token,
+                data_token,
+                update_columns,
+                alignment_columns,
+                self._link_criteria(data_store),
             )
 
             self._connection.execute(statement.compile())
@@ -437,30 +702,23 @@ class Sqlite3Adapter(DatabaseAdapter):
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
-    ) -> None:
+    ) -> UpsertResult:
         if data_store.metadata is not None:
             self._update_group_table_metadata(data_token, data_store.metadata)
 
         if self._connection == None:
             raise DatabaseAdapterUsageError("_upsert_from_values")
         try:
-            columns = [str(col) for col in data_store.columns]
-            values = ["?" for _ in range(len(data_store.columns))]
-
             alignment_columns = [str(col) for col in alignment_columns]
-            all_columns = [str(col) for col in data_store.columns]
-            update_columns = list(set(all_columns) - set(alignment_columns))
-            statement = (
-                SqlStatement()
-                .INSERT_INTO(data_token, *columns)
-                .VALUES(values, quote=False)
-                .UPDATE_CONFLICTS(alignment_columns, update_columns)
+            columns = [str(col) for col in data_store.columns]
+            staged = self._stage_values(
+                data_store, columns, alignment_columns, index=False
             )
-
-            self._connection.executemany(
-                statement.compile(),
-                data_store.itertuples(ignore_index=True),
+            result = self._upsert_from_source(
+                staged, None, data_token, columns, alignment_columns
             )
+            self._connection.execute(f"DROP TABLE {staged};")
+            return result
         except Exception as e:
             raise DatabaseAdapterError("_upsert_from_values failed", e)
 
@@ -469,51 +727,358 @@ class Sqlite3Adapter(DatabaseAdapter):
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
-    ) -> None:
+    ) -> UpsertResult:
         if self._connection == None:
             raise DatabaseAdapterUsageError("_upsert_from_link")
         try:
-            link_token = data_store.link_token()
-
             alignment_columns = [str(col) for col in alignment_columns]
-            all_columns = [str(col) for col in data_store.columns]
-            update_columns = list(set(all_columns) - set(alignment_columns))
-
-            statement = (
-                SqlStatement()
-                .INSERT_INTO(data_token, *data_store.columns)
-                .SELECT(*data_store.columns)
-                .FROM(link_token)
-                .WHERE("true")
-                .UPDATE_CONFLICTS(alignment_columns, update_columns)
-                .compile()
+            columns = [str(col) for col in data_store.columns]
+            return self._upsert_from_source(
+                data_store.link_token(),
+                self._link_criteria(data_store),
+                data_token,
+                columns,
+                alignment_columns,
             )
-
-            self._connection.execute(statement)
         except Exception as e:
             raise DatabaseAdapterError("_upsert_from_link failed", e)
 
+    def _link_criteria(self: Sqlite3Adapter, data_store: T) -> Optional[str]:
+        link_query = data_store.link_query()
+        if link_query is None:
+            return None
+        compiler = self._query_compiler()
+        return str(compiler.compile(link_query))
+
     def delete(self: Sqlite3Adapter, data_token: DataToken, criteria: Query) -> None:
         if self._connection == None:
             raise DatabaseAdapterUsageError("delete")
         try:
-            compiler = SqlQueryCompiler(quote=True)
+            compiler = self._query_compiler()
             query = compiler.compile(criteria)
             statement = SqlStatement().DELETE().FROM(data_token).WHERE(query)
+            start = time.perf_counter()
             self._connection.execute(statement.compile())
+            self._record_workload(data_token, criteria, start)
         except Exception as e:
             raise DatabaseAdapterError("delete failed", e)
 
-    def row_count(self: Sqlite3Adapter, data_token: DataToken) -> int:
+    def _delete_keys_from_values(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("_delete_keys_from_values")
+        try:
+            alignment_columns = [str(col) for col in alignment_columns]
+            staged = self._stage_values(
+                keys_store, alignment_columns, alignment_columns, index=False
+            )
+            deleted = self._delete_keys_from_source(
+                staged, None, data_token, alignment_columns
+            )
+            self._connection.execute(f"DROP TABLE {staged};")
+            return deleted
+        except Exception as e:
+            raise DatabaseAdapterError("_delete_keys_from_values failed", e)
+
+    def _delete_keys_from_link(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[str],
+    ) -> int:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("_delete_keys_from_link")
+        try:
+            alignment_columns = [str(col) for col in alignment_columns]
+            return self._delete_keys_from_source(
+                keys_store.link_token(),
+                self._link_criteria(keys_store),
+                data_token,
+                alignment_columns,
+            )
+        except Exception as e:
+            raise DatabaseAdapterError("_delete_keys_from_link failed", e)
+
+    def _delete_keys_from_source(
+        self: Sqlite3Adapter,
+        source: Union[str, DataToken],
+        source_criteria: Optional[str],
+        data_token: DataToken,
+        alignment_columns: list[str],
+    ) -> int:
+        keys = SqlStatement().SELECT(*alignment_columns).FROM(source)
+        if source_criteria is not None:
+            keys.WHERE(source_criteria)
+        columns_str = ", ".join(alignment_columns)
+        statement = (
+            SqlStatement()
+            .DELETE()
+            .FROM(data_token)
+            .WHERE(f"({columns_str}) IN ({keys.compile(append_colon=False)})")
+        )
+        return self._connection.execute(statement.compile()).rowcount
+
+    def _change_log_token(self: Sqlite3Adapter, data_token: DataToken) -> DataToken:
+        return DataToken(
+            f"{data_token.table_name}{self.CHANGE_LOG_SUFFIX}", data_token.data_group
+        )
+
+    def create_change_log(
+        self: Sqlite3Adapter, data_token: DataToken, key_columns: list[str]
+    ) -> None:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("create_change_log")
+        try:
+            change_log = self._change_log_token(data_token)
+            schema = ", ".join(
+                [
+                    "_tanuki_version INTEGER PRIMARY KEY AUTOINCREMENT",
+                    "_tanuki_operation TEXT NOT NULL",
+                    *key_columns,
+                ]
+            )
+            self._connection.execute(
+                SqlStatement().CREATE_TABLE(str(change_log), schema).compile()
+            )
+
+            columns = ", ".join(["_tanuki_operation"] + key_columns)
+
+            def log(operation: str, row: str) -> str:
+                values = [f"'{operation}'"] + [f"{row}.{col}" for col in key_columns]
+                return (
+                    f"INSERT INTO {change_log.table_name} ({columns}) "
+                    f"VALUES ({', '.join(values)})"
+                )
+
+            same_key = " AND ".join([f"OLD.{col} IS NEW.{col}" for col in key_columns])
+            triggers = [
+                ("insert_log", "INSERT", [log("insert", "NEW")], None),
+                ("update_log", "UPDATE", [log("update", "NEW")], same_key),
+                (
+                    "rekey_log",
+                    "UPDATE",
+                    [log("delete", "OLD"), log("insert", "NEW")],
+                    f"NOT ({same_key})",
+                ),
+                ("delete_log", "DELETE", [log("delete", "OLD")], None),
+            ]
+            for name, event, actions, when in triggers:
+                statement = SqlStatement().CREATE_TRIGGER(
+                    name, event, data_token, actions, when
+                )
+                self._connection.execute(statement.compile())
+        except Exception as e:
+            raise DatabaseAdapterError("create_change_log failed", e)
+
+    def drop_change_log(self: Sqlite3Adapter, data_token: DataToken) -> None:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("drop_change_log")
+        try:
+            for name in ["insert_log", "update_log", "rekey_log", "delete_log"]:
+                self._connection.execute(
+                    f"DROP TRIGGER IF EXISTS {data_token}_{name};"
+                )
+            change_log = self._change_log_token(data_token)
+            self._connection.execute(f"DROP TABLE IF EXISTS {change_log};")
+        except Exception as e:
+            raise DatabaseAdapterError("drop_change_log failed", e)
+
+    def has_change_log(self: Sqlite3Adapter, data_token: DataToken) -> bool:
+        return self.has_group_table(self._change_log_token(data_token))
+
+    def change_log_keys(self: Sqlite3Adapter, data_token: DataToken) -> list[str]:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("change_log_keys")
+        try:
+            columns = self._table_columns(self._change_log_token(data_token))
+            return [col for col in columns if col not in self.CHANGE_COLUMNS]
+        except Exception as e:
+            raise DatabaseAdapterError("change_log_keys failed", e)
+
+    def change_version(self: Sqlite3Adapter, data_token: DataToken) -> int:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("change_version")
+        try:
+            change_log = self._change_log_token(data_token)
+            statement = (
+                SqlStatement()
+                .SELECT("seq")
+                .FROM(f"{data_token.data_group}.sqlite_sequence")
+                .WHERE(f"name='{change_log.table_name}'")
+            )
+            row = self._connection.execute(statement.compile()).fetchone()
+            return 0 if row is None else row[0]
+        except Exception as e:
+            raise DatabaseAdapterError("change_version failed", e)
+
+    def read_changes(
+        self: Sqlite3Adapter, data_token: DataToken, version: int
+    ) -> list[tuple]:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("read_changes")
+        try:
+            statement = (
+                SqlStatement()
+                .SELECT_ALL()
+                .FROM(self._change_log_token(data_token))
+                .WHERE(f"_tanuki_version > {int(version)}")
+                .ORDER_BY("_tanuki_version", ascending=True)
+            )
+            return self._connection.execute(statement.compile()).fetchall()
+        except Exception as e:
+            raise DatabaseAdapterError("read_changes failed", e)
+
+    def set_workload_recorder(
+        self: Sqlite3Adapter, recorder: Optional[WorkloadRecorder]
+    ) -> None:
+        self._workload_recorder = recorder
+
+    def _record_workload(
+        self: Sqlite3Adapter, data_token: DataToken, query: Optional[Query], start: float
+    ) -> None:
+        if (
+            self._workload_recorder is not None
+            and query is not None
+            and data_token.data_group != PROTECTED_GROUP
+        ):
+            self._workload_recorder.record(
+                data_token, query, time.perf_counter() - start
+            )
+
+    def row_count(
+        self: Sqlite3Adapter, data_token: DataToken, query: Optional[Query] = None
+    ) -> int:
         if self._connection == None:
             raise DatabaseAdapterUsageError("row_count")
         try:
             statement = SqlStatement().SELECT().COUNT().FROM(data_token)
+            if query is not None:
+                compiler = self._query_compiler()
+                statement.WHERE(str(compiler.compile(query)))
             cursor = self._connection.execute(statement.compile())
             return cursor.fetchone()[0]
         except Exception as e:
             raise DatabaseAdapterError("row_count failed", e)
 
+    def sort_positions(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        order_by: list[str],
+        ascending: Union[bool, list[bool]] = True,
+        query: Optional[Query] = None,
+        limit: Optional[int] = None,
+    ) -> list[int]:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("sort_positions")
+        try:
+            if type(ascending) is not list:
+                ascending = [ascending for _ in order_by]
+            position = "ROW_NUMBER() OVER (ORDER BY rowid) - 1 AS _tanuki_position"
+            positions = SqlStatement().SELECT(*order_by, position).FROM(str(data_token))
+            if query is not None:
+                compiler = self._query_compiler()
+                positions.WHERE(str(compiler.compile(query)))
+            statement = (
+                SqlStatement()
+                .SELECT("_tanuki_position")
+                .FROM(f"({positions.compile(append_colon=False)})")
+                .ORDER_BY(*order_by, "_tanuki_position", ascending=ascending + [True])
+            )
+            if limit is not None:
+                statement.LIMIT(limit)
+            start = time.perf_counter()
+            cursor = self._connection.execute(statement.compile())
+            data_rows = cursor.fetchall()
+            self._record_workload(data_token, query, start)
+            return [row[0] for row in data_rows]
+        except Exception as e:
+            raise DatabaseAdapterError("sort_positions failed", e)
+
+    def aggregate(
+        self: Sqlite3Adapter,
+        data_token: DataToken,
+        aggregations: dict[str, list[str]],
+        group_by: list[str],
+        query: Optional[Query] = None,
+    ) -> list[tuple]:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("aggregate")
+        try:
+            selections = list(group_by)
+            for column, functions in aggregations.items():
+                for function in functions:
+                    expression = Sqlite3Adapter.AGGREGATE_FUNCTIONS[function]
+                    selections.append(
+                        f"{expression.format(column)} AS {result_column(column, function)}"
+                    )
+            statement = SqlStatement().SELECT(*selections).FROM(str(data_token))
+            if query is not None:
+                compiler = self._query_compiler()
+                statement.WHERE(str(compiler.compile(query)))
+            if len(group_by) > 0:
+                statement.GROUP_BY(*group_by)
+                statement.ORDER_BY(*group_by, ascending=True)
+            cursor = self._connection.execute(statement.compile())
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseAdapterError("aggregate failed", e)
+
+    def join(
+        self: Sqlite3Adapter,
+        left_token: DataToken,
+        right_token: DataToken,
+        on: list[str],
+        how: str,
+        left_query: Optional[Query],
+        right_query: Optional[Query],
+        left_columns: list[str],
+        right_columns: list[str],
+    ) -> list[tuple]:
+        if self._connection == None:
+            raise DatabaseAdapterUsageError("join")
+        try:
+            sources = []
+            for alias, data_token, query in [
+                ("l", left_token, left_query),
+                ("r", right_token, right_query),
+            ]:
+                source = SqlStatement().SELECT("rowid AS _tanuki_rowid", "*")
+                source.FROM(str(data_token))
+                if query is not None:
+                    compiler = self._query_compiler()
+                    source.WHERE(str(compiler.compile(query)))
+                sources.append(f"({source.compile(append_colon=False)}) AS {alias}")
+
+            selections = []
+            for name, side, column in join_columns(left_columns, right_columns, on):
+                if side == "left" and column in on:
+                    selections.append(f"COALESCE(l.{column}, r.{column}) AS {name}")
+                else:
+                    selections.append(f"{side[0]}.{column} AS {name}")
+            condition = " AND ".join([f"l.{col} = r.{col}" for col in on])
+
+            if how == "right":
+                order = ["r._tanuki_rowid", "l._tanuki_rowid"]
+            elif how == "outer":
+                order = list(on) + ["l._tanuki_rowid", "r._tanuki_rowid"]
+            else:
+                order = ["l._tanuki_rowid", "r._tanuki_rowid"]
+            statement = (
+                SqlStatement()
+                .SELECT(*selections)
+                .FROM(sources[0])
+                .JOIN(sources[1], condition, Sqlite3Adapter.JOIN_TYPES[how])
+                .ORDER_BY(*order, ascending=True)
+            )
+            cursor = self._connection.execute(statement.compile())
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseAdapterError("join failed", e)
+
     def stop(self: "Sqlite3Adapter") -> None:
         if self._enter_calls > 0:
             self._enter_calls = 0
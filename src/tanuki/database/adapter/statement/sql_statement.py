@@ -27,6 +27,12 @@ class SqlStatement:
         self._commands.append(f"FROM {str(source)}")
         return self
 
+    def JOIN(
+        self: "SqlStatement", source: str, condition: str, join_type: str = "INNER"
+    ) -> "SqlStatement":
+        self._commands.append(f"{join_type} JOIN {str(source)} ON {condition}")
+        return self
+
     def INSERT_INTO(
         self: "SqlStatement",
         data_token: DataToken,
@@ -75,12 +81,15 @@ class SqlStatement:
         target_token: Union[str, DataToken],
         update_columns: list[str],
         alignment_columns: list[str],
+        source_criteria: Optional[str] = None,
     ) -> "SqlStatement":
         cols = [str(col) for col in update_columns]
         
         cols_str = ",".join(cols)
         table_cols = [f"{source_token}.{col}" for col in cols]
-        alignment_str = ",".join([f"{source_token}.{col}={target_token}.{col}" for col in alignment_columns])
+        alignment_str = " AND ".join([f"{source_token}.{col}={target_token}.{col}" for col in alignment_columns])
+        if source_criteria is not None:
+            alignment_str += f" AND ({source_criteria})"
         sub_statement = SqlStatement().SELECT(*table_cols).FROM(source_token).WHERE(alignment_str).compile(append_colon=False)
 
         self._commands.append(f"UPDATE {target_token} SET ({cols_str}) = ({sub_statement})")
@@ -88,6 +97,19 @@ class SqlStatement:
         self.WHERE(f"EXISTS({sub_statement2})")
         return self
 
+    def UPDATE_FROM(
+        self: "SqlStatement",
+        source_token: Union[str, DataToken],
+        target_token: Union[str, DataToken],
+        update_columns: list[str],
+        alignment_columns: list[str],
+    ) -> "SqlStatement":
+        col_str = ", ".join([f"{col}={source_token}.{col}" for col in update_columns])
+        alignment_str = " AND ".join([f"{source_token}.{col}={target_token}.{col}" for col in alignment_columns])
+        self._commands.append(f"UPDATE {target_token} SET {col_str} FROM {source_token}")
+        self.WHERE(alignment_str)
+        return self
+
     def UPDATE_FROM_VALUES(
         self: "SqlStatement",
         target_token: Union[str, DataToken],
@@ -110,7 +132,7 @@ class SqlStatement:
         
         cols_str = ",".join(cols)
         table_cols = [f"{source_token}.{col}" for col in cols]
-        alignment_str = ",".join([f"{source_token}.{col}={target_token}.{col}" for col in alignment_columns])
+        alignment_str = " AND ".join([f"{source_token}.{col}={target_token}.{col}" for col in alignment_columns])
         sub_statement = SqlStatement().SELECT(*table_cols).FROM(source_token).WHERE(alignment_str).compile(append_colon=False)
 
         self._commands.append(f"UPDATE {target_token} SET ({cols_str}) = ({sub_statement})")
@@ -146,9 +168,35 @@ class SqlStatement:
         )
         return self
 
-    def CREATE_INDEX(self: "SqlStatement", index_name: str, data_token: DataToken, column_list: list[str]) -> "SqlStatement":
+    def CREATE_INDEX(
+        self: "SqlStatement",
+        index_name: str,
+        data_token: DataToken,
+        column_list: list[str],
+        unique: bool = True,
+        where: Optional[str] = None,
+    ) -> "SqlStatement":
         col_str = ",".join(column_list)
-        self._commands.append(f"CREATE UNIQUE INDEX {data_token.data_group}.{data_token.table_name}_{index_name} ON {data_token.table_name} ({col_str})")
+        index_type = "UNIQUE INDEX" if unique else "INDEX"
+        command = f"CREATE {index_type} {data_token.data_group}.{data_token.table_name}_{index_name} ON {data_token.table_name} ({col_str})"
+        if where is not None:
+            command += f" WHERE {where}"
+        self._commands.append(command)
+        return self
+
+    def CREATE_TRIGGER(
+        self: "SqlStatement",
+        trigger_name: str,
+        event: str,
+        data_token: DataToken,
+        actions: list[str],
+        when: Optional[str] = None,
+    ) -> "SqlStatement":
+        command = f"CREATE TRIGGER {data_token.data_group}.{data_token.table_name}_{trigger_name} AFTER {event} ON {data_token.table_name}"
+        if when is not None:
+            command += f" WHEN {when}"
+        actions_str = " ".join([f"{action};" for action in actions])
+        self._commands.append(f"{command} BEGIN {actions_str} END")
         return self
 
     def ATTACH_DATABASE(self: "SqlStatement", file_path: str, data_group: str) -> "SqlStatement":
@@ -208,14 +256,16 @@ class SqlStatement:
         self._commands.append(f"LIMIT {limit}")
         return self
 
+    def OFFSET(self: "SqlStatement", offset: int) -> "SqlStatement":
+        self._commands.append(f"OFFSET {offset}")
+        return self
+
     def ORDER_BY(
         self: "SqlStatement",
         *columns: str,
         ascending: Union[bool, List[bool]],
     ) -> "SqlStatement":
-        col_list: List[str] = (
-            [str(col) for col in columns] if type(columns) is list else [str(columns)]
-        )
+        col_list: List[str] = [str(col) for col in columns]
         asc_list: List[bool] = (
             cast(List[bool], ascending)
             if type(ascending) is list
@@ -307,6 +357,14 @@ class SqlStatement:
         self._commands.append(f"ON CONFLICT ({unique_str}) DO UPDATE SET {col_str}")
         return self
 
+    def IGNORE_CONFLICTS(
+        self: "SqlStatement",
+        unique_columns: List[str],
+    ) -> "SqlStatement":
+        unique_str = ", ".join([str(col) for col in unique_columns])
+        self._commands.append(f"ON CONFLICT ({unique_str}) DO NOTHING")
+        return self
+
     def compile(self: "SqlStatement", append_colon: bool = True) -> str:
         result = " ".join(self._commands)
         if append_colon:
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.index.index_alias import IndexAlias
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    AndQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterEqualQuery,
+    GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
+    LessEqualQuery,
+    LessThanQuery,
+    Query,
+    RowInQuery,
+    StartsWithQuery,
+)
+from tanuki.database.data_token import DataToken
+
+EQUALITY_QUERIES = (EqualsQuery, InQuery, IsNullQuery)
+RANGE_QUERIES = (
+    GreaterThanQuery,
+    GreaterEqualQuery,
+    LessThanQuery,
+    LessEqualQuery,
+    BetweenQuery,
+    StartsWithQuery,
+)
+
+
+@dataclass(frozen=True)
+class PredicateShape:
+    equality: frozenset[str]
+    ranges: frozenset[str]
+
+    @staticmethod
+    def from_query(query: Query) -> Optional[PredicateShape]:
+        equality: set[str] = set()
+        ranges: set[str] = set()
+
+        def collect(item: Any) -> None:
+            if isinstance(item, AndQuery):
+                collect(item.a)
+                collect(item.b)
+            elif isinstance(item, AndGroupQuery):
+                for sub_item in item.items:
+                    collect(sub_item)
+            elif isinstance(item, RowInQuery):
+                equality.update(
+                    str(column) for column in item.a if _is_column(column)
+                )
+            elif isinstance(item, EQUALITY_QUERIES) and _is_column(item.a):
+                equality.add(str(item.a))
+            elif isinstance(item, RANGE_QUERIES) and _is_column(item.a):
+                ranges.add(str(item.a))
+
+        collect(query)
+        ranges -= equality
+        if len(equality) == 0 and len(ranges) == 0:
+            return None
+        return PredicateShape(frozenset(equality), frozenset(ranges))
+
+
+def _is_column(parameter: Any) -> bool:
+    return type(parameter) is ColumnAlias or type(parameter) is str
+
+
+@dataclass
+class PredicateStats:
+    data_token: DataToken
+    shape: PredicateShape
+    sample: Query
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self: PredicateStats) -> float:
+        return self.total_seconds / self.count if self.count > 0 else 0.0
+
+
+@dataclass
+class IndexRecommendation:
+    data_token: DataToken
+    columns: list[str]
+    queries: int = 0
+    estimated_benefit: float = 0.0
+    shapes: list[PredicateShape] = field(default_factory=list)
+
+    @property
+    def index_name(self: IndexRecommendation) -> str:
+        return f"{'_'.join(self.columns)}_advised_index"
+
+    def index_alias(self: IndexRecommendation, columns: dict[str, ColumnAlias]) -> IndexAlias:
+        return IndexAlias(
+            self.index_name, [columns[column] for column in self.columns], unique=False
+        )
+
+    def __str__(self: IndexRecommendation) -> str:
+        return (
+            f"{self.data_token}: INDEX {self.index_name} ({', '.join(self.columns)}) "
+            f"serves {self.queries} queries, estimated benefit {self.estimated_benefit:.6f}s"
+        )
+
+
+class WorkloadRecorder:
+    _stats: dict[tuple[DataToken, PredicateShape], PredicateStats]
+
+    def __init__(self) -> None:
+        self._stats = {}
+
+    def record(
+        self: WorkloadRecorder, data_token: DataToken, query: Query, seconds: float
+    ) -> None:
+        shape = PredicateShape.from_query(query)
+        if shape is None:
+            return
+        key = (data_token, shape)
+        if key not in self._stats:
+            self._stats[key] = PredicateStats(data_token, shape, query)
+        stats = self._stats[key]
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def stats(
+        self: WorkloadRecorder, data_token: Optional[DataToken] = None
+    ) -> list[PredicateStats]:
+        return [
+            stats
+            for (token, _), stats in self._stats.items()
+            if data_token is None or token == data_token
+        ]
+
+    def data_tokens(self: WorkloadRecorder) -> list[DataToken]:
+        return list(dict.fromkeys(token for token, _ in self._stats.keys()))
+
+    def clear(self: WorkloadRecorder, data_token: Optional[DataToken] = None) -> None:
+        for key in list(self._stats.keys()):
+            if data_token is None or key[0] == data_token:
+                del self._stats[key]
+
+    def recommend(
+        self: WorkloadRecorder,
+        data_token: DataToken,
+        is_full_scan: Callable[[Query], bool],
+        min_queries: int = 1,
+    ) -> list[IndexRecommendation]:
+        workload = [
+            stats for stats in self.stats(data_token) if is_full_scan(stats.sample)
+        ]
+        frequency: Counter[str] = Counter()
+        for stats in workload:
+            for column in stats.shape.equality:
+                frequency[column] += stats.count
+
+        candidates: dict[tuple[str, ...], IndexRecommendation] = {}
+        for stats in workload:
+            columns = self._index_columns(stats.shape, frequency)
+            if columns not in candidates:
+                candidates[columns] = IndexRecommendation(data_token, list(columns))
+            self._serve(candidates[columns], stats)
+
+        for columns in sorted(candidates.keys(), key=len, reverse=True):
+            if columns not in candidates:
+                continue
+            for prefix in list(candidates.keys()):
+                if len(prefix) < len(columns) and columns[: len(prefix)] == prefix:
+                    served = candidates.pop(prefix)
+                    candidates[columns].queries += served.queries
+                    candidates[columns].estimated_benefit += served.estimated_benefit
+                    candidates[columns].shapes.extend(served.shapes)
+
+        recommendations = [
+            candidate
+            for candidate in candidates.values()
+            if candidate.queries >= min_queries
+        ]
+        return sorted(
+            recommendations, key=lambda candidate: candidate.estimated_benefit, reverse=True
+        )
+
+    @staticmethod
+    def _index_columns(shape: PredicateShape, frequency: Counter[str]) -> tuple[str, ...]:
+        equality = sorted(shape.equality, key=lambda column: (-frequency[column], column))
+        ranges = sorted(shape.ranges)
+        return tuple(equality + ranges[:1])
+
+    @staticmethod
+    def _serve(recommendation: IndexRecommendation, stats: PredicateStats) -> None:
+        recommendation.queries += stats.count
+        recommendation.estimated_benefit += stats.total_seconds
+        recommendation.shapes.append(stats.shape)
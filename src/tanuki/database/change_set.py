@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Generic, TYPE_CHECKING, TypeVar
+
+from .data_token import DataToken
+
+if TYPE_CHECKING:
+    from tanuki.data_store.data_store import DataStore
+
+T = TypeVar("T", bound="DataStore")
+
+
+@dataclass
+class ChangeSet(Generic[T]):
+    data_token: DataToken
+    since_version: int
+    version: int
+    inserted: T
+    updated: T
+    deleted: T
+
+    def is_empty(self: ChangeSet) -> bool:
+        return len(self.inserted) == 0 and len(self.updated) == 0 and len(self.deleted) == 0
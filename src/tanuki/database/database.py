@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from types import TracebackType
-from typing import Any, cast, Optional, Type, TYPE_CHECKING, TypeVar
+import warnings
+from typing import Any, cast, Generator, Optional, Type, TYPE_CHECKING, TypeVar, Union
 
+from pandas import DataFrame, Series
+
+from tanuki.data_store.aggregation import result_columns
 from tanuki.data_store.column_alias import ColumnAlias
-from tanuki.data_store.data_type import DataType
+from tanuki.data_store.data_type import Boolean, DataType
+from tanuki.data_store.index.index_alias import IndexAlias
+from tanuki.data_store.join import join_columns
 from tanuki.data_store.metadata import Metadata
 from tanuki.data_store.query import Query
 
 from .adapter.database_adapter import DatabaseAdapter
+from .adapter.query_plan import QueryPlan
+from .adapter.query.query_optimizer import QueryOptimizer
+from .adapter.upsert_result import UpsertResult
+from .adapter.workload_recorder import (
+    IndexRecommendation,
+    PredicateStats,
+    WorkloadRecorder,
+)
+from .change_set import ChangeSet
 from .data_token import DataToken
 from .database_registrar import DatabaseRegistrar
-from .db_exceptions import MissingTableError
+from .database_writer import DatabaseWriter
+from .db_exceptions import FullScanError, FullScanWarning, MissingTableError
+from .result_cache import ResultCache
 
 if TYPE_CHECKING:
+    from tanuki.data_backend.database_backend import DatabaseBackend
     from tanuki.data_store.data_store import DataStore
 
 T = TypeVar("T", bound="DataStore")
@@ -22,20 +41,36 @@ M = TypeVar("M", bound="Metadata")
 class Database:
     _db_adapter: DatabaseAdapter
     _registrar: DatabaseRegistrar
-
-    def __init__(self, database_adapter: DatabaseAdapter) -> None:
+    _result_cache: ResultCache
+    _query_optimizer: QueryOptimizer
+    _full_scan_limit: Optional[int]
+    _full_scan_strict: bool
+    _workload_recorder: Optional[WorkloadRecorder]
+
+    def __init__(
+        self,
+        database_adapter: DatabaseAdapter,
+        result_cache_bytes: int = ResultCache.DEFAULT_BUDGET,
+    ) -> None:
         self._db_adapter = database_adapter
         self._registrar = DatabaseRegistrar(database_adapter)
+        self._result_cache = ResultCache(result_cache_bytes)
+        self._query_optimizer = QueryOptimizer()
+        self._full_scan_limit = None
+        self._full_scan_strict = True
+        self._workload_recorder = None
 
-    def table_columns(self, data_token: DataToken) -> list[str]:
+    def table_store_type(self, data_token: DataToken) -> Type[DataStore]:
         with self._db_adapter:
-            col_ids = self._registrar.store_type(data_token).columns
-            return [str(col_id) for col_id in col_ids]
+            return self._registrar.store_type(data_token)
+
+    def table_columns(self, data_token: DataToken) -> list[str]:
+        col_ids = self.table_store_type(data_token).columns
+        return [str(col_id) for col_id in col_ids]
 
     def table_dtypes(self, data_token: DataToken) -> dict[str, DataType]:
-        with self._db_adapter:
-            store_class = self._registrar.store_type(data_token)
-            return {column.name: column.dtype for column in store_class.columns}
+        store_class = self.table_store_type(data_token)
+        return {column.name: column.dtype for column in store_class.columns}
 
     def has_table(self, data_token: DataToken) -> bool:
         with self._db_adapter:
@@ -63,21 +98,280 @@ class Database:
         data_token: DataToken,
         query: Optional[Query] = None,
         columns: Optional[list[ColumnAlias]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[ColumnAlias]] = None,
+        ascending: Union[bool, list[bool]] = True,
     ) -> T:
+        query = self._query_optimizer.optimize(query)
+        if query is not None and self._full_scan_limit is not None:
+            self._check_full_scan(data_token, query, columns, order_by, ascending)
         with self._db_adapter:
+            columns = [str(col) for col in columns] if columns is not None else None
+            if order_by is not None:
+                order_by = [str(col) for col in order_by]
+            window = (
+                offset,
+                limit,
+                None if rows is None else tuple(rows),
+                None if order_by is None else tuple(order_by),
+                tuple(ascending) if type(ascending) is list else ascending,
+            )
+            cache_key = None
+            if self._result_cache.max_bytes > 0:
+                cache_key = self._result_cache.key(data_token, query, columns, window)
+                store = self._result_cache.get(cache_key)
+                if store is not None:
+                    return cast(store_type, store)
+
             if not self.has_table(data_token):
                 raise MissingTableError(data_token)
-            columns = [str(col) for col in columns] if columns is not None else None
-            table_data = self._db_adapter.query(data_token, query, columns)
-            store_class: Type[T] = self._registrar.store_type(data_token)
+            store = self._read_store(
+                data_token, query, columns, offset, limit, rows, order_by, ascending
+            )
+            if cache_key is not None:
+                self._result_cache.put(cache_key, store)
+            return cast(store_type, store)
+
+    def _read_store(
+        self: Database,
+        data_token: DataToken,
+        query: Optional[Query],
+        columns: Optional[list[str]],
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> T:
+        table_data = self._db_adapter.query(
+            data_token,
+            query,
+            columns,
+            offset=offset,
+            limit=limit,
+            rows=rows,
+            order_by=order_by,
+            ascending=ascending,
+        )
+        store_class: Type[T] = self._registrar.store_type(data_token)
+        metadata = self._table_metadata(data_token)
+        return store_class.from_rows(table_data, columns=columns, metadata=metadata)
+
+    @contextmanager
+    def transaction(self: Database) -> Generator[Database, None, None]:
+        with self._db_adapter:
+            yield self
+
+    def writer(
+        self: Database,
+        max_queue: int = DatabaseWriter.DEFAULT_QUEUE_SIZE,
+        max_batch: int = DatabaseWriter.DEFAULT_BATCH_SIZE,
+        max_delay: float = DatabaseWriter.DEFAULT_MAX_DELAY,
+    ) -> DatabaseWriter:
+        return DatabaseWriter(self, max_queue, max_batch, max_delay)
+
+    def table_version(self: Database, data_token: DataToken) -> int:
+        return self._result_cache.version(data_token)
+
+    def enable_change_log(
+        self: Database, data_token: DataToken, index: Optional[IndexAlias] = None
+    ) -> None:
+        with self._db_adapter:
+            if not self._registrar.has_table(data_token):
+                raise MissingTableError(data_token)
+            if self._db_adapter.has_change_log(data_token):
+                return
+            if index is None:
+                store_type = self._registrar.store_type(data_token)
+                keys = [
+                    index
+                    for index in store_type.indices
+                    if index.unique and index.where is None
+                ]
+                if len(keys) == 0:
+                    raise ValueError(
+                        f"{store_type.__name__} has no unique Index to key the "
+                        f"change log of {data_token}"
+                    )
+                index = keys[0]
+            key_columns = [str(col) for col in index.columns]
+            self._db_adapter.create_change_log(data_token, key_columns)
+
+    def disable_change_log(self: Database, data_token: DataToken) -> None:
+        with self._db_adapter:
+            self._db_adapter.drop_change_log(data_token)
+
+    def has_change_log(self: Database, data_token: DataToken) -> bool:
+        with self._db_adapter:
+            return self._db_adapter.has_change_log(data_token)
+
+    def change_version(self: Database, data_token: DataToken) -> int:
+        with self._db_adapter:
+            return self._db_adapter.change_version(data_token)
+
+    def changes_since(
+        self: Database, data_token: DataToken, version: int = 0
+    ) -> ChangeSet:
+        with self._db_adapter:
+            if not self._db_adapter.has_change_log(data_token):
+                raise MissingTableError(data_token)
+            store_class = self._registrar.store_type(data_token)
+            key_columns = self._db_adapter.change_log_keys(data_token)
+            changes = DataFrame.from_records(
+                self._db_adapter.read_changes(data_token, version),
+                columns=["version", "operation", *key_columns],
+            )
+            latest = self._db_adapter.change_version(data_token)
+
+        operations = changes.groupby(key_columns, sort=False, dropna=False)["operation"]
+        existed = operations.first() != "insert"
+        exists = operations.last() != "delete"
+
+        def key_store(mask: Series) -> T:
+            keys = mask.index[mask.to_numpy(dtype=bool)].to_frame(index=False)
+            rows = list(keys.itertuples(index=False, name=None))
+            return store_class.from_rows(rows, columns=key_columns)
+
+        return ChangeSet(
+            data_token,
+            version,
+            max(latest, version),
+            key_store(~existed & exists),
+            key_store(existed & exists),
+            key_store(existed & ~exists),
+        )
+
+    def explain(
+        self: Database,
+        data_token: DataToken,
+        query: Optional[Query] = None,
+        columns: Optional[list[ColumnAlias]] = None,
+        order_by: Optional[list[ColumnAlias]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> QueryPlan:
+        query = self._query_optimizer.optimize(query)
+        columns = [str(col) for col in columns] if columns is not None else None
+        if order_by is not None:
+            order_by = [str(col) for col in order_by]
+        with self._db_adapter:
+            if not self.has_table(data_token):
+                raise MissingTableError(data_token)
+            return self._db_adapter.explain(
+                data_token, query, columns, order_by, ascending
+            )
+
+    def set_full_scan_limit(
+        self: Database, max_rows: Optional[int], strict: bool = True
+    ) -> None:
+        self._full_scan_limit = max_rows
+        self._full_scan_strict = strict
+
+    def _check_full_scan(
+        self: Database,
+        data_token: DataToken,
+        query: Query,
+        columns: Optional[list[ColumnAlias]],
+        order_by: Optional[list[ColumnAlias]],
+        ascending: Union[bool, list[bool]],
+    ) -> None:
+        with self._db_adapter:
+            if not self.has_table(data_token):
+                return
+            plan = self.explain(data_token, query, columns, order_by, ascending)
+            if len(plan.full_scans(str(data_token))) == 0:
+                return
+            row_count = self._db_adapter.row_count(data_token)
+        if row_count <= self._full_scan_limit:
+            return
+        if self._full_scan_strict:
+            raise FullScanError(data_token, row_count, plan.statement)
+        warnings.warn(
+            str(FullScanError(data_token, row_count, plan.statement)), FullScanWarning
+        )
+
+    def record_workload(self: Database, enabled: bool = True) -> None:
+        if enabled and self._workload_recorder is None:
+            self._workload_recorder = WorkloadRecorder()
+        elif not enabled:
+            self._workload_recorder = None
+        self._db_adapter.set_workload_recorder(self._workload_recorder)
+
+    def workload(
+        self: Database, data_token: Optional[DataToken] = None
+    ) -> list[PredicateStats]:
+        if self._workload_recorder is None:
+            return []
+        return self._workload_recorder.stats(data_token)
+
+    def recommend_indexes(
+        self: Database, min_queries: int = 1, apply: bool = False
+    ) -> list[IndexRecommendation]:
+        if self._workload_recorder is None:
+            return []
+        recommendations = []
+        with self._db_adapter:
+            for data_token in self._workload_recorder.data_tokens():
+                if not self.has_table(data_token):
+                    continue
+
+                def is_full_scan(query: Query) -> bool:
+                    plan = self._db_adapter.explain(data_token, query)
+                    return len(plan.full_scans(str(data_token))) > 0
+
+                recommendations.extend(
+                    self._workload_recorder.recommend(
+                        data_token, is_full_scan, min_queries
+                    )
+                )
+            if apply:
+                for recommendation in recommendations:
+                    self.apply_index_recommendation(recommendation)
+        return sorted(
+            recommendations,
+            key=lambda recommendation: recommendation.estimated_benefit,
+            reverse=True,
+        )
+
+    def apply_index_recommendation(
+        self: Database, recommendation: IndexRecommendation
+    ) -> None:
+        data_token = recommendation.data_token
+        with self._db_adapter:
+            if not self._registrar.has_table(data_token):
+                raise MissingTableError(data_token)
+            columns = {
+                str(column): column
+                for column in self._registrar.store_type(data_token).columns
+            }
+            index = recommendation.index_alias(columns)
+            self._registrar.register_index(data_token, index)
+
+    def set_result_cache_budget(self: Database, max_bytes: int) -> None:
+        self._result_cache.max_bytes = max_bytes
+
+    def caches_results(self: Database) -> bool:
+        return self._result_cache.max_bytes > 0
+
+    def clear_result_cache(self: Database) -> None:
+        self._result_cache.clear()
+
+    def _table_metadata(self: Database, data_token: DataToken) -> Optional[M]:
+        with self._db_adapter:
             metadata_class: Type[M] = self._registrar.metadata_class(data_token)
+            if metadata_class is None:
+                return None
+            return self._db_adapter.get_group_table_metadata(data_token, metadata_class)
 
-            metadata: Optional[M] = None
-            if metadata_class is not None:
-                metadata = self._db_adapter.get_group_table_metadata(data_token, metadata_class)
+    def link_backend(
+        self: Database, store_type: Type[T], data_token: DataToken, read_only: bool = True
+    ) -> DatabaseBackend[T]:
+        from tanuki.data_backend.database_backend import DatabaseBackend
 
-            store = store_class.from_rows(table_data, columns=columns, metadata=metadata)
-            return cast(store_type, store)
+        return DatabaseBackend[T](
+            store_type, self, data_token, read_only=read_only
+        )
 
     def create_table(self: Database, data_token: DataToken, store_type: Type[T]) -> None:
         with self._db_adapter:
@@ -90,7 +384,10 @@ class Database:
         with self._db_adapter:
             if not self._registrar.has_table(data_token):
                 self._registrar.create_table(data_token, data_store.__class__)
-            self._db_adapter.insert(data_token, data_store)
+            try:
+                self._db_adapter.insert(data_token, data_store)
+            finally:
+                self._result_cache.invalidate(data_token)
 
     def update(
         self: Database,
@@ -102,33 +399,63 @@ class Database:
             if not self._registrar.has_table(data_token):
                 raise MissingTableError(data_token)
             columns = [str(col) for col in alignment_columns]
-            self._db_adapter.update(data_token, data_store, columns)
+            try:
+                self._db_adapter.update(data_token, data_store, columns)
+            finally:
+                self._result_cache.invalidate(data_token)
 
     def upsert(
         self: Database,
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[ColumnAlias],
-    ) -> None:
+    ) -> UpsertResult:
         with self._db_adapter:
             if not self._registrar.has_table(data_token):
                 raise MissingTableError(data_token)
             columns = [str(col) for col in alignment_columns]
-            self._db_adapter.upsert(data_token, data_store, columns)
+            try:
+                return self._db_adapter.upsert(data_token, data_store, columns)
+            finally:
+                self._result_cache.invalidate(data_token)
 
     def delete(self: Database, data_token: DataToken, criteria: Query) -> None:
         with self._db_adapter:
             if not self._registrar.has_table(data_token):
                 raise MissingTableError(data_token)
-            self._db_adapter.delete(data_token, criteria)
+            try:
+                self._db_adapter.delete(data_token, criteria)
+            finally:
+                self._result_cache.invalidate(data_token)
+
+    def delete_keys(
+        self: Database,
+        data_token: DataToken,
+        keys_store: T,
+        alignment_columns: list[ColumnAlias],
+    ) -> int:
+        with self._db_adapter:
+            if not self._registrar.has_table(data_token):
+                raise MissingTableError(data_token)
+            columns = [str(col) for col in alignment_columns]
+            try:
+                return self._db_adapter.delete_keys(data_token, keys_store, columns)
+            finally:
+                self._result_cache.invalidate(data_token)
 
     def drop_table(self: Database, data_token: DataToken) -> None:
         with self._db_adapter:
-            self._registrar.drop_table(data_token)
+            try:
+                self._registrar.drop_table(data_token)
+            finally:
+                self._result_cache.invalidate(data_token)
 
     def drop_group(self: Database, data_group: str) -> None:
         with self._db_adapter:
-            self._registrar.drop_group(data_group)
+            try:
+                self._registrar.drop_group(data_group)
+            finally:
+                self._result_cache.invalidate_group(data_group)
 
     def copy_table(
         self: Database,
@@ -136,7 +463,10 @@ class Database:
         target_data_token: DataToken,
     ) -> None:
         with self._db_adapter:
-            self._registrar.copy_table(source_data_token, target_data_token)
+            try:
+                self._registrar.copy_table(source_data_token, target_data_token)
+            finally:
+                self._result_cache.invalidate(target_data_token)
 
     def move_table(
         self: Database,
@@ -144,7 +474,10 @@ class Database:
         target_data_token: DataToken,
     ) -> None:
         with self._db_adapter:
-            self._registrar.copy_table(source_data_token, target_data_token)
+            try:
+                self._registrar.copy_table(source_data_token, target_data_token)
+            finally:
+                self._result_cache.invalidate(target_data_token)
 
     def copy_group(
         self: Database,
@@ -152,7 +485,10 @@ class Database:
         target_data_token: DataToken,
     ) -> None:
         with self._db_adapter:
-            self._registrar.copy_table(source_data_token, target_data_token)
+            try:
+                self._registrar.copy_table(source_data_token, target_data_token)
+            finally:
+                self._result_cache.invalidate(target_data_token)
 
     def move_group(
         self: Database,
@@ -160,11 +496,99 @@ class Database:
         target_data_token: DataToken,
     ) -> None:
         with self._db_adapter:
-            self._registrar.copy_table(source_data_token, target_data_token)
+            try:
+                self._registrar.copy_table(source_data_token, target_data_token)
+            finally:
+                self._result_cache.invalidate(target_data_token)
 
-    def row_count(self, data_token: DataToken) -> int:
+    def row_count(self, data_token: DataToken, query: Optional[Query] = None) -> int:
+        query = self._query_optimizer.optimize(query)
+        with self._db_adapter:
+            if query is None:
+                return self._db_adapter.row_count(data_token)
+            return self._db_adapter.row_count(data_token, query)
+
+    def sort_positions(
+        self: Database,
+        data_token: DataToken,
+        order_by: list[ColumnAlias],
+        ascending: Union[bool, list[bool]] = True,
+        query: Optional[Query] = None,
+        limit: Optional[int] = None,
+    ) -> list[int]:
+        order_by = [str(col) for col in order_by]
+        query = self._query_optimizer.optimize(query)
+        if query is not None and self._full_scan_limit is not None:
+            self._check_full_scan(data_token, query, order_by, order_by, ascending)
+        with self._db_adapter:
+            if not self.has_table(data_token):
+                raise MissingTableError(data_token)
+            return self._db_adapter.sort_positions(
+                data_token, order_by, ascending, query, limit
+            )
+
+    def aggregate(
+        self: Database,
+        data_token: DataToken,
+        aggregations: dict[str, list[str]],
+        group_by: Optional[list[str]] = None,
+        query: Optional[Query] = None,
+    ) -> DataFrame:
+        group_by = [] if group_by is None else group_by
+        query = self._query_optimizer.optimize(query)
+        with self._db_adapter:
+            if not self.has_table(data_token):
+                raise MissingTableError(data_token)
+            rows = self._db_adapter.aggregate(
+                data_token, aggregations, group_by, query
+            )
+        return DataFrame.from_records(
+            rows, columns=group_by + result_columns(aggregations)
+        )
+
+    def join(
+        self: Database,
+        left_token: DataToken,
+        right_token: DataToken,
+        on: list[str],
+        how: str = "inner",
+        left_query: Optional[Query] = None,
+        right_query: Optional[Query] = None,
+        left_columns: Optional[list[str]] = None,
+        right_columns: Optional[list[str]] = None,
+    ) -> DataFrame:
+        left_query = self._query_optimizer.optimize(left_query)
+        right_query = self._query_optimizer.optimize(right_query)
         with self._db_adapter:
-            return self._db_adapter.row_count(data_token)
+            for data_token in [left_token, right_token]:
+                if not self.has_table(data_token):
+                    raise MissingTableError(data_token)
+            if left_columns is None:
+                left_columns = self.table_columns(left_token)
+            if right_columns is None:
+                right_columns = self.table_columns(right_token)
+            rows = self._db_adapter.join(
+                left_token,
+                right_token,
+                on,
+                how,
+                left_query,
+                right_query,
+                left_columns,
+                right_columns,
+            )
+            dtypes = {
+                "left": self.table_dtypes(left_token),
+                "right": self.table_dtypes(right_token),
+            }
+        result_columns = join_columns(left_columns, right_columns, on)
+        frame = DataFrame.from_records(
+            rows, columns=[name for name, _, _ in result_columns]
+        )
+        for name, side, column in result_columns:
+            if dtypes[side][column] is Boolean and frame[name].isna().any():
+                frame[name] = frame[name].map({1: True, 0: False})
+        return frame
 
     def __enter__(self: Database) -> Database:
         return self
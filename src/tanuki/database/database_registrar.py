@@ -3,6 +3,7 @@ from __future__ import annotations
 from io import UnsupportedOperation
 from typing import Optional, Type, TYPE_CHECKING, TypeVar
 
+from tanuki.data_store.index.index_alias import IndexAlias
 from tanuki.data_store.metadata import Metadata
 from tanuki.data_store.query import Query
 from tanuki.database.adapter.database_adapter import DatabaseAdapter
@@ -10,6 +11,7 @@ from tanuki.database.data_token import DataToken
 
 from .db_exceptions import DatabaseCorruptionError, MissingGroupError, MissingTableError
 from .reference_tables import (
+    INDEX_REFERENCE_V1_COLUMNS,
     IndexReference,
     MetadataDefinition,
     MetadataReference,
@@ -32,10 +34,10 @@ class DatabaseRegistrar:
         self._db_adapter = db_adapter
 
         with self._db_adapter:
-            # TODO: Added migration step between reference table versions
             if not self._has_reference_tables():
                 print("No protected reference tables found, rebuilding registrar")
                 self._setup_reference_tables()
+            self._migrate_reference_tables()
             self._validate_reference_tables()
 
     def _has_reference_tables(self):
@@ -82,6 +84,33 @@ class DatabaseRegistrar:
             self._register_store_class(StoreReference)
             self._register_store_class(IndexReference)
 
+    def _migrate_reference_tables(self):
+        with self._db_adapter:
+            _, index_version = self._table_store_type_version(IndexReference.data_token)
+            if index_version == 1:
+                self._migrate_index_reference_v1()
+
+    def _migrate_index_reference_v1(self):
+        with self._db_adapter:
+            index_rows = self._db_adapter.query(
+                IndexReference.data_token, columns=INDEX_REFERENCE_V1_COLUMNS
+            )
+            self._db_adapter.drop_group_table(IndexReference.data_token)
+            self._db_adapter.create_group_table(
+                IndexReference.data_token, IndexReference
+            )
+            self._db_adapter.insert(
+                IndexReference.data_token, IndexReference.from_v1_rows(index_rows)
+            )
+            self._db_adapter.update(
+                TableReference.data_token,
+                TableReference.create_row(
+                    IndexReference.data_token, IndexReference, protected=True
+                ),
+                ["table_name", "data_group"],
+            )
+            self._register_store_class(IndexReference)
+
     def _validate_reference_tables(self):
         with self._db_adapter:
             if not self._db_adapter.has_group_table(TableReference.data_token):
@@ -114,9 +143,14 @@ class DatabaseRegistrar:
                             f"{data_token} data store type reference empty"
                         )
 
-                    index_columns = self._store_index_columns(store_type, store_version)
+                    index_reference = self._store_index_reference(store_type, store_version)
 
-                    type_class = store_definition._store_type(store_type, store_version, index_columns)
+                    type_class = store_definition._store_type(
+                        store_type,
+                        store_version,
+                        index_reference.index_columns(),
+                        index_reference.index_options(),
+                    )
                     if not issubclass(type_class, DataStore):
                         raise DatabaseCorruptionError(
                             f"Received invalid data store class for {data_token}"
@@ -165,6 +199,49 @@ class DatabaseRegistrar:
         with self._db_adapter:
             for index in store_class.indices:
                 self._db_adapter.create_index(data_token, index)
+            for index in self._registered_indices(store_class):
+                self._db_adapter.create_index(data_token, index)
+
+    def _registered_indices(
+        self: DatabaseRegistrar, store_class: Type[T]
+    ) -> list[IndexAlias]:
+        with self._db_adapter:
+            if not self._has_store_type(store_class.__name__, store_class.version):
+                return []
+            index_reference = self._store_index_reference(
+                store_class.__name__, store_class.version
+            )
+            declared = {index.name for index in store_class.indices}
+            columns = store_class._parse_columns()
+            index_options = index_reference.index_options()
+            return [
+                IndexAlias(
+                    name,
+                    [columns[column] for column in index_columns],
+                    unique=index_options[name].unique,
+                    where=index_options[name].where,
+                )
+                for name, index_columns in index_reference.index_columns().items()
+                if name not in declared
+            ]
+
+    def register_index(
+        self: DatabaseRegistrar, data_token: DataToken, index: IndexAlias
+    ) -> None:
+        with self._db_adapter:
+            store_type, store_version = self._table_store_type_version(data_token)
+            criteria = (TableReference.store_type == store_type) & (
+                TableReference.store_version == store_version
+            )
+            for table_token in self._table_references(criteria).data_tokens():
+                if not self._db_adapter.has_index(table_token, index):
+                    self._db_adapter.create_index(table_token, index)
+            index_reference = self._store_index_reference(store_type, store_version)
+            if index.name not in index_reference.index_columns():
+                self._db_adapter.insert(
+                    IndexReference.data_token,
+                    IndexReference.from_indices(store_type, store_version, [index]),
+                )
 
     def drop_table(self: DatabaseRegistrar, data_token: DataToken) -> None:
         with self._db_adapter:
@@ -563,7 +640,7 @@ class DatabaseRegistrar:
 
             return metadata_definition._metadata_type(metaclass_type, metaclass_version)
 
-    def _store_index_columns(self, store_type: str, store_version: int) -> dict[str, list[str]]:
+    def _store_index_reference(self, store_type: str, store_version: int) -> IndexReference:
         with self._db_adapter:
             # Query indices
             store_indices = (IndexReference.store_type == store_type) & (
@@ -572,8 +649,7 @@ class DatabaseRegistrar:
             index_rows = self._db_adapter.query(
                 IndexReference.data_token, store_indices
             )
-            index_reference = IndexReference.from_rows(index_rows)
-            return index_reference.index_columns()
+            return IndexReference.from_rows(index_rows)
 
     def store_type(self, data_token: DataToken) -> Type[T]:
         with self._db_adapter:
@@ -586,10 +662,13 @@ class DatabaseRegistrar:
                 reference_token, definition_version
             )
 
-            index_columns = self._store_index_columns(store_type, store_version)
+            index_reference = self._store_index_reference(store_type, store_version)
 
             return store_definition._store_type(
-                store_type, store_version, index_columns
+                store_type,
+                store_version,
+                index_reference.index_columns(),
+                index_reference.index_options(),
             )
 
     def _drop_store_type(self, store_type: str, store_version: int) -> None:
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+import time
+from typing import Any, ClassVar, Optional, TYPE_CHECKING, TypeVar
+
+from tanuki.data_store.column_alias import ColumnAlias
+from tanuki.data_store.query import Query
+
+from .adapter.upsert_result import UpsertResult
+from .data_token import DataToken
+
+if TYPE_CHECKING:
+    from tanuki.data_store.data_store import DataStore
+
+    from .database import Database
+
+T = TypeVar("T", bound="DataStore")
+
+
+@dataclass
+class _WriteOperation:
+    method: str
+    data_token: DataToken
+    payload: Any
+    alignment_columns: Optional[list[ColumnAlias]] = None
+    futures: list[Future] = field(default_factory=list)
+
+    def batch_key(self: _WriteOperation) -> Optional[tuple]:
+        if self.method in ("delete", "upsert") or self.payload.is_link():
+            return None
+        alignment = None
+        if self.alignment_columns is not None:
+            alignment = tuple(str(col) for col in self.alignment_columns)
+        columns = tuple(str(col) for col in self.payload.columns)
+        return (self.method, self.data_token, type(self.payload), columns, alignment)
+
+    @staticmethod
+    def coalesce(operations: list[_WriteOperation]) -> _WriteOperation:
+        if len(operations) == 1:
+            return operations[0]
+        first = operations[0]
+        stores = [operation.payload for operation in operations]
+        store_class = type(first.payload)
+        batched = store_class.concat(stores, ignore_index=True)
+        batched = store_class.from_backend(batched._data_backend, stores[-1].metadata)
+        futures = [future for operation in operations for future in operation.futures]
+        return _WriteOperation(
+            first.method, first.data_token, batched, first.alignment_columns, futures
+        )
+
+
+class DatabaseWriter:
+    DEFAULT_QUEUE_SIZE: ClassVar[int] = 1024
+    DEFAULT_BATCH_SIZE: ClassVar[int] = 256
+    DEFAULT_MAX_DELAY: ClassVar[float] = 0.01
+
+    _database: Database
+    _queue: Queue[Optional[_WriteOperation]]
+    _max_batch: int
+    _max_delay: float
+    _closed: bool
+    _lock: Lock
+    _thread: Thread
+
+    def __init__(
+        self: DatabaseWriter,
+        database: Database,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        max_batch: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        self._database = database
+        self._queue = Queue(max_queue)
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._closed = False
+        self._lock = Lock()
+        self._thread = Thread(target=self._run, name="tanuki-writer", daemon=True)
+        self._thread.start()
+
+    def insert(
+        self: DatabaseWriter,
+        data_token: DataToken,
+        data_store: T,
+        timeout: Optional[float] = None,
+    ) -> Future[None]:
+        return self._submit(_WriteOperation("insert", data_token, data_store), timeout)
+
+    def update(
+        self: DatabaseWriter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[ColumnAlias],
+        timeout: Optional[float] = None,
+    ) -> Future[None]:
+        operation = _WriteOperation("update", data_token, data_store, alignment_columns)
+        return self._submit(operation, timeout)
+
+    def upsert(
+        self: DatabaseWriter,
+        data_token: DataToken,
+        data_store: T,
+        alignment_columns: list[ColumnAlias],
+        timeout: Optional[float] = None,
+    ) -> Future[UpsertResult]:
+        operation = _WriteOperation("upsert", data_token, data_store, alignment_columns)
+        return self._submit(operation, timeout)
+
+    def delete(
+        self: DatabaseWriter,
+        data_token: DataToken,
+        criteria: Query,
+        timeout: Optional[float] = None,
+    ) -> Future[None]:
+        return self._submit(_WriteOperation("delete", data_token, criteria), timeout)
+
+    def _submit(
+        self: DatabaseWriter, operation: _WriteOperation, timeout: Optional[float]
+    ) -> Future:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise Full
+        try:
+            if self._closed:
+                raise RuntimeError("DatabaseWriter is closed")
+            future = Future()
+            future.set_running_or_notify_cancel()
+            operation.futures.append(future)
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            self._queue.put(operation, timeout=timeout)
+            return future
+        finally:
+            self._lock.release()
+
+    def pending(self: DatabaseWriter) -> int:
+        return self._queue.qsize()
+
+    def flush(self: DatabaseWriter) -> None:
+        self._queue.join()
+
+    def close(self: DatabaseWriter) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self: DatabaseWriter) -> DatabaseWriter:
+        return self
+
+    def __exit__(self: DatabaseWriter, etype, value, traceback) -> None:
+        self.close()
+
+    def _run(self: DatabaseWriter) -> None:
+        running = True
+        while running:
+            operations = [self._queue.get()]
+            deadline = time.monotonic() + self._max_delay
+            while operations[-1] is not None and len(operations) < self._max_batch:
+                try:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    operations.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+
+            if operations[-1] is None:
+                running = False
+            writes = [operation for operation in operations if operation is not None]
+            if len(writes) > 0:
+                self._commit(writes)
+            for _ in operations:
+                self._queue.task_done()
+
+    @staticmethod
+    def _coalesce(operations: list[_WriteOperation]) -> list[_WriteOperation]:
+        groups = [[operations[0]]]
+        for operation in operations[1:]:
+            key = operation.batch_key()
+            if key is not None and key == groups[-1][0].batch_key():
+                groups[-1].append(operation)
+            else:
+                groups.append([operation])
+        return [_WriteOperation.coalesce(group) for group in groups]
+
+    def _commit(self: DatabaseWriter, writes: list[_WriteOperation]) -> None:
+        try:
+            operations = self._coalesce(writes)
+            with self._database.transaction():
+                results = [self._apply(operation) for operation in operations]
+        except Exception:
+            for operation in writes:
+                self._commit_one(operation)
+            return
+
+        for operation, result in zip(operations, results):
+            for future in operation.futures:
+                future.set_result(result)
+
+    def _commit_one(self: DatabaseWriter, operation: _WriteOperation) -> None:
+        try:
+            with self._database.transaction():
+                result = self._apply(operation)
+        except Exception as e:
+            for future in operation.futures:
+                future.set_exception(e)
+            return
+        for future in operation.futures:
+            future.set_result(result)
+
+    def _apply(self: DatabaseWriter, operation: _WriteOperation) -> Any:
+        if operation.method == "insert":
+            return self._database.insert(operation.data_token, operation.payload)
+        elif operation.method == "update":
+            return self._database.update(
+                operation.data_token, operation.payload, operation.alignment_columns
+            )
+        elif operation.method == "upsert":
+            return self._database.upsert(
+                operation.data_token, operation.payload, operation.alignment_columns
+            )
+        return self._database.delete(operation.data_token, operation.payload)
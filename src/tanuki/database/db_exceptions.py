@@ -38,6 +38,19 @@ class DatabaseCorruptionError(DatabaseIOError):
         )
 
 
+class FullScanError(DatabaseIOError):
+    def __init__(
+        self: FullScanError, data_token: DataToken, row_count: int, statement: str
+    ) -> None:
+        super(FullScanError, self).__init__(
+            f"Query would scan all {row_count} rows of {data_token}: {statement}"
+        )
+
+
+class FullScanWarning(UserWarning):
+    pass
+
+
 class MissingGroupError(DatabaseIOError):
     def __init__(self: MissingTableError, data_group: str) -> None:
         super(MissingTableError, self).__init__(
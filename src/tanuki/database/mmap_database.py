@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Optional, Type, TYPE_CHECKING, TypeVar, Union
+
+import numpy as np
+
+from tanuki.data_store.query import Query
+from tanuki.database.adapter.mmap.mmap_adapter import MmapAdapter
+
+from .connection_config import ConnectionConfig
+from .data_token import DataToken
+from .database import Database
+from .result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from tanuki.data_backend.mmap_backend import MmapBackend
+    from tanuki.data_store.data_store import DataStore
+
+T = TypeVar("T", bound="DataStore")
+
+
+class MmapDatabase(Database):
+    _db_adapter: MmapAdapter
+
+    def __init__(
+        self: MmapDatabase,
+        conn_config: ConnectionConfig,
+        chunk_size: Optional[int] = None,
+        result_cache_bytes: int = ResultCache.DEFAULT_BUDGET,
+    ) -> None:
+        super(MmapDatabase, self).__init__(
+            MmapAdapter(conn_config, chunk_size), result_cache_bytes
+        )
+
+    def _read_store(
+        self: MmapDatabase,
+        data_token: DataToken,
+        query: Optional[Query],
+        columns: Optional[list[str]],
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
+    ) -> T:
+        table_data = self._db_adapter.read_frame(
+            data_token, query, columns, offset, limit, rows, order_by, ascending
+        )
+        store_class: Type[T] = self._registrar.store_type(data_token)
+        metadata = self._table_metadata(data_token)
+        return store_class.from_pandas(table_data, metadata=metadata)
+
+    def read_columns(
+        self: MmapDatabase, data_token: DataToken, columns: list[str]
+    ) -> dict[str, np.ndarray]:
+        with self._db_adapter:
+            return self._db_adapter.read_columns(data_token, columns)
+
+    def link_backend(
+        self: MmapDatabase,
+        store_type: Type[T],
+        data_token: DataToken,
+        read_only: bool = True,
+    ) -> MmapBackend[T]:
+        from tanuki.data_backend.mmap_backend import MmapBackend
+
+        return MmapBackend[T](store_type, self, data_token, read_only=read_only)
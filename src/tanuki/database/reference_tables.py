@@ -4,10 +4,13 @@ import pickle
 from types import new_class
 from typing import Any, Type, TypeVar
 
+from pandas import DataFrame
+
 from tanuki.data_store.column import Column
 from tanuki.data_store.data_store import DataStore
 from tanuki.data_store.data_type import Bytes
-from tanuki.data_store.index.index import Index
+from tanuki.data_store.index.index import Index, IndexOptions
+from tanuki.data_store.index.index_alias import IndexAlias
 from tanuki.data_store.metadata import Metadata
 from tanuki.database.data_token import DataToken
 
@@ -199,6 +202,7 @@ class StoreDefinition(DataStore, version=1):
         store_class: str,
         store_version: int,
         index_columns: dict[str, list[str]],
+        index_options: dict[str, IndexOptions] = {},
     ) -> Type[T]:
         annotations = {}
         for name, type in self.itertuples(ignore_index=True):
@@ -221,6 +225,7 @@ class StoreDefinition(DataStore, version=1):
         def add_columns(ns: dict[str, Any]) -> dict[str, Any]:
             ns["__annotations__"] = annotations
             ns |= functions
+            ns |= index_options
 
         return new_class(
             store_class,
@@ -230,27 +235,49 @@ class StoreDefinition(DataStore, version=1):
         )
 
 
-class IndexReference(DataStore, version=1):
+INDEX_REFERENCE_V1_COLUMNS = ["store_type", "store_version", "index_name", "column_name"]
+
+
+class IndexReference(DataStore, version=2):
     data_token = DataToken(f"index_reference", PROTECTED_GROUP)
 
     store_type: Column[str]
     store_version: Column[int]
     index_name: Column[str]
     column_name: Column[str]
+    is_unique: Column[bool]
+    where_query: Column[Bytes]
 
     complete_index: Index[store_type, store_version, index_name, column_name]
 
+    @staticmethod
+    def from_v1_rows(data_rows: list[tuple]) -> IndexReference:
+        reference = DataFrame.from_records(data_rows, columns=INDEX_REFERENCE_V1_COLUMNS)
+        reference["is_unique"] = True
+        reference["where_query"] = [pickle.dumps(None)] * len(reference)
+        return IndexReference.from_pandas(reference)
+
     @staticmethod
     def from_type(store_type: Type[T]) -> IndexReference:
+        return IndexReference.from_indices(
+            store_type.__name__, store_type.version, store_type.indices
+        )
+
+    @staticmethod
+    def from_indices(
+        store_type: str, store_version: int, indices: list[IndexAlias]
+    ) -> IndexReference:
         builder = IndexReference.builder()
 
-        for index in store_type.indices:
+        for index in indices:
             for col in index.columns:
                 builder.append_row(
-                    store_type=store_type.__name__,
-                    store_version=store_type.version,
+                    store_type=store_type,
+                    store_version=store_version,
                     index_name=index.name,
                     column_name=col.name,
+                    is_unique=index.unique,
+                    where_query=pickle.dumps(index.where),
                 )
 
         return builder.build()
@@ -260,8 +287,14 @@ class IndexReference(DataStore, version=1):
             raise RuntimeError("Cannot request index columns on multiple data stores")
 
         index_columns: dict[str, list[str]] = {}
-        for _, _, index, column in self.itertuples(ignore_index=True):
+        for _, _, index, column, _, _ in self.itertuples(ignore_index=True):
             if index not in index_columns:
                 index_columns[index] = []
             index_columns[index].append(column)
         return index_columns
+
+    def index_options(self) -> dict[str, IndexOptions]:
+        index_options: dict[str, IndexOptions] = {}
+        for _, _, index, _, unique, where in self.itertuples(ignore_index=True):
+            index_options[index] = IndexOptions(bool(unique), pickle.loads(where))
+        return index_options
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, ClassVar, Hashable, Optional, Type, TYPE_CHECKING, TypeVar
+
+from pandas import DataFrame
+
+from tanuki.data_backend.pandas_backend import PandasBackend
+from tanuki.data_store.metadata import Metadata
+from tanuki.data_store.query import Query
+from tanuki.database.adapter.query.query_key_compiler import QueryKeyCompiler
+
+from .data_token import DataToken
+
+if TYPE_CHECKING:
+    from tanuki.data_store.data_store import DataStore
+
+T = TypeVar("T", bound="DataStore")
+M = TypeVar("M", bound="Metadata")
+
+
+class _CacheEntry:
+    store_class: Type[T]
+    data: DataFrame
+    metadata: Optional[M]
+    size: int
+
+    def __init__(
+        self, store_class: Type[T], data: DataFrame, metadata: Optional[M]
+    ) -> None:
+        self.store_class = store_class
+        self.data = data
+        self.metadata = metadata
+        self.size = int(data.memory_usage(index=True, deep=True).sum())
+
+
+class ResultCache:
+    DEFAULT_BUDGET: ClassVar[int] = 0
+
+    _max_bytes: int
+    _used_bytes: int
+    _entries: OrderedDict[Hashable, _CacheEntry]
+    _versions: dict[DataToken, int]
+
+    def __init__(self, max_bytes: int = DEFAULT_BUDGET) -> None:
+        self._max_bytes = max_bytes
+        self._used_bytes = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, data_token: DataToken) -> int:
+        return self._versions.get(data_token, 0)
+
+    def key(
+        self,
+        data_token: DataToken,
+        query: Optional[Query],
+        columns: Optional[list[str]],
+        window: Optional[Hashable] = None,
+    ) -> Hashable:
+        query_key = None if query is None else QueryKeyCompiler().compile(query)
+        column_key = None if columns is None else tuple(columns)
+        return (data_token, self.version(data_token), column_key, query_key, window)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        backend = PandasBackend(entry.data.copy(deep=True))
+        return entry.store_class.from_backend(backend, entry.metadata, validate=False)
+
+    def put(self, key: Hashable, data_store: T) -> None:
+        if self._max_bytes <= 0 or data_store.is_link():
+            return
+        data = data_store.to_pandas().copy(deep=True)
+        entry = _CacheEntry(type(data_store), data, data_store.metadata)
+        if entry.size > self._max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._used_bytes += entry.size
+        self._evict()
+
+    def invalidate(self, data_token: DataToken) -> None:
+        self._versions[data_token] = self.version(data_token) + 1
+        for key in [key for key in self._entries.keys() if key[0] == data_token]:
+            self._remove(key)
+
+    def invalidate_group(self, data_group: str) -> None:
+        tokens = set(self._versions.keys()) | set(key[0] for key in self._entries.keys())
+        for data_token in tokens:
+            if data_token.data_group == data_group:
+                self.invalidate(data_token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._used_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._used_bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._used_bytes > self._max_bytes and len(self._entries) > 0:
+            _, entry = self._entries.popitem(last=False)
+            self._used_bytes -= entry.size
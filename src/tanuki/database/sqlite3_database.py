@@ -4,10 +4,17 @@ from tanuki.database.adapter.sqlite3.sqlite3_adapter import Sqlite3Adapter
 
 from .connection_config import ConnectionConfig
 from .database import Database
+from .result_cache import ResultCache
 
 
 class Sqlite3Database(Database):
     _conn_config: ConnectionConfig
 
-    def __init__(self: Sqlite3Database, conn_config: ConnectionConfig) -> None:
-        super(Sqlite3Database, self).__init__(Sqlite3Adapter(conn_config))
+    def __init__(
+        self: Sqlite3Database,
+        conn_config: ConnectionConfig,
+        result_cache_bytes: int = ResultCache.DEFAULT_BUDGET,
+    ) -> None:
+        super(Sqlite3Database, self).__init__(
+            Sqlite3Adapter(conn_config), result_cache_bytes
+        )
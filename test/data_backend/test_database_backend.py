@@ -1,20 +1,29 @@
+from __future__ import annotations
+
+from io import UnsupportedOperation
 from pathlib import Path
 import shutil
 import tempfile
 from helpers.example_store import ExampleStore
 from helpers.sqlite3_container import Sqlite3Container
 
-from hamcrest import assert_that, equal_to, is_
+from hamcrest import assert_that, equal_to, instance_of, is_, not_none
 import numpy as np
 from pandas import Index as PIndex
 from pandas import Series
-from pytest import fail
+from pytest import fail, raises, warns
 
 from tanuki.data_backend.database_backend import DatabaseBackend
 from tanuki.data_backend.pandas_backend import PandasBackend
+from tanuki.data_store.column import Column
+from tanuki.data_store.data_store import DataStore
 from tanuki.data_store.data_type import Boolean, Int64, String
 from tanuki.data_store.index.database_index import DatabaseIndex
+from tanuki.data_store.index.index import Index, SecondaryIndex
 from tanuki.data_store.index.pandas_index import PandasIndex
+from tanuki.data_store.query import InQuery, RowInQuery
+from tanuki.database.data_token import DataToken
+from tanuki.database.db_exceptions import FullScanError, FullScanWarning
 from tanuki.database.sqlite3_database import Sqlite3Database
 
 
@@ -177,6 +186,101 @@ class TestDatabaseBackend:
         queried = self.data_backend.query(query)
         assert_that(queried.equals(expected), equal_to(True))
 
+    def test_eq_membership(self) -> None:
+        keys = PandasBackend({"a": ["a", "c", "x"]})
+        query = self.data_backend == keys
+        assert_that(query.a, instance_of(InQuery))
+        queried = self.data_backend.query(query)
+        assert_that(queried["a"].values.tolist(), equal_to(["a", "c"]))
+
+        keys = PandasBackend({"a": ["a", "b", "c"], "b": [1, 3, 3]})
+        query = self.data_backend == keys
+        assert_that(query.a, instance_of(RowInQuery))
+        queried = self.data_backend.query(query)
+        assert_that(queried["a"].values.tolist(), equal_to(["a", "c"]))
+        queried = self.data_backend.query(self.data_backend != keys)
+        assert_that(queried["a"].values.tolist(), equal_to(["b"]))
+
+    def test_full_scan_limit(self) -> None:
+        plan = self.db.explain(ExampleStore.data_token, ExampleStore.a == "a")
+        assert_that(plan.uses_index("test_a_index"), is_(True))
+
+        self.db.set_full_scan_limit(2)
+        result = self.db.query(ExampleStore, ExampleStore.data_token, ExampleStore.a == "a")
+        assert_that(result.b.tolist(), equal_to([1]))
+        with raises(FullScanError):
+            self.db.query(ExampleStore, ExampleStore.data_token, ExampleStore.b > 1)
+
+        self.db.set_full_scan_limit(2, strict=False)
+        with warns(FullScanWarning):
+            self.db.query(ExampleStore, ExampleStore.data_token, ExampleStore.b > 2)
+
+        self.db.set_full_scan_limit(None)
+        result = self.db.query(ExampleStore, ExampleStore.data_token, ExampleStore.b > 1)
+        assert_that(result.b.tolist(), equal_to([2, 3]))
+
+    def test_delete_keys(self) -> None:
+        token = DataToken("test_keys", ExampleStore.data_token.data_group)
+        keys = ExampleStore(a=["a", "b", "c"], b=[1, 5, 3], c=[True, False, False])
+        self.db.insert(token, keys)
+        linked_keys = ExampleStore.link(self.db, token)
+        linked_keys = linked_keys.query(linked_keys.c == True)[["a", "b"]]
+        assert_that(linked_keys.is_link(), is_(True))
+
+        deleted = self.db.delete_keys(
+            ExampleStore.data_token, linked_keys, [ExampleStore.a, ExampleStore.b]
+        )
+        assert_that(deleted, equal_to(1))
+        queried = self.db.query(ExampleStore, ExampleStore.data_token)
+        assert_that(queried.a.tolist(), equal_to(["b", "c"]))
+
+    def test_changes_since(self) -> None:
+        token = ExampleStore.data_token
+        self.db.enable_change_log(token)
+        assert_that(self.db.changes_since(token).is_empty(), is_(True))
+
+        self.db.insert(token, ExampleStore(a=["d", "e"], b=[4, 5], c=[True, True]))
+        self.db.update(token, ExampleStore(a=["a", "d"], b=[0, 0]), [ExampleStore.a])
+        self.db.delete(token, ExampleStore.a.isin(["b", "e"]))
+        changes = self.db.changes_since(token)
+        assert_that(changes.inserted.a.tolist(), equal_to(["d"]))
+        assert_that(changes.updated.a.tolist(), equal_to(["a"]))
+        assert_that(changes.deleted.a.tolist(), equal_to(["b"]))
+
+        self.db.delete_keys(token, ExampleStore(a=["d"]), [ExampleStore.a])
+        later = self.db.changes_since(token, changes.version)
+        assert_that(later.version, equal_to(self.db.change_version(token)))
+        assert_that(later.deleted.a.tolist(), equal_to(["d"]))
+        assert_that(len(later.inserted) + len(later.updated), equal_to(0))
+
+    def test_recommend_indexes(self) -> None:
+        self.db.set_result_cache_budget(0)
+        self.db.record_workload()
+        query = (ExampleStore.b == 2) & (ExampleStore.c == False)
+        for _ in range(3):
+            self.db.query(ExampleStore, ExampleStore.data_token, query)
+            self.db.query(ExampleStore, ExampleStore.data_token, ExampleStore.a == "a")
+        assert_that(len(self.db.workload(ExampleStore.data_token)), equal_to(2))
+
+        recommendations = self.db.recommend_indexes()
+        assert_that(len(recommendations), equal_to(1))
+        assert_that(recommendations[0].columns, equal_to(["b", "c"]))
+        assert_that(recommendations[0].queries, equal_to(3))
+
+        self.db.recommend_indexes(apply=True)
+        plan = self.db.explain(ExampleStore.data_token, query)
+        assert_that(plan.uses_index("test_b_c_advised_index"), is_(True))
+        assert_that(self.db.recommend_indexes(), equal_to([]))
+        store_type = self.db.table_store_type(ExampleStore.data_token)
+        index_names = [index.name for index in store_type.indices]
+        assert_that("b_c_advised_index" in index_names, is_(True))
+
+        token2 = DataToken("test2", ExampleStore.data_token.data_group)
+        self.db.insert(token2, self.test_store)
+        plan = self.db.explain(token2, query)
+        assert_that(plan.uses_index("test2_b_c_advised_index"), is_(True))
+        self.db.record_workload(False)
+
     def test_gt(self) -> None:
         expected = PandasBackend({"a": ["c"], "b": [3], "c": [True]})
         query = self.data_backend["b"] > 2
@@ -276,11 +380,11 @@ class TestDatabaseBackend:
         try:
             self.data_backend["a"] = ["d", "e", "f"]
             fail("Expected exception")
-        except NotImplementedError as e:
+        except UnsupportedOperation as e:
             assert_that(
                 str(e),
                 equal_to(
-                    "The current version of Tanuki does not support Store to DB writing"
+                    "Database link raw.test is read only, link with read_only=False to write"
                 ),
             )
 
@@ -289,11 +393,11 @@ class TestDatabaseBackend:
             postfix = PandasBackend({"a": ["d"], "b": [4], "c": [False]})
             self.data_backend.append(postfix, ignore_index=True)
             fail("Expected exception")
-        except NotImplementedError as e:
+        except UnsupportedOperation as e:
             assert_that(
                 str(e),
                 equal_to(
-                    "The current version of Tanuki does not support Store to DB writing"
+                    "Database link raw.test is read only, link with read_only=False to write"
                 ),
             )
 
@@ -301,11 +405,11 @@ class TestDatabaseBackend:
         try:
             self.data_backend.drop_indices([1])
             fail("Expected exception")
-        except NotImplementedError as e:
+        except UnsupportedOperation as e:
             assert_that(
                 str(e),
                 equal_to(
-                    "The current version of Tanuki does not support Store to DB writing"
+                    "Database link raw.test is read only, link with read_only=False to write"
                 ),
             )
 
@@ -314,11 +418,11 @@ class TestDatabaseBackend:
             postfix = PandasBackend({"a": ["d"], "b": [4], "c": [False]})
             DatabaseBackend.concat([self.data_backend, postfix], ignore_index=True)
             fail("Expected exception")
-        except NotImplementedError as e:
+        except UnsupportedOperation as e:
             assert_that(
                 str(e),
                 equal_to(
-                    "The current version of Tanuki does not support Store to DB writing"
+                    "Database link raw.test is read only, link with read_only=False to write"
                 ),
             )
 
@@ -329,3 +433,365 @@ class TestDatabaseBackend:
     def test_repr(self) -> None:
         expected = "Database Link: raw.test\nActive Columns: ['a', 'b', 'c']"
         assert_that(repr(self.data_backend), equal_to(expected))
+
+    def test_lazy_link(self) -> None:
+        self.db.set_result_cache_budget(64 * 1024 * 1024)
+        adapter = self.db._db_adapter
+        calls = []
+        for method in ["query", "row_count"]:
+            original = getattr(adapter, method)
+            counted = lambda *args, _method=method, _original=original, **kwargs: (
+                calls.append(_method) or _original(*args, **kwargs)
+            )
+            setattr(adapter, method, counted)
+
+        db_store = ExampleStore.link(self.db, ExampleStore.data_token)
+        lookups = calls.count("query")
+        assert_that(calls.count("row_count"), equal_to(0))
+
+        db_store.b
+        db_store.ab_index
+        db_store.a_index
+        assert_that(calls, equal_to(["query"] * lookups))
+
+        assert_that(len(db_store.index), equal_to(3))
+        assert_that(len(db_store.b._data_backend), equal_to(3))
+        assert_that(len(db_store.ab_index), equal_to(3))
+        assert_that(calls.count("row_count"), equal_to(1))
+        assert_that(calls.count("query"), equal_to(lookups))
+
+    def test_link_row_count_external_write(self) -> None:
+        external = Sqlite3Database(self.sql_db.connection_config())
+        assert_that(len(self.db_store), equal_to(3))
+        external.insert(
+            ExampleStore.data_token, ExampleStore(a=["d"], b=[4], c=[False])
+        )
+        assert_that(len(self.db_store), equal_to(4))
+        assert_that(len(self.db_store.to_pandas()), equal_to(4))
+        assert_that(len(self.db_store.index), equal_to(4))
+
+    def _record_queries(self) -> list[dict]:
+        self.db.set_result_cache_budget(0)
+        adapter = self.db._db_adapter
+        calls = []
+        original = adapter.query
+
+        def record(data_token, query=None, columns=None, **kwargs):
+            if data_token == ExampleStore.data_token:
+                calls.append({"query": query, **kwargs})
+            return original(data_token, query, columns, **kwargs)
+
+        adapter.query = record
+        return calls
+
+    def test_iloc_pushdown(self) -> None:
+        calls = self._record_queries()
+
+        window = self.data_backend.iloc[1:3]
+        assert_that(window.to_pandas()["a"].tolist(), equal_to(["b", "c"]))
+        assert_that(window.index.tolist(), equal_to([1, 2]))
+        assert_that(
+            calls[-1],
+            equal_to(
+                {
+                    "query": None,
+                    "offset": 1,
+                    "limit": 2,
+                    "rows": None,
+                    "order_by": None,
+                    "ascending": True,
+                }
+            ),
+        )
+
+        rows = self.data_backend.iloc[[2, 0]]
+        assert_that(rows.to_pandas()["a"].tolist(), equal_to(["c", "a"]))
+        assert_that(rows.index.tolist(), equal_to([2, 0]))
+        assert_that(calls[-1]["rows"], equal_to([0, 2]))
+
+        self.db._db_adapter.STAGING_THRESHOLD = 1
+        rows = self.data_backend.iloc[[0, 2]]
+        assert_that(rows.to_pandas()["b"].tolist(), equal_to([1, 3]))
+
+        try:
+            self.data_backend.iloc[[5]]
+            fail("Expected exception")
+        except IndexError:
+            pass
+
+    def test_getmask_pushdown(self) -> None:
+        calls = self._record_queries()
+        masked = self.data_backend.getmask([False, True, True])
+        assert_that(masked.to_pandas()["a"].tolist(), equal_to(["b", "c"]))
+        assert_that(masked.index.tolist(), equal_to([1, 2]))
+        assert_that(calls[-1]["offset"], equal_to(1))
+        assert_that(calls[-1]["limit"], equal_to(2))
+
+    def test_loc_pushdown(self) -> None:
+        calls = self._record_queries()
+        positional = self.data_backend.loc[0:1]
+        assert_that(positional.to_pandas()["a"].tolist(), equal_to(["a", "b"]))
+
+        indexed = self.data_backend.set_index(ExampleStore.a_index)
+        row = indexed.loc["b"]
+        assert_that(row.index.tolist(), equal_to(["b"]))
+        assert_that(row.to_pandas()["b"].tolist(), equal_to([2]))
+        assert_that(calls[-1]["query"], not_none())
+
+        rows = indexed.loc["b":"c"]
+        assert_that(rows.index.tolist(), equal_to(["b", "c"]))
+        try:
+            indexed.loc["z"]
+            fail("Expected exception")
+        except KeyError:
+            pass
+
+    def test_loc_declared_index_keys(self) -> None:
+        indexed = self.data_backend.set_index(ExampleStore.a_index)
+        expected = PandasBackend(self.test_store.to_pandas()).set_index(
+            ExampleStore.a_index
+        )
+        for keys in [["c", "a"], ["b", "a", "b"]]:
+            rows = indexed.loc[keys]
+            assert_that(rows.index.tolist(), equal_to(keys))
+            expected_rows = expected.loc[keys].to_pandas()
+            actual_rows = rows.to_pandas()[expected_rows.columns]
+            assert_that(actual_rows.equals(expected_rows), is_(True))
+
+        composite = self.data_backend.set_index(ExampleStore.ab_index)
+        rows = composite.loc[[("c", 3), ("a", 1), ("c", 3)]]
+        assert_that(rows.index.tolist(), equal_to([("c", 3), ("a", 1), ("c", 3)]))
+
+        for missing in [["a", "missing"], [("a", 1), ("a", 2)]]:
+            backend = indexed if type(missing[0]) is str else composite
+            try:
+                backend.loc[missing]
+                fail("Expected exception")
+            except KeyError:
+                pass
+
+    def test_aggregate_pushdown(self) -> None:
+        calls = self._record_queries()
+        totals = self.db_store.agg({"b": ["sum", "mean"], "a": "count"})
+        assert_that(calls, equal_to([]))
+        assert_that(totals.b_sum.tolist(), equal_to([6]))
+        assert_that(totals.b_mean.tolist(), equal_to([2.0]))
+        assert_that(totals.a_count.tolist(), equal_to([3]))
+
+        grouped = self.db_store.groupby(ExampleStore.c).agg({"b": ["min", "max"]})
+        expected = self.test_store.groupby(ExampleStore.c).agg({"b": ["min", "max"]})
+        assert_that(calls, equal_to([]))
+        assert_that(grouped.is_link(), is_(False))
+        assert_that(grouped.equals(expected), is_(True))
+
+        filtered = self.db_store[ExampleStore.b >= 2]
+        assert_that(filtered.b.sum(), equal_to(5))
+        assert_that(filtered.c.nunique(), equal_to(2))
+        assert_that(self.db_store.a.nunique(), equal_to(3))
+        counts = self.data_backend.nunique()
+        assert_that(counts, instance_of(Series))
+        assert_that(counts.to_dict(), equal_to({"a": 3, "b": 3, "c": 2, "d": 0}))
+        assert_that(calls, equal_to([]))
+
+    def _record_sorts(self) -> list[dict]:
+        adapter = self.db._db_adapter
+        sorts = []
+        original = adapter.sort_positions
+
+        def record(data_token, order_by, ascending=True, query=None, limit=None):
+            sorts.append({"order_by": order_by, "query": query, "limit": limit})
+            return original(data_token, order_by, ascending, query, limit)
+
+        adapter.sort_positions = record
+        return sorts
+
+    def test_sort_pushdown(self) -> None:
+        calls = self._record_queries()
+        sorts = self._record_sorts()
+        top = self.db_store.sort_values(ExampleStore.b, ascending=False, limit=2)
+        assert_that(top.a.tolist(), equal_to(["c", "b"]))
+        assert_that(sorts[-1]["order_by"], equal_to(["b"]))
+        assert_that(sorts[-1]["limit"], equal_to(2))
+        assert_that(calls[-1]["offset"], equal_to(1))
+        assert_that(calls[-1]["limit"], equal_to(2))
+
+        page = self.db_store.page(after="a", size=1)
+        assert_that(page.a.tolist(), equal_to(["b"]))
+        assert_that(sorts[-1]["order_by"], equal_to(["a"]))
+        assert_that(sorts[-1]["query"], not_none())
+        assert_that(sorts[-1]["limit"], equal_to(1))
+
+        head = self.db_store.head(2)
+        assert_that(head.a.tolist(), equal_to(["a", "b"]))
+        assert_that(calls[-1]["offset"], equal_to(0))
+        assert_that(calls[-1]["limit"], equal_to(2))
+
+    def test_sort_labels(self) -> None:
+        expected = PandasBackend(self.test_store.to_pandas().reset_index(drop=True))
+        for columns, ascending in [
+            (["b"], True),
+            (["b"], False),
+            (["c", "a"], [False, True]),
+        ]:
+            for limit in [None, 0, 1, 2]:
+                actual = self.data_backend.sort_values(columns, ascending, limit)
+                wanted = expected.sort_values(columns, ascending, limit)
+                assert_that(actual.index.tolist(), equal_to(wanted.index.tolist()))
+                assert_that(
+                    actual.to_pandas()["a"].tolist(),
+                    equal_to(wanted.to_pandas()["a"].tolist()),
+                )
+
+    def test_join_pushdown(self) -> None:
+        other = ExampleStore(
+            a=["c", "a", "x"], b=[30, 10, 40], c=[True, True, False]
+        )
+        token = DataToken("join_right", ExampleStore.data_token.data_group)
+        self.db.insert(token, other)
+        other_store = ExampleStore.link(self.db, token)[[ExampleStore.a, ExampleStore.b]]
+        calls = self._record_queries()
+
+        for how in ["inner", "left", "right", "outer"]:
+            joined = self.db_store.join(other_store, ExampleStore.a, how=how)
+            expected = self.test_store.join(other[["a", "b"]], "a", how=how)
+            assert_that(joined.is_link(), is_(False))
+            assert_that(joined.a.tolist(), equal_to(expected.a.tolist()))
+            assert_that(
+                joined.to_pandas()["b_right"].fillna(-1).tolist(),
+                equal_to(expected.to_pandas()["b_right"].fillna(-1).tolist()),
+            )
+        assert_that(calls, equal_to([]))
+
+        filtered = self.db_store[ExampleStore.b > 1].join(other_store, "a")
+        assert_that(filtered.a.tolist(), equal_to(["c"]))
+        assert_that(filtered.b_right.tolist(), equal_to([30]))
+
+    def test_writable_link(self) -> None:
+        token = DataToken("writable", ExampleStore.data_token.data_group)
+        self.db.insert(token, self.test_store)
+        link = ExampleStore.link(self.db, token, read_only=False)
+
+        with link:
+            link[ExampleStore.b >= 2]["b"] = 20
+            link.append(ExampleStore(a=["d"], b=[4], c=[False]))
+            link.drop([0])
+            assert_that(len(link), equal_to(3))
+
+        stored = self.db.query(ExampleStore, token)
+        assert_that(stored.a.tolist(), equal_to(["b", "c", "d"]))
+        assert_that(stored.b.tolist(), equal_to([20, 20, 4]))
+        assert_that(len(link), equal_to(3))
+
+        link["c"] = [True, True, True]
+        link.rollback()
+        link.commit()
+        assert_that(self.db.query(ExampleStore, token).c.tolist(), equal_to([False, True, False]))
+
+        try:
+            with link:
+                link["c"] = [True, True, True]
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        assert_that(self.db.query(ExampleStore, token).c.tolist(), equal_to([False, True, False]))
+
+    def test_writable_setitem_after_append(self) -> None:
+        token = DataToken("writable", ExampleStore.data_token.data_group)
+        self.db.insert(token, self.test_store)
+        link = ExampleStore.link(self.db, token, read_only=False)
+
+        link.append(ExampleStore(a=["d"], b=[4], c=[True]))
+        with raises(UnsupportedOperation):
+            link["c"] = False
+        link.commit()
+        link["c"] = False
+        link.commit()
+
+        stored = self.db.query(ExampleStore, token)
+        assert_that(stored.a.tolist(), equal_to(["a", "b", "c", "d"]))
+        assert_that(stored.c.tolist(), equal_to([False] * 4))
+
+    def test_writable_alignment_index(self) -> None:
+        class AlignedStore(DataStore):
+            a: Column[str]
+            b: Column[int]
+
+            b_index: SecondaryIndex[b]
+            a_index: Index[a]
+
+        token = DataToken("secondary", ExampleStore.data_token.data_group)
+        self.db.insert(token, AlignedStore(a=["a", "b", "c"], b=[1, 1, 2]))
+        link = AlignedStore.link(self.db, token, read_only=False)
+        with link:
+            link[AlignedStore.a == "a"]["b"] = 5
+        stored = self.db.query(AlignedStore, token)
+        assert_that(stored.b.tolist(), equal_to([5, 1, 2]))
+
+        class UnkeyedStore(DataStore):
+            a: Column[str]
+            b: Column[int]
+
+            b_index: SecondaryIndex[b]
+
+        token = DataToken("unkeyed", ExampleStore.data_token.data_group)
+        self.db.insert(token, UnkeyedStore(a=["a", "b"], b=[1, 1]))
+        link = UnkeyedStore.link(self.db, token, read_only=False)
+        with raises(UnsupportedOperation):
+            link["b"] = 2
+
+    def test_writable_concat(self) -> None:
+        token = DataToken("writable", ExampleStore.data_token.data_group)
+        self.db.insert(token, self.test_store)
+        link = ExampleStore.link(self.db, token, read_only=False)
+
+        with link:
+            first = ExampleStore(a=["d"], b=[4], c=[False])
+            second = ExampleStore(a=["e"], b=[5], c=[True])
+            ExampleStore.concat([link, first, second], ignore_index=True)
+
+        stored = self.db.query(ExampleStore, token)
+        assert_that(stored.a.tolist(), equal_to(["a", "b", "c", "d", "e"]))
+
+    def test_writable_drop_many_keys(self) -> None:
+        token = DataToken("writable", ExampleStore.data_token.data_group)
+        rows = 20000
+        data = ExampleStore(
+            a=[f"k{i}" for i in range(rows)], b=list(range(rows)), c=[True] * rows
+        )
+        self.db.insert(token, data)
+        link = ExampleStore.link(self.db, token, read_only=False)
+        keyed = link.set_index(ExampleStore.ab_index)
+
+        with keyed:
+            keyed.drop([(f"k{i}", i) for i in range(rows - 1)])
+
+        stored = self.db.query(ExampleStore, token)
+        assert_that(stored.a.tolist(), equal_to([f"k{rows - 1}"]))
+
+        with link:
+            link["b"] = [7]
+        assert_that(self.db.query(ExampleStore, token).b.tolist(), equal_to([7]))
+
+    def test_lazy_query(self) -> None:
+        calls = self._record_queries()
+        lazy = (
+            self.data_backend.getitems(["a", "b"])
+            .query(ExampleStore.b >= 2)
+            .query(ExampleStore.c == True)
+        )
+        assert_that(isinstance(lazy, DatabaseBackend), is_(True))
+        assert_that(lazy.columns, equal_to(["a", "b"]))
+        assert_that(calls, equal_to([]))
+
+        data = lazy.to_pandas()
+        assert_that(len(calls), equal_to(1))
+        assert_that(data["a"].tolist(), equal_to(["c"]))
+        assert_that(data.columns.tolist(), equal_to(["a", "b"]))
+        assert_that(len(lazy), equal_to(1))
+
+        lazy_store = self.db_store[ExampleStore.b >= 2]
+        assert_that(lazy_store.is_link(), is_(True))
+        assert_that(lazy_store.link_query(), not_none())
+        token = DataToken("filtered", ExampleStore.data_token.data_group)
+        self.db.insert(token, lazy_store)
+        assert_that(self.db.row_count(token), equal_to(2))
@@ -0,0 +1,60 @@
+from datetime import datetime
+from pathlib import Path
+import shutil
+import tempfile
+
+from hamcrest import assert_that, equal_to, is_
+import numpy as np
+
+from helpers.example_store import ExampleStore
+from helpers.sqlite3_container import Sqlite3Container
+from tanuki.data_backend.mmap_backend import MmapBackend
+from tanuki.database.mmap_database import MmapDatabase
+
+
+class TestMmapBackend:
+    db_dir: Sqlite3Container
+
+    @classmethod
+    def setup_class(cls) -> None:
+        tmp_db_dir = Path(tempfile.gettempdir()) / "tanuki_test"
+        if tmp_db_dir.exists():
+            shutil.rmtree(tmp_db_dir, ignore_errors=True)
+        tmp_db_dir.mkdir()
+        cls.db_dir = Sqlite3Container(tmp_db_dir)
+
+    @classmethod
+    def teardown_class(cls) -> None:
+        cls.db_dir.stop()
+
+    def setup_method(self) -> None:
+        now = datetime.now()
+        self.test_store = ExampleStore(
+            a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True], d=[now, now, now]
+        )
+        self.db = MmapDatabase(self.db_dir.connection_config())
+        self.db.insert(ExampleStore.data_token, self.test_store)
+        self.db_store = ExampleStore.link(self.db, ExampleStore.data_token)
+        self.data_backend = self.db_store._data_backend
+
+    def teardown_method(self) -> None:
+        self.db_dir.reset()
+
+    def test_link_backend(self) -> None:
+        assert_that(isinstance(self.data_backend, MmapBackend), is_(True))
+        assert_that(isinstance(self.db_store.b._data_backend, MmapBackend), is_(True))
+
+    def test_to_pandas(self) -> None:
+        assert_that(
+            self.data_backend.to_pandas().equals(self.test_store.to_pandas()), is_(True)
+        )
+
+    def test_column_values(self) -> None:
+        values = self.db_store.b.values
+        assert_that(isinstance(values, np.memmap), is_(True))
+        assert_that(values.tolist(), equal_to([1, 2, 3]))
+
+    def test_query(self) -> None:
+        queried = self.db_store[ExampleStore.b >= 2]
+        assert_that(queried.a.tolist(), equal_to(["b", "c"]))
+        assert_that(queried.b.tolist(), equal_to([2, 3]))
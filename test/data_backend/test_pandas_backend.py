@@ -10,6 +10,7 @@ from pandas.core.series import Series
 from tanuki.data_backend.pandas_backend import PandasBackend
 from tanuki.data_store.data_type import Boolean, Int64, Object
 from tanuki.data_store.index.pandas_index import PandasIndex
+from tanuki.data_store.query import EqualsQuery
 
 
 class TestPandasBackend:
@@ -235,6 +236,54 @@ class TestPandasBackend:
         )
         assert_that(test.equals(expected), equal_to(True))
 
+    def test_query_always_true(self) -> None:
+        test = self.data_backend.query(EqualsQuery(1, 1))
+        assert_that(test is self.data_backend, is_(False))
+        assert_that(test.equals(self.data_backend), is_(True))
+        test["b"] = [7, 8, 9]
+        assert_that(self.data_backend["b"].values.tolist(), equal_to([1, 2, 3]))
+
+    def test_query_index(self) -> None:
+        data = DataFrame(
+            {"a": ["b", "a", "c", "a", None], "b": [5, 3, 1, 2, 4], "c": [True] * 5}
+        )
+        data_backend = PandasBackend(data)
+        data_backend.get_index(ExampleStore.a_index)
+        data_backend.get_index(ExampleStore.ab_index)
+        queries = [
+            ExampleStore.a == "a",
+            (ExampleStore.a == "a") & (ExampleStore.b == 2),
+            (ExampleStore.a == "a") & (ExampleStore.b > 2),
+            ExampleStore.a.isin(["c", "b", "z"]),
+            ExampleStore.a > "a",
+            ExampleStore.a.between("b", "c"),
+            ExampleStore.a.startswith("c"),
+        ]
+        for query in queries:
+            expected = PandasBackend(data).query(query)
+            assert_that(data_backend.query(query).equals(expected), is_(True))
+
+    def test_query_index_cache(self) -> None:
+        data = DataFrame(
+            {"a": ["b", "a", "c", "a"], "b": [5, 3, 1, 2], "c": [True] * 4}
+        )
+        data_backend = PandasBackend(data)
+        queried = data_backend.query(ExampleStore.a == "a")
+        assert_that(len(queried._index_cache), equal_to(0))
+
+        data_backend.get_index(ExampleStore.a_index)
+        queried = data_backend.query(ExampleStore.b < 5)
+        assert_that(len(queried._index_cache), equal_to(1))
+        result = queried.query(ExampleStore.a == "a")
+        assert_that(result["b"].values.tolist(), equal_to([3, 2]))
+        assert_that(len(result._index_cache), equal_to(1))
+
+    def test_loc_index(self) -> None:
+        data_backend = self.data_backend.set_index(ExampleStore.ab_index)
+        result = data_backend.loc[[("c", 3), ("a", 1)]]
+        assert_that(result.index.tolist(), equal_to([("c", 3), ("a", 1)]))
+        assert_that(result["c"].values.tolist(), equal_to([True, True]))
+
     def test_setitem(self) -> None:
         self.data_backend["a"] = ["d", "e", "f"]
         expected = PandasBackend(
@@ -273,3 +322,27 @@ class TestPandasBackend:
             }
         )
         assert_that(new_frame.equals(expected), equal_to(True))
+
+    def test_sort_values(self) -> None:
+        backend = PandasBackend(
+            DataFrame({"a": ["e", "b", "a", "d", "c"], "b": [3, 1, 3, 2, 5]})
+        )
+        top = backend.sort_values(["b"], limit=3)
+        assert_that(top.index.tolist(), equal_to([1, 3, 0]))
+        top = backend.sort_values(["b"], ascending=False, limit=2)
+        assert_that(top.index.tolist(), equal_to([4, 0]))
+
+        for limit in range(7):
+            for ascending in [True, False]:
+                expected = backend.to_pandas().sort_values(
+                    "b", ascending=ascending, kind="stable"
+                )
+                actual = backend.sort_values(["b"], ascending, limit)
+                assert_that(
+                    actual.index.tolist(), equal_to(expected.index.tolist()[:limit])
+                )
+
+        ordered = backend.sort_values(["b", "a"], ascending=[False, True])
+        assert_that(ordered.to_pandas()["a"].tolist(), equal_to(["c", "a", "e", "d", "b"]))
+        assert_that(backend.head(2).index.tolist(), equal_to([0, 1]))
+
@@ -206,3 +206,42 @@ class TestDatabaseIndex:
         assert_that(repr(self.index), equal_to("Int64Index([0, 1, 2], dtype='int64', name='index')"))
         assert_that(repr(self.a_index), equal_to("Database Link: raw.test\nActive Columns: ['a']"))
         assert_that(repr(self.ab_index), equal_to("Database Link: raw.test\nActive Columns: ['a', 'b']"))
+
+    def test_contains(self) -> None:
+        assert_that("b" in self.a_index, equal_to(True))
+        assert_that("z" in self.a_index, equal_to(False))
+        assert_that(("b", 2) in self.ab_index, equal_to(True))
+        assert_that(("b", 3) in self.ab_index, equal_to(False))
+        assert_that("b" in self.ab_index, equal_to(False))
+
+    def test_range(self) -> None:
+        assert_that(self.a_index.range("b", "c").tolist(), equal_to(["b", "c"]))
+        assert_that(self.a_index.range(stop="a").tolist(), equal_to(["a"]))
+        try:
+            self.ab_index.range("a", "b")
+            fail("Expected exception")
+        except ValueError:
+            pass
+
+    def test_cached_per_version(self) -> None:
+        self.db.set_result_cache_budget(64 * 1024 * 1024)
+        first = self.a_index.to_pandas()
+        assert_that(self.a_index.to_pandas() is first, equal_to(True))
+        assert_that("b" in self.a_index, equal_to(True))
+
+        self.db.delete(ExampleStore.data_token, ExampleStore.a == "b")
+        assert_that(self.a_index.to_pandas() is first, equal_to(False))
+        assert_that("b" in self.a_index, equal_to(False))
+
+    def test_external_write(self) -> None:
+        first = self.a_index.to_pandas()
+        assert_that(self.a_index.to_pandas() is first, equal_to(False))
+        assert_that("d" in self.a_index, equal_to(False))
+
+        external = Sqlite3Database(self.sql_db.connection_config())
+        external.insert(
+            ExampleStore.data_token, ExampleStore(a=["d"], b=[4], c=[False])
+        )
+        assert_that("d" in self.a_index, equal_to(True))
+        assert_that(self.a_index.tolist(), equal_to(["a", "b", "c", "d"]))
+        assert_that(self.a_index[3], equal_to("d"))
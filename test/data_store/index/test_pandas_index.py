@@ -1,5 +1,5 @@
 import numpy as np
-from pandas import Index as PIndex
+from pandas import Index as PIndex, MultiIndex
 from precisely import assert_that, equal_to
 from pytest import fail
 
@@ -25,6 +25,10 @@ class TestPandasIndex:
         assert_that(self.index[1], equal_to(1))
         assert_that(self.index[[1]].equals(expected), equal_to(True))
 
+    def test_contains(self):
+        assert_that(1 in self.index, equal_to(True))
+        assert_that(5 in self.index, equal_to(False))
+
     def test_values(self):
         assert_that(np.array_equal(self.index.values, np.array([0, 1, 2])), equal_to(True))
 
@@ -82,4 +86,41 @@ class TestPandasIndex:
 
     def test_repr(self) -> str:
         assert_that(repr(self.index), equal_to("Int64Index([0, 1, 2], dtype='int64', name='index')"))
-    
\ No newline at end of file
+
+    def test_get_positions(self):
+        index = PandasIndex(PIndex(["b", "a", None, "b"], name="a_index"), ["a"])
+        assert_that(index.get_positions("b").tolist(), equal_to([0, 3]))
+        assert_that(index.get_positions("z").tolist(), equal_to([]))
+        assert_that(index.get_positions(None).tolist(), equal_to([]))
+
+        composite = PandasIndex(
+            MultiIndex.from_arrays([["b", "a", "b"], [1, 2, 1]], names=["a", "b"]),
+            ["a", "b"],
+        )
+        assert_that(composite.get_positions(("b", 1)).tolist(), equal_to([0, 2]))
+        assert_that(composite.get_positions(("a", 1)).tolist(), equal_to([]))
+
+    def test_range_positions(self):
+        index = PandasIndex(PIndex([3, 1, np.nan, 2], name="b_index"), ["b"])
+        assert_that(index.range_positions(1, 2).tolist(), equal_to([1, 3]))
+        assert_that(index.range_positions(low=2, low_inclusive=False).tolist(), equal_to([0]))
+        assert_that(index.range_positions(high=2, high_inclusive=False).tolist(), equal_to([1]))
+
+        mixed = PandasIndex(PIndex([1, "a"], name="a_index"), ["a"])
+        assert_that(mixed.range_positions(1, 2), equal_to(None))
+
+    def test_take(self):
+        index = PandasIndex(PIndex([3, 1, 2, 1, 3], name="b_index"), ["b"])
+        index.get_positions(1)
+        index.range_positions(1, 3)
+        taken = index.take(np.array([1, 2, 4]))
+        assert_that(taken.tolist(), equal_to([1, 2, 3]))
+        assert_that(taken.columns, equal_to(["b"]))
+        assert_that(taken._lookup_order is None, equal_to(False))
+        assert_that(taken.get_positions(1).tolist(), equal_to([0]))
+        assert_that(taken.get_positions(3).tolist(), equal_to([2]))
+        assert_that(taken.range_positions(2, 3).tolist(), equal_to([1, 2]))
+
+        lazy = PandasIndex(PIndex([3, 1, 2], name="b_index"), ["b"]).take(np.array([0]))
+        assert_that(lazy._lookup_order is None, equal_to(True))
+        assert_that(lazy.get_positions(3).tolist(), equal_to([0]))
@@ -5,15 +5,15 @@ from helpers.example_metadata import ExampleMetadata
 from helpers.example_store import ExampleStore
 from typing import cast
 
-from hamcrest import assert_that, equal_to, is_, is_in
+from hamcrest import assert_that, equal_to, is_, is_in, same_instance
 from pandas import DataFrame
 from pytest import fail
 
 from tanuki.data_store.column import Column
 from tanuki.data_store.column_alias import ColumnAlias
 from tanuki.data_store.data_store import DataStore
-from tanuki.data_store.data_type import Boolean, Int64, String
-from tanuki.data_store.index.index import Index
+from tanuki.data_store.data_type import Boolean, Float64, Int64, String
+from tanuki.data_store.index.index import Index, IndexOptions, SecondaryIndex
 
 
 class TestDataStore:
@@ -167,6 +167,19 @@ class TestDataStore:
         expected = ExampleStore(a=["b", "c"], b=[2, 3], c=[False, True], index=[1, 2])
         assert_that(actual.equals(expected), is_(True))
 
+    def test_get_predicates(self) -> None:
+        actual = self.test_store[ExampleStore.a.isin(["a", "c", "x"])]
+        assert_that(actual.b.tolist(), equal_to([1, 3]))
+        actual = self.test_store[ExampleStore.b.between(2, 3)]
+        assert_that(actual.a.tolist(), equal_to(["b", "c"]))
+        actual = self.test_store[ExampleStore.a.startswith("b")]
+        assert_that(actual.b.tolist(), equal_to([2]))
+        store = ExampleStore(
+            a=["a", "b"], b=[1, 2], c=[True, False], d=[datetime.now(), None]
+        )
+        actual = store[ExampleStore.d.isnull()]
+        assert_that(actual.a.tolist(), equal_to(["b"]))
+
     def test_get_mask(self) -> None:
         mask = cast(Column, self.test_store.b > 1)
         actual = self.test_store[mask.values]
@@ -195,6 +208,21 @@ class TestDataStore:
         assert_that(test_slice.a_index.tolist(), equal_to(["a", "c"]))
         assert_that(test_slice.ab_index.tolist(), equal_to([("a", 1), ("c", 3)]))
 
+    def test_lazy_index(self) -> None:
+        store = ExampleStore(a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True])
+        assert_that("a_index" in store.__dict__, is_(False))
+        a_index = store.a_index
+        assert_that(store.a_index, same_instance(a_index))
+        assert_that(ExampleStore.a_index.name, equal_to("a_index"))
+
+        view = store[["a", "b"]]
+        assert_that(view.a_index, same_instance(a_index))
+        assert_that(store[["b", "c"]].a_index, is_(None))
+
+        view["a"] = ["x", "y", "z"]
+        assert_that(view.a_index.tolist(), equal_to(["x", "y", "z"]))
+        assert_that(store.a_index.tolist(), equal_to(["a", "b", "c"]))
+
     def test_invalid_index_reference(self) -> None:
         try:
             class TempStore(DataStore):
@@ -250,6 +278,45 @@ class TestDataStore:
                 is_in(str(e)),
             )
 
+    def test_secondary_index(self) -> None:
+        class SecondaryStore(DataStore, register=False):
+            a: Column[str]
+            b: Column[int]
+
+            a_index: SecondaryIndex[a]
+            b_index: Index[b] = IndexOptions(
+                unique=False, where=ColumnAlias(str, "a") == "x"
+            )
+
+        assert_that(SecondaryStore.a_index.unique, is_(False))
+        assert_that(SecondaryStore.a_index.where, is_(None))
+        assert_that(SecondaryStore.b_index.unique, is_(False))
+        assert_that(str(SecondaryStore.b_index.where), equal_to("a == x"))
+        assert_that(ExampleStore.a_index.unique, is_(True))
+
+    def test_invalid_secondary_index(self) -> None:
+        try:
+            class TempStore(DataStore, register=False):
+                a: Column[str]
+
+                a_index: SecondaryIndex[a] = IndexOptions(unique=True)
+
+            fail("Expected exception")
+        except Exception as e:
+            assert_that("SecondaryIndex 'a_index' cannot be unique", is_in(str(e)))
+
+        try:
+            class TempStore(DataStore, register=False):
+                a: Column[str]
+
+                a_index: SecondaryIndex[a] = IndexOptions(where="a == 'x'")
+
+            fail("Expected exception")
+        except Exception as e:
+            assert_that(
+                "Where clause of index 'a_index' must be a Query", is_in(str(e))
+            )
+
     def test_set_index(self) -> None:
         assert_that(self.test_store.index.tolist(), equal_to([0, 1, 2]))
 
@@ -449,6 +516,96 @@ class TestDataStore:
             assert_that(b, equal_to(iloc_row.b.item()))
             assert_that(c, equal_to(iloc_row.c.item()))
 
+    def test_agg(self) -> None:
+        totals = self.test_store.agg({"b": ["sum", "min", "max"], "c": "mean"})
+        assert_that([str(col) for col in totals.columns], equal_to(["b_sum", "b_min", "b_max", "c_mean"]))
+        assert_that(totals.dtypes["b_sum"], equal_to(Int64))
+        assert_that(totals.dtypes["c_mean"], equal_to(Float64))
+        assert_that(totals.b_sum.tolist(), equal_to([6]))
+        assert_that(totals.b_min.tolist(), equal_to([1]))
+        assert_that(totals.b_max.tolist(), equal_to([3]))
+
+        try:
+            self.test_store.agg({"b": "median"})
+            fail("Expected unknown aggregation to fail")
+        except ValueError:
+            pass
+
+    def test_groupby(self) -> None:
+        grouped = self.test_store.groupby(ExampleStore.c).agg(
+            {"b": ["sum", "count"], "a": "nunique"}
+        )
+        assert_that(type(grouped).__name__, equal_to("ExampleStoreAggregate"))
+        assert_that(grouped.dtypes["c"], equal_to(Boolean))
+        assert_that(grouped.c.tolist(), equal_to([False, True]))
+        assert_that(grouped.b_sum.tolist(), equal_to([2, 4]))
+        assert_that(grouped.b_count.tolist(), equal_to([1, 2]))
+        assert_that(grouped.a_nunique.tolist(), equal_to([1, 2]))
+
+    def test_column_reductions(self) -> None:
+        assert_that(self.test_store.b.sum(), equal_to(6))
+        assert_that(self.test_store.b.min(), equal_to(1))
+        assert_that(self.test_store.b.max(), equal_to(3))
+        assert_that(self.test_store.b.mean(), equal_to(2.0))
+        assert_that(self.test_store.b.count(), equal_to(3))
+        assert_that(self.test_store.c.nunique(), equal_to(2))
+
+    def test_sort_and_page(self) -> None:
+        test_store = ExampleStore(
+            a=["e", "b", "a", "d", "c"],
+            b=[3, 1, 3, 2, 5],
+            c=[True, False, True, True, False],
+            d=[datetime.now() for _ in range(5)],
+        )
+        top = test_store.sort_values(ExampleStore.b, ascending=False, limit=2)
+        assert_that(top.a.tolist(), equal_to(["c", "e"]))
+        assert_that(test_store.head(2).a.tolist(), equal_to(["e", "b"]))
+
+        first_page = test_store.page(size=2)
+        assert_that(first_page.a.tolist(), equal_to(["a", "b"]))
+        second_page = test_store.page(after=first_page.a.tolist()[-1], size=2)
+        assert_that(second_page.a.tolist(), equal_to(["c", "d"]))
+        last_page = test_store.page(after="d", size=2)
+        assert_that(last_page.a.tolist(), equal_to(["e"]))
+
+    def test_join(self) -> None:
+        now = datetime.now()
+        left = ExampleStore(
+            a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True], d=[now, now, now]
+        )
+        right = ExampleStore(
+            a=["c", "a", "x"], b=[30, 10, 40], c=[True, True, False], d=[now, now, now]
+        )[[ExampleStore.a, ExampleStore.b]]
+
+        joined = left.join(right, ExampleStore.a_index)
+        assert_that(type(joined).__name__, equal_to("ExampleStoreExampleStoreJoin"))
+        assert_that(
+            [str(col) for col in joined.columns],
+            equal_to(["a", "b", "c", "d", "b_right"]),
+        )
+        assert_that(joined.dtypes["b_right"], equal_to(Int64))
+        assert_that(joined.a.tolist(), equal_to(["a", "c"]))
+        assert_that(joined.b_right.tolist(), equal_to([10, 30]))
+
+        joined = left.join(right, "a", how="left")
+        assert_that(joined.a.tolist(), equal_to(["a", "b", "c"]))
+        assert_that(joined.to_pandas()["b_right"].isna().tolist(), equal_to([False, True, False]))
+
+        try:
+            left.join(right, "c")
+            fail("Expected join on a missing column to fail")
+        except ValueError:
+            pass
+
+    def test_setitem(self) -> None:
+        test_store = ExampleStore(
+            a=["a", "b"], b=[1, 2], c=[True, False], d=[datetime.now(), datetime.now()]
+        )
+        test_store["b"] = [3, 4]
+        assert_that(test_store.b.tolist(), equal_to([3, 4]))
+        test_store[ExampleStore.c] = test_store.c.tolist()[::-1]
+        assert_that(test_store.c.tolist(), equal_to([False, True]))
+
     def test_str(self) -> None:
         expected = "ExampleStore\n       a  b      c\nindex             \n0      a  1   True\n1      b  2  False\n2      c  3   True"
         assert_that(str(self.test_store), equal_to(expected))
@@ -0,0 +1,327 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import shutil
+import tempfile
+
+import numpy as np
+from precisely import assert_that, equal_to, not_
+from pytest import fail
+
+from helpers.example_metadata import ExampleMetadata
+from helpers.example_store import ExampleStore
+from helpers.sqlite3_container import Sqlite3Container
+from tanuki.data_store.column import Column
+from tanuki.data_store.data_store import DataStore
+from tanuki.database.adapter.mmap.mmap_adapter import MmapAdapter
+from tanuki.database.adapter.upsert_result import UpsertResult
+from tanuki.database.data_token import DataToken
+from tanuki.database.db_exceptions import DatabaseAdapterUsageError
+
+
+class TestMmapAdapter:
+    db_dir: Sqlite3Container
+    db_adapter: MmapAdapter
+
+    def setup_method(self) -> None:
+        self.tmp_db_dir = Path(tempfile.gettempdir()) / "tanuki_test"
+        if self.tmp_db_dir.exists():
+            shutil.rmtree(self.tmp_db_dir, ignore_errors=True)
+        self.db_dir = Sqlite3Container(self.tmp_db_dir)
+        self.db_dir.start()
+        self.db_adapter = MmapAdapter(self.db_dir.connection_config())
+        self.now = datetime.now()
+        self.test_store = ExampleStore(
+            a=["a", "b", "c"],
+            b=[1, 2, 3],
+            c=[True, False, True],
+            d=[self.now, self.now, self.now],
+        )
+
+    def teardown_method(self) -> None:
+        self.db_adapter.stop()
+        self.db_dir.stop()
+
+    def _create_table(self) -> None:
+        token = ExampleStore.data_token
+        self.db_adapter.create_group(token.data_group)
+        self.db_adapter.create_group_table(token, ExampleStore)
+
+    def test_invalid_usage(self) -> None:
+        try:
+            self.db_adapter.has_group(ExampleStore.data_token.data_group)
+            fail("Expected exception")
+        except DatabaseAdapterUsageError as e:
+            assert_that(
+                str(e),
+                equal_to(
+                    "Data adapter wasn't opened before method call: 'has_group'\nUse 'with adapter:'"
+                ),
+            )
+
+    def test_exception_rollback(self) -> None:
+        token = ExampleStore.data_token
+        try:
+            with self.db_adapter:
+                self._create_table()
+                self.db_adapter.insert(token, self.test_store)
+                assert_that(self.db_adapter.has_group_table(token), equal_to(True))
+                raise RuntimeError("Failed write")
+        except RuntimeError:
+            pass
+
+        with self.db_adapter:
+            assert_that(self.db_adapter.has_group(token.data_group), equal_to(False))
+            assert_that(self.db_adapter.has_group_table(token), equal_to(False))
+
+    def test_table_persistance(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+
+        self.db_adapter.stop()
+        self.db_adapter = MmapAdapter(self.db_dir.connection_config())
+
+        with self.db_adapter:
+            assert_that(self.db_adapter.has_group_table(token), equal_to(True))
+            assert_that(self.db_adapter.row_count(token), equal_to(3))
+
+    def test_drop_group_table(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            test_metadata = ExampleMetadata(
+                test_str="test",
+                test_int=123,
+                test_float=0.123,
+                test_bool=True,
+                test_timestamp=datetime.now(),
+            )
+            self.db_adapter._update_group_table_metadata(token, test_metadata)
+            assert_that(
+                self.db_adapter.get_group_table_metadata(token, ExampleMetadata),
+                not_(equal_to(None)),
+            )
+
+            self.db_adapter.drop_group_table(token)
+
+            assert_that(self.db_adapter.has_group(token.data_group), equal_to(True))
+            assert_that(self.db_adapter.has_group_table(token), equal_to(False))
+            assert_that(
+                self.db_adapter.get_group_table_metadata(token, ExampleMetadata),
+                equal_to(None),
+            )
+
+    def test_create_index(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            assert_that(
+                self.db_adapter.has_index(token, ExampleStore.ab_index), equal_to(False)
+            )
+            self.db_adapter.create_index(token, ExampleStore.ab_index)
+            assert_that(
+                self.db_adapter.has_index(token, ExampleStore.ab_index), equal_to(True)
+            )
+
+    def test_insert_query(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+            self.db_adapter.insert(token, self.test_store)
+
+            assert_that(self.db_adapter.row_count(token), equal_to(6))
+            rows = self.db_adapter.query(token, ExampleStore.b >= 2, ["a", "b"])
+            assert_that(rows, equal_to([("b", 2), ("c", 3), ("b", 2), ("c", 3)]))
+
+            positions = self.db_adapter.sort_positions(token, ["b"], False, limit=3)
+            assert_that(positions, equal_to([2, 5, 1]))
+            positions = self.db_adapter.sort_positions(
+                token, ["b", "a"], [True, False], ExampleStore.b >= 2
+            )
+            assert_that(positions, equal_to([0, 2, 1, 3]))
+
+    def test_read_columns(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+
+            columns = self.db_adapter.read_columns(token, ["b", "c"])
+            assert_that(isinstance(columns["b"], np.memmap), equal_to(True))
+            assert_that(columns["b"].tolist(), equal_to([1, 2, 3]))
+            assert_that(columns["c"].tolist(), equal_to([True, False, True]))
+
+    def test_update_upsert_delete(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+
+            update = ExampleStore(a=["b"], b=[2], c=[True], d=[self.now])
+            self.db_adapter.update(token, update, ["a", "b"])
+            upsert = ExampleStore(
+                a=["a", "e"], b=[1, 5], c=[False, True], d=[self.now, self.now]
+            )
+            result = self.db_adapter.upsert(token, upsert, ["a", "b"])
+            assert_that(result, equal_to(UpsertResult(inserted=1, updated=1)))
+            self.db_adapter.delete(token, ExampleStore.a == "c")
+
+            rows = self.db_adapter.query(token, columns=["a", "b", "c"])
+            assert_that(
+                rows,
+                equal_to([("a", 1, False), ("b", 2, True), ("e", 5, True)]),
+            )
+
+    def test_delete_keys(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+
+            keys = ExampleStore(a=["a", "c", "d"], b=[1, 2, 4])
+            deleted = self.db_adapter.delete_keys(token, keys, ["a", "b"])
+            assert_that(deleted, equal_to(1))
+            rows = self.db_adapter.query(token, columns=["a", "b"])
+            assert_that(rows, equal_to([("b", 2), ("c", 3)]))
+
+    def test_chunk_pruning(self) -> None:
+        token = ExampleStore.data_token
+        self.db_adapter = MmapAdapter(self.db_dir.connection_config(), chunk_size=2)
+        start = datetime(2021, 1, 1)
+        times = [start + timedelta(days=i) for i in range(6)]
+        store = ExampleStore(
+            a=["a", "b", "c", "d", "e", "f"],
+            b=[0, 1, 2, 3, 4, 5],
+            c=[True] * 6,
+            d=times,
+        )
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, store)
+
+            table = self.db_adapter._table(token)
+            assert_that(table.chunks, equal_to([(0, 2), (2, 4), (4, 6)]))
+            assert_that(table.chunk_stats(1)["d"]["min"], equal_to(times[2]))
+            assert_that(
+                table.matching_chunks(ExampleStore.d > times[3]), equal_to([2])
+            )
+            assert_that(
+                table.matching_chunks(
+                    (ExampleStore.b <= 2) & (ExampleStore.a == "b")
+                ),
+                equal_to([0]),
+            )
+            assert_that(
+                table.matching_chunks(
+                    (ExampleStore.b == 0) | (ExampleStore.b == 5)
+                ),
+                equal_to([0, 2]),
+            )
+
+            rows = self.db_adapter.query(token, ExampleStore.d >= times[4], ["a"])
+            assert_that(rows, equal_to([("e",), ("f",)]))
+            rows = self.db_adapter.query(token, ExampleStore.b > 10, ["a"])
+            assert_that(rows, equal_to([]))
+
+    def test_append_fills_chunks(self) -> None:
+        token = ExampleStore.data_token
+        self.db_adapter = MmapAdapter(self.db_dir.connection_config(), chunk_size=4)
+        start = datetime(2021, 1, 1)
+        with self.db_adapter:
+            self._create_table()
+            for i in range(6):
+                self.db_adapter.insert(
+                    token,
+                    ExampleStore(
+                        a=[str(5 - i)], b=[i], c=[True], d=[start + timedelta(days=i)]
+                    ),
+                )
+            self.db_adapter.insert(token, ExampleStore(a=["x"], b=[None]))
+
+            table = self.db_adapter._table(token)
+            assert_that(table.chunks, equal_to([(0, 4), (4, 7)]))
+            stats = table.chunk_stats(0)
+            assert_that(stats["a"]["min"], equal_to("2"))
+            assert_that(stats["a"]["max"], equal_to("5"))
+            assert_that(stats["b"]["max"], equal_to(3))
+            assert_that(stats["d"]["max"], equal_to(start + timedelta(days=3)))
+            stats = table.chunk_stats(1)
+            assert_that(stats["b"]["min"], equal_to(4))
+            assert_that(stats["b"]["nulls"], equal_to(1))
+            assert_that(stats["d"]["nulls"], equal_to(1))
+            assert_that(
+                table.matching_chunks(ExampleStore.b == 5), equal_to([1])
+            )
+            rows = self.db_adapter.query(token, ExampleStore.a <= "1", ["b"])
+            assert_that(rows, equal_to([(4,), (5,)]))
+
+    def test_nullable_columns(self) -> None:
+        token = DataToken("nullable", ExampleStore.data_token.data_group)
+        with self.db_adapter:
+            self.db_adapter.create_group(token.data_group)
+            self.db_adapter.create_group_table(token, NullableStore)
+            self.db_adapter.insert(token, NullableStore(a=["a"], x=[1.5], b=[1]))
+            self.db_adapter.insert(
+                token, NullableStore(a=["b", "c"], x=[np.nan, 2.5], b=[None, 3])
+            )
+
+            table = self.db_adapter._table(token)
+            assert_that(isinstance(table.read_column("x"), np.memmap), equal_to(True))
+            assert_that(table._schema["columns"]["b"]["format"], equal_to("raw"))
+            assert_that(table.read_column("b").tolist(), equal_to([1, None, 3]))
+            rows = self.db_adapter.query(token, columns=["x"])
+            assert_that(np.isnan(rows[1][0]), equal_to(True))
+
+    def test_append_rollback(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+        try:
+            with self.db_adapter:
+                self.db_adapter.insert(token, self.test_store)
+                self.db_adapter.insert(token, ExampleStore(a=["d"], b=[None]))
+                checkpoint = self.db_adapter._checkpoint_dir / "0" / "b.col"
+                column = self.db_adapter._table_path(token) / "b.col"
+                assert_that(checkpoint.stat().st_ino, equal_to(column.stat().st_ino))
+                raise RuntimeError("Failed write")
+        except RuntimeError:
+            pass
+
+        with self.db_adapter:
+            table = self.db_adapter._table(token)
+            assert_that(table.row_count, equal_to(3))
+            assert_that(table.read_column("b").tolist(), equal_to([1, 2, 3]))
+            assert_that(table.read_column("a").tolist(), equal_to(["a", "b", "c"]))
+            assert_that(table._has_nulls("b"), equal_to(False))
+            self.db_adapter.insert(token, ExampleStore(a=["d"], b=[4], c=[True]))
+            assert_that(table._path.joinpath("b.col").stat().st_size, equal_to(32))
+
+
+    def test_append_pickle_column(self) -> None:
+        token = ExampleStore.data_token
+        with self.db_adapter:
+            self._create_table()
+            self.db_adapter.insert(token, self.test_store)
+            table = self.db_adapter._table(token)
+            column = table._path / "a.pkl"
+            written = column.read_bytes()
+            self.db_adapter.insert(token, ExampleStore(a=["d", "e"], b=[4, 5]))
+            self.db_adapter.insert(token, ExampleStore(a=["f"], b=[6]))
+
+            assert_that(column.read_bytes()[: len(written)], equal_to(written))
+            table = self.db_adapter._table(token)
+            assert_that(
+                table.read_column("a").tolist(),
+                equal_to(["a", "b", "c", "d", "e", "f"]),
+            )
+            rows = self.db_adapter.query(token, ExampleStore.a >= "e", ["a", "b"])
+            assert_that(rows, equal_to([("e", 5), ("f", 6)]))
+
+
+class NullableStore(DataStore, register=False):
+    a: Column[str]
+    x: Column[float]
+    b: Column[int]
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from hamcrest import assert_that, equal_to
+import numpy as np
+from pandas import DataFrame
+
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    BetweenQuery,
+    EqualsQuery,
+    GreaterThanQuery,
+    InQuery,
+    IsNullQuery,
+    LessEqualQuery,
+    NotEqualsQuery,
+    NotQuery,
+    OrGroupQuery,
+    RowInQuery,
+    StartsWithQuery,
+)
+from tanuki.database.adapter.query.pandas_query_compiler import PandasQueryCompiler
+
+
+class TestPandasQueryCompiler:
+    def setup_method(self) -> None:
+        self.frame = DataFrame(
+            {
+                "a": ["a", "b", None, "d", "e"],
+                "b": [1, 2, 3, 4, 5],
+                "c": [1.5, np.nan, 0.5, 2.5, 3.5],
+                "d": [datetime(2021, 1, day) for day in range(1, 6)],
+            }
+        )
+        self.compiler = PandasQueryCompiler(self.frame)
+
+    def test_select(self) -> None:
+        queries = [
+            EqualsQuery("a", "b"),
+            NotEqualsQuery("a", "b"),
+            GreaterThanQuery("c", 1.0),
+            LessEqualQuery("d", datetime(2021, 1, 3)),
+            InQuery("b", [2, 4, 9]),
+            RowInQuery(["a", "b"], [("a", 1), ("d", 3)]),
+            AndGroupQuery([GreaterThanQuery("b", 1), GreaterThanQuery("c", 1.0)]),
+            OrGroupQuery([EqualsQuery("a", "a"), GreaterThanQuery("b", 4)]),
+            NotQuery(OrGroupQuery([EqualsQuery("a", "a"), EqualsQuery("b", 5)])),
+            BetweenQuery("b", 2, 4),
+            BetweenQuery("c", 1.0, 3.0),
+            StartsWithQuery("a", "b"),
+            IsNullQuery("c"),
+            IsNullQuery("a"),
+            AndGroupQuery(
+                [
+                    OrGroupQuery([EqualsQuery("b", 1), GreaterThanQuery("c", 2.0)]),
+                    NotEqualsQuery("b", 4),
+                ]
+            ),
+        ]
+        for query in queries:
+            expected = np.flatnonzero(self.compiler.compile(query).fillna(False))
+            selected = self.compiler.select(query)
+            assert_that(selected.tolist(), equal_to(expected.tolist()))
+
+    def test_select_constant(self) -> None:
+        assert_that(self.compiler.select(True).tolist(), equal_to([0, 1, 2, 3, 4]))
+        assert_that(self.compiler.select(False).tolist(), equal_to([]))
+
+    def test_select_sorted(self) -> None:
+        frame = DataFrame({"a": ["a", "ab", "abc", "b", "c"], "b": [1, 2, 3, 4, 5]})
+        compiler = PandasQueryCompiler(frame)
+        selected = compiler.select(StartsWithQuery("a", "ab"))
+        assert_that(selected.tolist(), equal_to([1, 2]))
+        selected = compiler.select(BetweenQuery("b", 2, 4))
+        assert_that(selected.tolist(), equal_to([1, 2, 3]))
+
+    def test_select_narrows(self) -> None:
+        frame = DataFrame({"t": ["s"] * 15 + ["n", "n"], "v": ["x"] * 15 + [1, 3]})
+        query = AndGroupQuery([EqualsQuery("t", "n"), GreaterThanQuery("v", 2)])
+        selected = PandasQueryCompiler(frame).select(query)
+        assert_that(selected.tolist(), equal_to([16]))
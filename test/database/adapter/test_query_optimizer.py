@@ -0,0 +1,86 @@
+import time
+
+from helpers.example_store import ExampleStore
+from hamcrest import assert_that, equal_to, instance_of, is_, none
+
+from tanuki.data_store.query import (
+    AndGroupQuery,
+    EqualsQuery,
+    InQuery,
+    OrGroupQuery,
+)
+from tanuki.database.adapter.query.query_optimizer import QueryOptimizer
+
+
+class TestQueryOptimizer:
+    def setup_method(self) -> None:
+        self.optimizer = QueryOptimizer()
+
+    def test_flatten_and_dedupe(self) -> None:
+        query = (ExampleStore.b > 1) & (
+            (ExampleStore.a == "a") & (ExampleStore.b > 1)
+        )
+        result = self.optimizer.optimize(query)
+        assert_that(result, instance_of(AndGroupQuery))
+        assert_that(str(result), equal_to("(a == a and b > 1)"))
+
+    def test_orders_by_selectivity(self) -> None:
+        query = AndGroupQuery(
+            [ExampleStore.b != 2, ExampleStore.b < 10, ExampleStore.a == "a"]
+        )
+        result = self.optimizer.optimize(query)
+        assert_that(str(result), equal_to("(a == a and b < 10 and b != 2)"))
+
+    def test_constant_fold(self) -> None:
+        true_query = AndGroupQuery([EqualsQuery(1, 1), ExampleStore.b > 1])
+        assert_that(str(self.optimizer.optimize(true_query)), equal_to("b > 1"))
+        assert_that(self.optimizer.optimize(EqualsQuery(1, 1)), is_(none()))
+
+        false_query = OrGroupQuery([EqualsQuery(1, 2), ExampleStore.b > 1])
+        assert_that(str(self.optimizer.optimize(false_query)), equal_to("b > 1"))
+
+        always_false = AndGroupQuery([EqualsQuery(1, 2), ExampleStore.b > 1])
+        assert_that(self.optimizer.optimize(always_false), is_(always_false))
+
+    def test_or_equalities_to_in(self) -> None:
+        query = (
+            (ExampleStore.a == "a")
+            | (ExampleStore.b > 3)
+            | (ExampleStore.a == "b")
+            | (ExampleStore.a == "a")
+        )
+        result = self.optimizer.optimize(query)
+        assert_that(result, instance_of(OrGroupQuery))
+        assert_that(result.items[0], instance_of(InQuery))
+        assert_that(result.items[0].b, equal_to(["a", "b"]))
+        assert_that(str(result.items[1]), equal_to("b > 3"))
+
+        single = self.optimizer.optimize(
+            (ExampleStore.a == "a") | (ExampleStore.a == "c")
+        )
+        assert_that(single, instance_of(InQuery))
+
+    def test_results_unchanged(self) -> None:
+        store = ExampleStore(
+            a=["a", "b", "c", "d"],
+            b=[1, 2, 3, 4],
+            c=[True, False, True, False],
+            d=[None, None, None, None],
+        )
+        query = (
+            ((ExampleStore.a == "a") | (ExampleStore.a == "c") | (ExampleStore.b == 2))
+            & (ExampleStore.b < 4)
+            & EqualsQuery(1, 1)
+        )
+        result = store.query(query)
+        assert_that(result.a.tolist(), equal_to(["a", "b", "c"]))
+
+    def test_large_in_dedupe(self) -> None:
+        keys = [f"k{i}" for i in range(50000)]
+        start = time.perf_counter()
+        result = self.optimizer.optimize(ExampleStore.a.isin(keys + keys[:10]))
+        assert_that(time.perf_counter() - start < 1.0, is_(True))
+        assert_that(result.b, equal_to(keys))
+
+        unhashable = self.optimizer.optimize(ExampleStore.a.isin([[1], [2], [1]]))
+        assert_that(unhashable.b, equal_to([[1], [2]]))
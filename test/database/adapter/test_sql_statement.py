@@ -2,6 +2,20 @@ from pytest import fail
 from hamcrest import assert_that, equal_to
 
 
+from tanuki.database.adapter.statement.sql_statement import SqlStatement
+
+
 class TestSqlStatement:
-    pass
+    def test_join(self) -> None:
+        statement = (
+            SqlStatement()
+            .SELECT("l.a", "r.b")
+            .FROM("raw.left AS l")
+            .JOIN("raw.right AS r", "l.a = r.a", "LEFT")
+            .compile()
+        )
+        assert_that(
+            statement,
+            equal_to("SELECT l.a, r.b FROM raw.left AS l LEFT JOIN raw.right AS r ON l.a = r.a;"),
+        )
     
\ No newline at end of file
@@ -10,7 +10,10 @@ from helpers.example_metadata import ExampleMetadata
 from helpers.example_store import ExampleStore, RAW_GROUP
 from helpers.mock_backend import MockBackend
 from helpers.sqlite3_container import Sqlite3Container
+from tanuki.data_store.index.index_alias import IndexAlias
+from tanuki.data_store.query import InQuery, NotQuery, RowInQuery
 from tanuki.database.adapter.sqlite3.sqlite3_adapter import Sqlite3Adapter
+from tanuki.database.adapter.upsert_result import UpsertResult
 from tanuki.database.data_token import DataToken
 from tanuki.database.db_exceptions import DatabaseAdapterUsageError
 
@@ -209,6 +212,39 @@ class TestSqlite3Adapter:
             )
             self.db_adapter.insert(ExampleStore.data_token, test1)
 
+    def test_create_secondary_index(self) -> None:
+        b_index = IndexAlias("b_index", [ExampleStore.b], unique=False)
+        partial_index = IndexAlias(
+            "c_index", [ExampleStore.c], unique=False, where=ExampleStore.a == "a"
+        )
+        with self.db_adapter:
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.create_index(ExampleStore.data_token, b_index)
+            self.db_adapter.create_index(ExampleStore.data_token, partial_index)
+            test1 = ExampleStore(a=["a", "b", "a"], b=[1, 1, 2], c=[True, False, True])
+            self.db_adapter.insert(ExampleStore.data_token, test1)
+
+            assert_that(
+                self.db_adapter.has_index(ExampleStore.data_token, b_index),
+                equal_to(True),
+            )
+            assert_that(
+                self.db_adapter.has_index(ExampleStore.data_token, partial_index),
+                equal_to(True),
+            )
+            unique_index = IndexAlias("b_index", [ExampleStore.b])
+            assert_that(
+                self.db_adapter.has_index(ExampleStore.data_token, unique_index),
+                equal_to(False),
+            )
+
+            plan = self.db_adapter.explain(ExampleStore.data_token, ExampleStore.b == 1)
+            assert_that(plan.uses_index("test_b_index"), equal_to(True))
+            query = (ExampleStore.a == "a") & (ExampleStore.c == True)
+            plan = self.db_adapter.explain(ExampleStore.data_token, query)
+            assert_that(plan.uses_index("test_c_index"), equal_to(True))
+
     def test_group_table_metadata_path(self) -> None:
         expected = self.tmp_db_dir / "metadata" / "raw" / "test.json"
         actual = self.db_adapter._group_table_metadata_path(ExampleStore.data_token)
@@ -382,6 +418,36 @@ class TestSqlite3Adapter:
             test2 = ExampleStore(a=["a", "b", "c"], b=[1, 4, 3], c=[True, True, True])
             assert_that(queried2.equals(test2), equal_to(True))
 
+    def test_update_from_staged_values(self) -> None:
+        with self.db_adapter:
+            test1 = ExampleStore(a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True])
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test1)
+
+            test2 = ExampleStore(
+                a=["b", "c", "c", "d"], b=[2, 3, 3, 4], c=[True, True, False, True]
+            )
+            self.db_adapter.update(
+                ExampleStore.data_token, test2, ExampleStore.ab_index.columns
+            )
+            raw1 = self.db_adapter.query(
+                ExampleStore.data_token, columns=["a", "b", "c"]
+            )
+            expected = [("a", 1, 1), ("b", 2, 1), ("c", 3, 0)]
+            assert_that(raw1, equal_to(expected))
+
+            self.db_adapter.UPDATE_FROM_VERSION = (99, 0, 0)
+            test3 = ExampleStore(a=["a"], b=[1], c=[False])
+            self.db_adapter.update(
+                ExampleStore.data_token, test3, ExampleStore.ab_index.columns
+            )
+            raw2 = self.db_adapter.query(
+                ExampleStore.data_token, columns=["a", "b", "c"]
+            )
+            expected = [("a", 1, 0), ("b", 2, 1), ("c", 3, 0)]
+            assert_that(raw2, equal_to(expected))
+
     def test_update_from_link(self) -> None:
         with self.db_adapter:
             test1 = ExampleStore(a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True])
@@ -487,6 +553,53 @@ class TestSqlite3Adapter:
             )
             assert_that(queried2.equals(test2), equal_to(True))
 
+    def test_upsert_result(self) -> None:
+        with self.db_adapter:
+            now = datetime(2021, 1, 1)
+            test1 = ExampleStore(a=["a", "b"], b=[1, 2], c=[True, False], d=[now, now])
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.create_index(ExampleStore.data_token, ExampleStore.a_index)
+            self.db_adapter.insert(ExampleStore.data_token, test1)
+
+            later = datetime(2021, 1, 2)
+            test2 = ExampleStore(
+                a=["b", "e", "b"], b=[4, 5, 6], c=[True, False, True], d=[later] * 3
+            )
+            result = self.db_adapter.upsert(
+                ExampleStore.data_token, test2, [ExampleStore.a]
+            )
+            assert_that(result, equal_to(UpsertResult(inserted=1, updated=1)))
+
+            queried = ExampleStore.from_rows(
+                self.db_adapter.query(ExampleStore.data_token)
+            )
+            expected = ExampleStore(
+                a=["a", "b", "e"], b=[1, 6, 5], c=[True, True, False], d=[now, later, later]
+            )
+            assert_that(queried.equals(expected), equal_to(True))
+
+    def test_upsert_result_with_change_log(self) -> None:
+        with self.db_adapter:
+            test1 = ExampleStore(a=["a", "b"], b=[1, 2], c=[True, False])
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.create_index(ExampleStore.data_token, ExampleStore.a_index)
+            self.db_adapter.create_change_log(ExampleStore.data_token, ["a"])
+            self.db_adapter.insert(ExampleStore.data_token, test1)
+
+            test2 = ExampleStore(a=["b", "e"], b=[4, 5], c=[True, False])
+            result = self.db_adapter.upsert(
+                ExampleStore.data_token, test2, [ExampleStore.a]
+            )
+            assert_that(result, equal_to(UpsertResult(inserted=1, updated=1)))
+
+            test3 = ExampleStore(a=["e", "f"])
+            result = self.db_adapter.upsert(
+                ExampleStore.data_token, test3, [ExampleStore.a]
+            )
+            assert_that(result, equal_to(UpsertResult(inserted=1, updated=0)))
+
     def test_delete(self) -> None:
         with self.db_adapter:
             test1 = ExampleStore(a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True])
@@ -503,3 +616,225 @@ class TestSqlite3Adapter:
             queried2 = ExampleStore.from_rows(raw2)
             test2 = ExampleStore(a=["a", "c"], b=[1, 3], c=[True, True])
             assert_that(queried2.equals(test2), equal_to(True))
+
+    def test_delete_keys(self) -> None:
+        with self.db_adapter:
+            test1 = ExampleStore(a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True])
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test1)
+
+            keys = ExampleStore(a=["a", "c", "c", "d"], b=[1, 2, 3, 4])
+            deleted = self.db_adapter.delete_keys(
+                ExampleStore.data_token, keys, ExampleStore.ab_index.columns
+            )
+            assert_that(deleted, equal_to(2))
+            raw = self.db_adapter.query(ExampleStore.data_token, columns=["a", "b"])
+            assert_that(raw, equal_to([("b", 2)]))
+
+    def test_change_log(self) -> None:
+        with self.db_adapter:
+            test1 = ExampleStore(a=["a", "b"], b=[1, 2], c=[True, False])
+            token = ExampleStore.data_token
+            self.db_adapter.create_group(token.data_group)
+            self.db_adapter.create_group_table(token, ExampleStore)
+            self.db_adapter.insert(token, test1)
+            self.db_adapter.create_change_log(token, ["a", "b"])
+            assert_that(self.db_adapter.has_change_log(token), equal_to(True))
+            assert_that(self.db_adapter.change_log_keys(token), equal_to(["a", "b"]))
+            assert_that(self.db_adapter.change_version(token), equal_to(0))
+
+            self.db_adapter.insert(token, ExampleStore(a=["c"], b=[3], c=[True]))
+            self.db_adapter.update(token, ExampleStore(a=["a"], c=[False]), ["a"])
+            self.db_adapter.update(token, ExampleStore(a=["b"], b=[5]), ["a"])
+            self.db_adapter.delete(token, ExampleStore.a == "c")
+            assert_that(self.db_adapter.change_version(token), equal_to(5))
+            assert_that(
+                self.db_adapter.read_changes(token, 1),
+                equal_to(
+                    [
+                        (2, "update", "a", 1),
+                        (3, "delete", "b", 2),
+                        (4, "insert", "b", 5),
+                        (5, "delete", "c", 3),
+                    ]
+                ),
+            )
+
+            self.db_adapter.drop_change_log(token)
+            assert_that(self.db_adapter.has_change_log(token), equal_to(False))
+            self.db_adapter.delete(token, ExampleStore.a == "a")
+
+    def test_query_window(self) -> None:
+        with self.db_adapter:
+            test = ExampleStore(
+                a=["a", "b", "c", "d"], b=[1, 2, 3, 4], c=[True, False, True, False]
+            )
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+            self.db_adapter.delete(ExampleStore.data_token, ExampleStore.b == 1)
+
+            token = ExampleStore.data_token
+            window = self.db_adapter.query(token, columns=["a"], offset=1, limit=2)
+            assert_that(window, equal_to([("c",), ("d",)]))
+            window = self.db_adapter.query(token, columns=["a"], offset=2)
+            assert_that(window, equal_to([("d",)]))
+
+            rows = self.db_adapter.query(token, columns=["a"], rows=[0, 2])
+            assert_that(rows, equal_to([("b",), ("d",)]))
+            rows = self.db_adapter.query(
+                token, ExampleStore.c == False, ["a"], rows=[1]
+            )
+            assert_that(rows, equal_to([("d",)]))
+
+            self.db_adapter.STAGING_THRESHOLD = 1
+            rows = self.db_adapter.query(token, columns=["a", "b"], rows=[0, 2])
+            assert_that(rows, equal_to([("b", 2), ("d", 4)]))
+
+    def test_aggregate(self) -> None:
+        with self.db_adapter:
+            test = ExampleStore(
+                a=["a", "b", "c", "d"], b=[1, 2, 3, 4], c=[True, False, True, False]
+            )
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+
+            token = ExampleStore.data_token
+            totals = self.db_adapter.aggregate(token, {"b": ["sum", "mean"]}, [])
+            assert_that(totals, equal_to([(10, 2.5)]))
+
+            grouped = self.db_adapter.aggregate(
+                token, {"b": ["max", "count"], "a": ["nunique"]}, ["c"], ExampleStore.b > 1
+            )
+            assert_that(grouped, equal_to([(0, 4, 2, 2), (1, 3, 1, 1)]))
+
+    def test_query_order(self) -> None:
+        with self.db_adapter:
+            test = ExampleStore(
+                a=["a", "b", "c", "d"], b=[2, 1, 2, 3], c=[True, False, True, False]
+            )
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+
+            token = ExampleStore.data_token
+            rows = self.db_adapter.query(
+                token, columns=["a"], order_by=["b"], ascending=False, limit=3
+            )
+            assert_that(rows, equal_to([("d",), ("a",), ("c",)]))
+            rows = self.db_adapter.query(
+                token, ExampleStore.c == True, ["a"], order_by=["b", "a"], ascending=[True, False]
+            )
+            assert_that(rows, equal_to([("c",), ("a",)]))
+
+            positions = self.db_adapter.sort_positions(token, ["b"], False, limit=3)
+            assert_that(positions, equal_to([3, 0, 2]))
+            positions = self.db_adapter.sort_positions(
+                token, ["b", "a"], [True, False], ExampleStore.c == True
+            )
+            assert_that(positions, equal_to([1, 0]))
+
+    def test_query_membership(self) -> None:
+        with self.db_adapter:
+            size = Sqlite3Adapter.STAGING_THRESHOLD + 10
+            test = ExampleStore(
+                a=[f"a{i}" for i in range(size)],
+                b=list(range(size)),
+                c=[i % 2 == 0 for i in range(size)],
+            )
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+
+            token = ExampleStore.data_token
+            query = InQuery("b", [1, 3, 5])
+            rows = self.db_adapter.query(token, query, ["a"])
+            assert_that(rows, equal_to([("a1",), ("a3",), ("a5",)]))
+
+            query = RowInQuery(["a", "b"], [("a1", 1), ("a2", 3)])
+            rows = self.db_adapter.query(token, query, ["a"])
+            assert_that(rows, equal_to([("a1",)]))
+            count = self.db_adapter.row_count(token, NotQuery(query))
+            assert_that(count, equal_to(size - 1))
+
+            keys = [(f"a{i}", i) for i in range(0, size, 2)]
+            query = RowInQuery(["a", "b"], keys)
+            assert_that(self.db_adapter.row_count(token, query), equal_to(len(keys)))
+            query = InQuery("b", list(range(1, size, 2)))
+            assert_that(
+                self.db_adapter.row_count(token, query), equal_to(size - len(keys))
+            )
+
+    def test_query_predicates(self) -> None:
+        with self.db_adapter:
+            test = ExampleStore(
+                a=["apple", "apricot", "banana", "cherry"],
+                b=[1, 2, 3, 4],
+                c=[True, False, None, True],
+            )
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+
+            token = ExampleStore.data_token
+            query = ExampleStore.a.isin(["banana", "cherry", "kiwi"])
+            rows = self.db_adapter.query(token, query, ["b"], order_by=["b"])
+            assert_that(rows, equal_to([(3,), (4,)]))
+            query = ExampleStore.b.between(2, 3)
+            rows = self.db_adapter.query(token, query, ["b"], order_by=["b"])
+            assert_that(rows, equal_to([(2,), (3,)]))
+            query = ExampleStore.a.startswith("ap")
+            rows = self.db_adapter.query(token, query, ["b"], order_by=["b"])
+            assert_that(rows, equal_to([(1,), (2,)]))
+            query = ExampleStore.c.isnull()
+            rows = self.db_adapter.query(token, query, ["b"], order_by=["b"])
+            assert_that(rows, equal_to([(3,)]))
+
+    def test_explain(self) -> None:
+        with self.db_adapter:
+            test = ExampleStore(a=["a", "b"], b=[1, 2], c=[True, False])
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.create_index(ExampleStore.data_token, ExampleStore.a_index)
+            self.db_adapter.insert(ExampleStore.data_token, test)
+
+            token = ExampleStore.data_token
+            plan = self.db_adapter.explain(token, ExampleStore.a == "a")
+            assert_that(plan.statement, equal_to("SELECT * FROM raw.test WHERE a='a';"))
+            assert_that(len(plan.full_scans()), equal_to(0))
+            seek = plan.index_seeks(str(token))[0]
+            assert_that(seek.index, equal_to("test_a_index"))
+
+            plan = self.db_adapter.explain(token, ExampleStore.b > 1, order_by=["b"])
+            scan = plan.full_scans(str(token))[0]
+            assert_that(scan.table, equal_to("raw.test"))
+            assert_that(scan.index, equal_to(None))
+
+    def test_join(self) -> None:
+        with self.db_adapter:
+            left = ExampleStore(
+                a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True]
+            )
+            right = ExampleStore(
+                a=["c", "a", "x"], b=[30, 10, 40], c=[True, True, False]
+            )
+            right_token = DataToken("right", ExampleStore.data_token.data_group)
+            self.db_adapter.create_group(ExampleStore.data_token.data_group)
+            self.db_adapter.create_group_table(ExampleStore.data_token, ExampleStore)
+            self.db_adapter.create_group_table(right_token, ExampleStore)
+            self.db_adapter.insert(ExampleStore.data_token, left)
+            self.db_adapter.insert(right_token, right)
+
+            rows = self.db_adapter.join(
+                ExampleStore.data_token, right_token, ["a"], "inner",
+                None, None, ["a", "b"], ["a", "b"],
+            )
+            assert_that(rows, equal_to([("a", 1, 10), ("c", 3, 30)]))
+            rows = self.db_adapter.join(
+                ExampleStore.data_token, right_token, ["a"], "right",
+                ExampleStore.b > 1, None, ["a", "b"], ["a", "b"],
+            )
+            assert_that(rows, equal_to([("c", 3, 30), ("a", None, 10), ("x", None, 40)]))
+
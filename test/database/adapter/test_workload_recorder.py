@@ -0,0 +1,52 @@
+from helpers.example_store import ExampleStore
+from hamcrest import assert_that, equal_to, is_, none
+
+from tanuki.database.adapter.workload_recorder import PredicateShape, WorkloadRecorder
+
+
+class TestWorkloadRecorder:
+    def setup_method(self) -> None:
+        self.recorder = WorkloadRecorder()
+
+    def test_predicate_shape(self) -> None:
+        query = (ExampleStore.a == "a") & (ExampleStore.b > 1) & ExampleStore.c.isin([True])
+        shape = PredicateShape.from_query(query)
+        assert_that(shape.equality, equal_to(frozenset({"a", "c"})))
+        assert_that(shape.ranges, equal_to(frozenset({"b"})))
+
+        shape = PredicateShape.from_query((ExampleStore.a == "a") | (ExampleStore.b == 1))
+        assert_that(shape, is_(none()))
+
+    def test_record(self) -> None:
+        self.recorder.record(ExampleStore.data_token, ExampleStore.b == 1, 0.5)
+        self.recorder.record(ExampleStore.data_token, ExampleStore.b == 2, 1.5)
+        stats = self.recorder.stats(ExampleStore.data_token)
+        assert_that(len(stats), equal_to(1))
+        assert_that(stats[0].count, equal_to(2))
+        assert_that(stats[0].total_seconds, equal_to(2.0))
+        assert_that(stats[0].max_seconds, equal_to(1.5))
+        assert_that(stats[0].mean_seconds, equal_to(1.0))
+
+        self.recorder.clear()
+        assert_that(self.recorder.stats(), equal_to([]))
+
+    def test_recommend(self) -> None:
+        token = ExampleStore.data_token
+        self.recorder.record(token, (ExampleStore.b == 1) & (ExampleStore.c == True), 2.0)
+        self.recorder.record(token, ExampleStore.b == 1, 1.0)
+        self.recorder.record(token, (ExampleStore.b == 1) & (ExampleStore.d > 1), 1.0)
+        self.recorder.record(token, ExampleStore.a == "a", 4.0)
+
+        def is_full_scan(query) -> bool:
+            return "a ==" not in str(query)
+
+        recommendations = self.recorder.recommend(token, is_full_scan)
+        assert_that(len(recommendations), equal_to(2))
+        assert_that(recommendations[0].columns, equal_to(["b", "c"]))
+        assert_that(recommendations[0].queries, equal_to(2))
+        assert_that(recommendations[0].estimated_benefit, equal_to(3.0))
+        assert_that(recommendations[0].index_name, equal_to("b_c_advised_index"))
+        assert_that(recommendations[1].columns, equal_to(["b", "d"]))
+
+        recommendations = self.recorder.recommend(token, is_full_scan, min_queries=2)
+        assert_that(len(recommendations), equal_to(1))
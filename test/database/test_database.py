@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from helpers.example_store import ExampleStore, RAW_GROUP
 from helpers.mock_adapter import MockAdapter
 
@@ -12,6 +14,7 @@ class TestDatabase:
     def setup_method(self) -> None:
         self.adapter = MockAdapter()
         self.database = Database(self.adapter)
+        self.now = datetime.now()
 
     def test_has_group(self) -> None:
         test = ExampleStore(a=["1", "2", "3"], b=[1, 2, 3], c=[True, False, True])
@@ -60,7 +63,7 @@ class TestDatabase:
             DataToken("StoreDefinition_v1_definition", PROTECTED_GROUP),
             DataToken("TableReference_v1_definition", PROTECTED_GROUP),
             DataToken("StoreReference_v1_definition", PROTECTED_GROUP),
-            DataToken("IndexReference_v1_definition", PROTECTED_GROUP),
+            DataToken("IndexReference_v2_definition", PROTECTED_GROUP),
             DataToken("ExampleStore_v1_definition", PROTECTED_GROUP),
         ]
 
@@ -156,3 +159,53 @@ class TestDatabase:
 
         assert_that(self.database.has_group(RAW_GROUP), equal_to(False))
         assert_that(self.database.has_table(ExampleStore.data_token), equal_to(False))
+
+    def test_result_cache(self) -> None:
+        data = ExampleStore(
+            a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True], d=[self.now] * 3
+        )
+        self.database.insert(ExampleStore.data_token, data)
+        self.database.set_result_cache_budget(64 * 1024 * 1024)
+        version = self.database.table_version(ExampleStore.data_token)
+
+        calls = []
+        original = self.adapter.query
+        self.adapter.query = lambda *args, **kwargs: (
+            calls.append(args[0]) or original(*args, **kwargs)
+        )
+        token = ExampleStore.data_token
+        first = self.database.query(ExampleStore, token, ExampleStore.b >= 2)
+        second = self.database.query(ExampleStore, token, ExampleStore.b >= 2)
+        assert_that(second.equals(first), is_(True))
+        assert_that(calls.count(token), equal_to(1))
+
+        first.to_pandas().loc[:, "a"] = "x"
+        second.to_pandas().loc[:, "a"] = "y"
+        third = self.database.query(ExampleStore, token, ExampleStore.b >= 2)
+        assert_that(third.a.tolist(), equal_to(["b", "c"]))
+        assert_that(calls.count(token), equal_to(1))
+
+        self.database.query(ExampleStore, token, ExampleStore.b >= 2.0)
+        assert_that(calls.count(token), equal_to(2))
+
+        self.database.delete(token, ExampleStore.b == 3)
+        assert_that(self.database.table_version(token), equal_to(version + 1))
+        queried = self.database.query(ExampleStore, token, ExampleStore.b >= 2)
+        assert_that(calls.count(token), equal_to(3))
+        assert_that(queried.a.tolist(), equal_to(["b"]))
+        assert_that(queried.b.tolist(), equal_to([2]))
+
+    def test_result_cache_budget(self) -> None:
+        data = ExampleStore(
+            a=["a", "b", "c"], b=[1, 2, 3], c=[True, False, True], d=[self.now] * 3
+        )
+        self.database.insert(ExampleStore.data_token, data)
+
+        calls = []
+        original = self.adapter.query
+        self.adapter.query = lambda *args, **kwargs: (
+            calls.append(args[0]) or original(*args, **kwargs)
+        )
+        self.database.query(ExampleStore, ExampleStore.data_token)
+        self.database.query(ExampleStore, ExampleStore.data_token)
+        assert_that(calls.count(ExampleStore.data_token), equal_to(2))
@@ -14,7 +14,13 @@ from hamcrest import assert_that, equal_to, is_
 from tanuki.data_store.data_type import Boolean, Int64, String
 from tanuki.database.data_token import DataToken
 from tanuki.database.database_registrar import DatabaseRegistrar
-from tanuki.database.reference_tables import PROTECTED_GROUP, StoreDefinition
+from tanuki.database.reference_tables import (
+    INDEX_REFERENCE_V1_COLUMNS,
+    IndexReference,
+    PROTECTED_GROUP,
+    StoreDefinition,
+    TableReference,
+)
 
 
 class TestDatabaseRegistrar:
@@ -30,7 +36,7 @@ class TestDatabaseRegistrar:
             DataToken("StoreDefinition_v1_definition", PROTECTED_GROUP),
             DataToken("TableReference_v1_definition", PROTECTED_GROUP),
             DataToken("StoreReference_v1_definition", PROTECTED_GROUP),
-            DataToken("IndexReference_v1_definition", PROTECTED_GROUP),
+            DataToken("IndexReference_v2_definition", PROTECTED_GROUP),
         ]
         assert_that(self.registrar.list_groups(), equal_to([]))
         assert_that(
@@ -170,7 +176,7 @@ class TestDatabaseRegistrar:
             DataToken("StoreDefinition_v1_definition", PROTECTED_GROUP),
             DataToken("TableReference_v1_definition", PROTECTED_GROUP),
             DataToken("StoreReference_v1_definition", PROTECTED_GROUP),
-            DataToken("IndexReference_v1_definition", PROTECTED_GROUP),
+            DataToken("IndexReference_v2_definition", PROTECTED_GROUP),
             DataToken("ExampleStore_v1_definition", PROTECTED_GROUP),
         ]
 
@@ -196,7 +202,7 @@ class TestDatabaseRegistrar:
             DataToken("StoreDefinition_v1_definition", PROTECTED_GROUP),
             DataToken("TableReference_v1_definition", PROTECTED_GROUP),
             DataToken("StoreReference_v1_definition", PROTECTED_GROUP),
-            DataToken("IndexReference_v1_definition", PROTECTED_GROUP),
+            DataToken("IndexReference_v2_definition", PROTECTED_GROUP),
         ]
         for token in protected_tokens:
             assert_that(self.registrar._is_table_protected(token), is_(True))
@@ -220,7 +226,7 @@ class TestDatabaseRegistrar:
         assert_that(self.registrar._has_store_type("TableReference", 1), is_(True))
         assert_that(self.registrar._has_store_type("StoreReference", 1), is_(True))
         assert_that(self.registrar._has_store_type("StoreDefinition", 1), is_(True))
-        assert_that(self.registrar._has_store_type("IndexReference", 1), is_(True))
+        assert_that(self.registrar._has_store_type("IndexReference", 2), is_(True))
         assert_that(
             self.registrar._has_store_type("StoreDefinition_v1_definition", 1),
             is_(False),
@@ -252,7 +258,7 @@ class TestDatabaseRegistrar:
                 "StoreDefinition_v1_definition", PROTECTED_GROUP
             ),
             "IndexReference": DataToken(
-                "IndexReference_v1_definition", PROTECTED_GROUP
+                "IndexReference_v2_definition", PROTECTED_GROUP
             ),
         }
         for store_name, def_token in store_name_def_tokens.items():
@@ -288,4 +294,27 @@ class TestDatabaseRegistrar:
 
         for actual, expected in zip(store_class.columns, ExampleStore.columns):
             assert_that(actual.name, equal_to(expected.name))
-            assert_that(actual.dtype, equal_to(expected.dtype))
\ No newline at end of file
+            assert_that(actual.dtype, equal_to(expected.dtype))
+    def test_migrate_index_reference_v1(self) -> None:
+        self.registrar.create_table(ExampleStore.data_token, ExampleStore)
+        index_reference = self.registrar._store_index_reference("ExampleStore", 1)
+        v1_reference = index_reference.to_pandas()[INDEX_REFERENCE_V1_COLUMNS]
+        self.adapter.group_tables[PROTECTED_GROUP]["index_reference"] = v1_reference
+        self.adapter.update(
+            TableReference.data_token,
+            TableReference(
+                table_name="index_reference", data_group=PROTECTED_GROUP, store_version=1
+            ),
+            ["table_name", "data_group"],
+        )
+
+        registrar = DatabaseRegistrar(self.adapter)
+        _, version = registrar._table_store_type_version(IndexReference.data_token)
+        assert_that(version, equal_to(2))
+        migrated = registrar._store_index_reference("ExampleStore", 1)
+        assert_that(migrated.index_columns(), equal_to(index_reference.index_columns()))
+        options = migrated.index_options()
+        assert_that(all(option.unique for option in options.values()), is_(True))
+        assert_that(all(option.where is None for option in options.values()), is_(True))
+        store_class = registrar.store_type(ExampleStore.data_token)
+        assert_that(store_class.a_index.unique, is_(True))
@@ -0,0 +1,81 @@
+from pathlib import Path
+from queue import Full
+import shutil
+import tempfile
+
+from helpers.example_store import ExampleStore
+from helpers.sqlite3_container import Sqlite3Container
+
+from hamcrest import assert_that, equal_to, instance_of, is_
+from pytest import raises
+
+from tanuki.database.adapter.upsert_result import UpsertResult
+from tanuki.database.data_token import DataToken
+from tanuki.database.db_exceptions import MissingTableError
+from tanuki.database.sqlite3_database import Sqlite3Database
+
+
+class TestDatabaseWriter:
+    def setup_method(self) -> None:
+        self.tmp_db_dir = Path(tempfile.gettempdir()) / "tanuki_test"
+        if self.tmp_db_dir.exists():
+            shutil.rmtree(self.tmp_db_dir, ignore_errors=True)
+        self.sql_db = Sqlite3Container(self.tmp_db_dir)
+        self.sql_db.start()
+        self.db = Sqlite3Database(self.sql_db.connection_config())
+        self.db.insert(
+            ExampleStore.data_token, ExampleStore(a=["a"], b=[1], c=[True])
+        )
+
+    def teardown_method(self) -> None:
+        self.sql_db.stop()
+
+    def test_group_commit(self) -> None:
+        token = ExampleStore.data_token
+        with self.db.writer() as writer:
+            inserted = [
+                writer.insert(token, ExampleStore(a=[f"w{i}"], b=[i], c=[True]))
+                for i in range(20)
+            ]
+            upsert = ExampleStore(a=["a", "z"], b=[9, 9], c=[False, False])
+            upserted = writer.upsert(token, upsert, [ExampleStore.a])
+            upsert = ExampleStore(a=["z", "y"], b=[8, 8], c=[False, False])
+            reupserted = writer.upsert(token, upsert, [ExampleStore.a])
+            missing = writer.insert(
+                DataToken("test", "missing"), ExampleStore(a=["m"], b=[0], c=[True])
+            )
+            update = ExampleStore(a=["a"], b=[2])
+            missing_token = DataToken("missing", "raw")
+            updated = writer.update(missing_token, update, [ExampleStore.a])
+            deleted = writer.delete(token, ExampleStore.a == "w0")
+            writer.flush()
+            assert_that(writer.pending(), equal_to(0))
+
+        assert_that(all(future.result() is None for future in inserted), is_(True))
+        assert_that(upserted.result(), equal_to(UpsertResult(inserted=1, updated=1)))
+        assert_that(reupserted.result(), equal_to(UpsertResult(inserted=1, updated=1)))
+        assert_that(missing.result(), equal_to(None))
+        assert_that(updated.exception(), instance_of(MissingTableError))
+        assert_that(deleted.result(), equal_to(None))
+
+        queried = self.db.query(ExampleStore, token)
+        assert_that(len(queried), equal_to(22))
+        assert_that(queried.b.tolist()[0], equal_to(9))
+        with raises(RuntimeError):
+            writer.insert(token, ExampleStore(a=["x"], b=[0], c=[True]))
+
+    def test_backpressure(self) -> None:
+        token = ExampleStore.data_token
+        writer = self.db.writer(max_queue=1, max_batch=1)
+        with self.db.transaction():
+            first = writer.insert(token, ExampleStore(a=["b"], b=[2], c=[True]))
+            writer.insert(token, ExampleStore(a=["c"], b=[3], c=[True]))
+            blocked = ExampleStore(a=["d"], b=[4], c=[True])
+            with raises(Full):
+                writer.insert(token, blocked, timeout=0.05)
+            assert_that(first.done(), is_(False))
+        writer.close()
+
+        assert_that(first.done(), is_(True))
+        queried = self.db.query(ExampleStore, token)
+        assert_that(queried.a.tolist(), equal_to(["a", "b", "c"]))
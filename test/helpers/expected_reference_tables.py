@@ -17,7 +17,7 @@ TABLE_REFERENCE = TableReference(
         "StoreDefinition_v1_definition",
         "TableReference_v1_definition",
         "StoreReference_v1_definition",
-        "IndexReference_v1_definition",
+        "IndexReference_v2_definition",
     ],
     data_group=[
         PROTECTED_GROUP,
@@ -37,7 +37,7 @@ TABLE_REFERENCE = TableReference(
         "StoreDefinition",
         "StoreDefinition",
     ],
-    store_version=[1, 1, 1, 1, 1, 1, 1],
+    store_version=[1, 1, 2, 1, 1, 1, 1],
     protected=[True, True, True, True, True, True, True],
 )
 
@@ -48,12 +48,12 @@ STORE_REFERENCE = StoreReference(
         "StoreReference",
         "IndexReference",
     ],
-    store_version=[1, 1, 1, 1],
+    store_version=[1, 1, 1, 2],
     definition_reference=[
         "StoreDefinition_v1_definition",
         "TableReference_v1_definition",
         "StoreReference_v1_definition",
-        "IndexReference_v1_definition",
+        "IndexReference_v2_definition",
     ],
     definition_version=[1, 1, 1, 1],
 )
@@ -71,7 +71,7 @@ INDEX_REFERENCE = IndexReference(
         "IndexReference",
         "IndexReference",
     ],
-    store_version=[1, 1, 1, 1, 1, 1, 1, 1, 1],
+    store_version=[1, 1, 1, 1, 1, 2, 2, 2, 2],
     index_name=[
         "name_index",
         "table_group_index",
@@ -94,6 +94,8 @@ INDEX_REFERENCE = IndexReference(
         "index_name",
         "column_name",
     ],
+    is_unique=[True] * 9,
+    where_query=[pickle.dumps(None)] * 9,
 )
 
 TABLE_REFERENCE_STORE_DEFINITION = StoreDefinition(
@@ -145,11 +147,15 @@ INDEX_REFERENCE_STORE_DEFINITION = StoreDefinition(
         "store_version",
         "index_name",
         "column_name",
+        "is_unique",
+        "where_query",
     ],
     column_type=[
         pickle.dumps(String),
         pickle.dumps(Int64),
         pickle.dumps(String),
         pickle.dumps(String),
+        pickle.dumps(Boolean),
+        pickle.dumps(Bytes),
     ],
 )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Optional, TypeVar
+from typing import Any, Optional, TypeVar, Union
 
 import pandas as pd
 from pandas.core.frame import DataFrame
@@ -11,6 +11,7 @@ from tanuki.data_store.index.index import Index
 from tanuki.data_store.query import Query
 from tanuki.database.adapter.database_adapter import DatabaseAdapter
 from tanuki.database.adapter.query.pandas_query_compiler import PandasQueryCompiler
+from tanuki.database.adapter.upsert_result import UpsertResult
 from tanuki.database.data_token import DataToken
 
 T = TypeVar("T", bound=DataStore)
@@ -89,6 +90,11 @@ class MockAdapter(DatabaseAdapter):
         data_token: DataToken,
         query: Optional[Query] = None,
         columns: Optional[list[str]] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        rows: Optional[list[int]] = None,
+        order_by: Optional[list[str]] = None,
+        ascending: Union[bool, list[bool]] = True,
     ) -> Any:
         data = self.group_tables[data_token.data_group][data_token.table_name]
         if len(data) == 0:
@@ -101,6 +107,13 @@ class MockAdapter(DatabaseAdapter):
                 return query
             else:
                 data = data[query]
+        if order_by is not None:
+            data = data.sort_values(order_by, ascending=ascending, kind="stable")
+        if rows is not None:
+            data = data.iloc[rows]
+        elif offset is not None or limit is not None:
+            start = 0 if offset is None else offset
+            data = data.iloc[start : None if limit is None else start + limit]
         if columns is not None:
             data = data[columns]
         return [row for row in data.itertuples(index=False)]
@@ -123,14 +136,16 @@ class MockAdapter(DatabaseAdapter):
         data_token: DataToken,
         data_store: T,
         alignment_columns: list[str],
-    ) -> None:
+    ) -> UpsertResult:
         data = self.group_tables[data_token.data_group][data_token.table_name]
         data = data.set_index(alignment_columns)
         new_data = data_store.to_pandas().set_index(alignment_columns)
-        data = pd.concat([data, new_data[~new_data.index.isin(data.index)]])
+        missing = ~new_data.index.isin(data.index)
+        data = pd.concat([data, new_data[missing]])
         data.update(new_data)
         data = data.reset_index()
         self.group_tables[data_token.data_group][data_token.table_name] = data
+        return UpsertResult(int(missing.sum()), int((~missing).sum()))
 
     def delete(self: MockAdapter, data_token: DataToken, criteria: Query) -> None:
         data = self.group_tables[data_token.data_group][data_token.table_name]